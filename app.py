@@ -1,32 +1,61 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from PIL import Image
-import io
 import time
 from backend.vision_service import VisionService
 from backend.translator_service import TranslatorService
 from backend.speech_service import SpeechService
+from backend.cache import MemoryCache, SQLiteCache, TieredCache
+from backend.audio_cache import AudioCache
+from backend.translation_memory import TranslationMemory
+from backend.language_catalog import SUPPORTED_LANGUAGES
+from backend.pipeline import Pipeline
+from backend.rate_limiter import limiter_from_env
+from backend.image_preprocessing import ImagePreprocessor
+from backend.utils import MAX_UPLOAD_BYTES, MAX_UPLOAD_DIMENSION, inspect_image
+from backend import instrumentation
 
 # Load environment variables
 load_dotenv()
 
+# Instrumentation stays a no-op unless METRICS_ENABLED or OTEL_ENABLED is set
+@st.cache_resource
+def init_metrics():
+    registry = instrumentation.enable_from_env()
+    metrics_port = os.getenv('METRICS_PORT')
+    if registry is not None and metrics_port:
+        instrumentation.serve_metrics(int(metrics_port))
+    return registry
+
 # Initialize services
 @st.cache_resource
 def init_services():
-    vision_service = VisionService()
-    translator_service = TranslatorService()
-    speech_service = SpeechService()
+    init_metrics()
+    ocr_cache_path = os.getenv('OCR_CACHE_PATH')
+    ocr_cache = TieredCache(
+        MemoryCache(),
+        SQLiteCache(ocr_cache_path) if ocr_cache_path else None
+    )
+    vision_service = VisionService(cache=ocr_cache, rate_limiter=limiter_from_env('vision'),
+                                   preprocessor=ImagePreprocessor())
+    translator_service = TranslatorService(
+        translation_memory=TranslationMemory(os.getenv('TRANSLATION_MEMORY_PATH', ':memory:')),
+        rate_limiter=limiter_from_env('translator')
+    )
+    speech_service = SpeechService(cache=AudioCache(os.getenv('TTS_CACHE_DIR')),
+                                   rate_limiter=limiter_from_env('speech'))
     return vision_service, translator_service, speech_service
 
+@st.cache_resource
+def init_pipeline():
+    pipeline = Pipeline(*init_services())
+    # SDKs load and connections open while the user picks an image
+    if os.getenv('WARM_UP_SERVICES', 'true').lower() in ('1', 'true', 'yes'):
+        pipeline.warm_up()
+    return pipeline
+
 # Language configurations
-LANGUAGES = {
-    'English': {'code': 'en', 'voice': 'en-US-JennyMultilingualNeural', 'speech_code': 'en-US'},
-    'Spanish': {'code': 'es', 'voice': 'es-ES-ElviraNeural', 'speech_code': 'es-ES'},
-    'French': {'code': 'fr', 'voice': 'fr-FR-DeniseNeural', 'speech_code': 'fr-FR'},
-    'Arabic': {'code': 'ar', 'voice': 'ar-SA-ZariyahNeural', 'speech_code': 'ar-SA'},
-    'German': {'code': 'de', 'voice': 'de-DE-KatjaNeural', 'speech_code': 'de-DE'},
-}
+LANGUAGES = SUPPORTED_LANGUAGES
 
 # Cache for storing audio data
 if 'original_audio' not in st.session_state:
@@ -46,7 +75,7 @@ def main():
 
     try:
         # Initialize services
-        vision_service, translator_service, speech_service = init_services()
+        pipeline = init_pipeline()
 
         # File uploader
         uploaded_file = st.file_uploader(
@@ -64,101 +93,103 @@ def main():
         )
 
         if uploaded_file is not None:
+            # Validate from the header only, the bytes are shared by every later step
+            image_data = uploaded_file.getvalue()
+            image_info, error = inspect_image(image_data, MAX_UPLOAD_BYTES, MAX_UPLOAD_DIMENSION)
+            if error:
+                st.error(error)
+                return
+
             # Display the uploaded image
             col1, col2 = st.columns([1, 1])
             
             with col1:
                 st.subheader("Uploaded Image")
-                image = Image.open(uploaded_file)
-                st.image(image, use_column_width=True)
+                st.image(image_data, use_column_width=True,
+                         caption=f"{image_info.format}, {image_info.width}x{image_info.height}")
 
             # Process button
             if st.button("Extract and Translate", type="primary"):
+                target = LANGUAGES[target_language]
+                pipeline_run = pipeline.start(
+                    image_data,
+                    target['code'],
+                    target_speech_language=target['speech_code'],
+                    source_speech_language=LANGUAGES['English']['speech_code'],
+                    image_info=image_info
+                )
+
+                # Create the layout up front, stages fill it in as they finish
+                with col2:
+                    extracted_area = st.container()
+                    original_audio_area = st.container()
+                translation_area = st.container()
+                translated_audio_area = st.container()
+
                 with st.spinner("Processing image..."):
-                    # Extract text
-                    image_bytes = io.BytesIO(uploaded_file.getvalue())
-                    extracted_text = vision_service.extract_text(image_bytes)
-
-                    if not extracted_text:
-                        st.error("No text could be extracted from the image. Please try another image.")
-                        return
-
-                    # Display extracted text
-                    with col2:
-                        st.subheader("Extracted Text")
-                        st.write(extracted_text)
-                        
-                        # Generate original audio
-                        with st.spinner("Generating original audio..."):
-                            original_audio = speech_service.text_to_speech(
-                                extracted_text,
-                                LANGUAGES['English']['speech_code']
-                            )
-                            
-                        # Display audio controls if generation was successful
-                        if original_audio:
-                            st.audio(original_audio, format="audio/wav")
-                            st.download_button(
-                                "💾 Download Original Audio",
-                                data=original_audio,
-                                file_name="original_audio.wav",
-                                mime="audio/wav"
-                            )
-                        else:
-                            st.error("Failed to generate original audio")
-
-                    # Translate text
-                    with st.spinner(f"Translating to {target_language}..."):
-                        translated_text = translator_service.translate_text(
+                    for stage, output in pipeline_run.as_completed():
+                        if stage == Pipeline.OCR:
+                            with extracted_area:
+                                st.subheader("Extracted Text")
+                                st.write(output)
+                        elif stage == Pipeline.ORIGINAL_AUDIO:
+                            with original_audio_area:
+                                st.audio(output, format="audio/wav")
+                                st.download_button(
+                                    "💾 Download Original Audio",
+                                    data=output,
+                                    file_name="original_audio.wav",
+                                    mime="audio/wav"
+                                )
+                        elif stage == Pipeline.TRANSLATION:
+                            with translation_area:
+                                st.subheader(f"Translation ({target_language})")
+                                st.write(output)
+                        elif stage == Pipeline.TRANSLATED_AUDIO:
+                            with translated_audio_area:
+                                st.audio(output, format="audio/wav")
+                                st.download_button(
+                                    "💾 Download Translated Audio",
+                                    data=output,
+                                    file_name=f"translated_audio_{target['code']}.wav",
+                                    mime="audio/wav"
+                                )
+
+                results = pipeline_run.results
+                extracted_text = results.get(Pipeline.OCR)
+                translated_text = results.get(Pipeline.TRANSLATION)
+
+                if not extracted_text:
+                    st.error("No text could be extracted from the image. Please try another image.")
+                    return
+
+                if Pipeline.ORIGINAL_AUDIO not in results:
+                    original_audio_area.error("Failed to generate original audio")
+
+                if translated_text:
+                    if Pipeline.TRANSLATED_AUDIO not in results:
+                        translated_audio_area.error("Failed to generate translated audio")
+
+                    # Add download buttons for text
+                    col3, col4 = st.columns(2)
+                    with col3:
+                        st.download_button(
+                            "📥 Download Original Text",
                             extracted_text,
-                            LANGUAGES[target_language]['code']
+                            file_name="original_text.txt",
+                            mime="text/plain",
+                            key="download_original_text"
                         )
-
-                    if translated_text:
-                        # Translated text audio controls
-                        st.subheader(f"Translation ({target_language})")
-                        st.write(translated_text)
-
-                        # Generate translated audio first
-                        with st.spinner("Generating translated audio..."):
-                            translated_audio = speech_service.text_to_speech(
-                                translated_text,
-                                LANGUAGES[target_language]['speech_code']
-                            )
-                            
-                        # Display audio controls if generation was successful
-                        if translated_audio:
-                            st.audio(translated_audio, format="audio/wav")
-                            st.download_button(
-                                "💾 Download Translated Audio",
-                                data=translated_audio,
-                                file_name=f"translated_audio_{LANGUAGES[target_language]['code']}.wav",
-                                mime="audio/wav"
-                            )
-                        else:
-                            st.error("Failed to generate translated audio")
-
-
-                        # Add download buttons for text
-                        col3, col4 = st.columns(2)
-                        with col3:
-                            st.download_button(
-                                "📥 Download Original Text",
-                                extracted_text,
-                                file_name="original_text.txt",
-                                mime="text/plain",
-                                key="download_original_text"
-                            )
-                        with col4:
-                            st.download_button(
-                                "📥 Download Translation",
-                                translated_text,
-                                file_name=f"translated_text_{LANGUAGES[target_language]['code']}.txt",
-                                mime="text/plain",
-                                key="download_translated_text"
-                            )
-                    else:
-                        st.error("Translation failed. Please try again.")
+                    with col4:
+                        st.download_button(
+                            "📥 Download Translation",
+                            translated_text,
+                            file_name=f"translated_text_{target['code']}.txt",
+                            mime="text/plain",
+                            key="download_translated_text"
+                        )
+                else:
+                    st.error("Translation failed. Please try again.")
 
         # Add usage instructions in sidebar
         with st.sidebar:
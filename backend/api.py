@@ -0,0 +1,235 @@
+import argparse
+import base64
+import io
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import anyio
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from backend import instrumentation
+from backend.language_catalog import SUPPORTED_LANGUAGES
+from backend.pipeline import SUCCEEDED
+from backend.utils import MAX_UPLOAD_BYTES, MAX_UPLOAD_DIMENSION, inspect_image
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TranslateRequest(BaseModel):
+    text: str
+    target_language: str
+    source_language: Optional[str] = None
+
+
+class SpeechRequest(BaseModel):
+    text: str
+    language: Optional[str] = "en-US"
+    voice: Optional[str] = None
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """StreamingResponse that closes its body however the response ends, disconnects included."""
+
+    async def stream_response(self, send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+def _stream_in_threadpool(first: bytes, chunks):
+    """
+    Async body yielding first and then the rest of a blocking generator.
+
+    Each chunk is produced on the thread pool, and the generator is closed
+    when the body is, so an abandoned synthesis frees its synthesizer and
+    rate limiter slot right away instead of at garbage collection.
+    """
+    async def body():
+        try:
+            yield first
+            while True:
+                chunk = await run_in_threadpool(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(chunks.close)
+    return body()
+
+
+def _read_upload(file: UploadFile):
+    """Read and validate an uploaded image, raising 413 or 400 for bad uploads."""
+    # One byte more than allowed tells an oversized upload apart without reading all of it
+    image_data = file.file.read(MAX_UPLOAD_BYTES + 1)
+    image_info, error = inspect_image(image_data, MAX_UPLOAD_BYTES, MAX_UPLOAD_DIMENSION)
+    if error:
+        raise HTTPException(status_code=413 if len(image_data) > MAX_UPLOAD_BYTES else 400,
+                            detail=error)
+    return image_data, image_info
+
+
+def _build_pipeline():
+    """Create the services from the environment, as the batch CLI does."""
+    from dotenv import load_dotenv
+    from backend.batch import build_limiters, build_pipeline
+
+    load_dotenv()
+    threads = int(os.getenv('API_THREADS', '8'))
+    return build_pipeline(threads, with_speech=True, limiters=build_limiters())
+
+
+def create_app(pipeline=None) -> FastAPI:
+    """
+    Build the HTTP API over the OCR, translation and speech services.
+
+    The app keeps no per-request state, so any number of workers and
+    replicas can serve it behind a load balancer. Blocking service calls
+    run on the server's thread pool.
+
+    Args:
+        pipeline: backend.pipeline.Pipeline to serve; by default one is
+            created from the environment when the app starts
+
+    Returns:
+        FastAPI: ASGI application
+    """
+    services = {"pipeline": pipeline}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        registry = instrumentation.enable_from_env()
+        if services["pipeline"] is None:
+            services["pipeline"] = _build_pipeline()
+            if os.getenv('WARM_UP_SERVICES', 'true').lower() in ('1', 'true', 'yes'):
+                services["pipeline"].warm_up()
+        try:
+            yield
+        finally:
+            if pipeline is None:
+                services["pipeline"].shutdown()
+            if registry is not None:
+                instrumentation.disable()
+
+    app = FastAPI(title="Image Text Translator", lifespan=lifespan)
+
+    def get_pipeline():
+        return services["pipeline"]
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/languages")
+    def languages():
+        """Languages offered by the app with their translator code, voice and locale."""
+        return SUPPORTED_LANGUAGES
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        registry = instrumentation.get_registry()
+        if registry is None:
+            raise HTTPException(status_code=404, detail="Metrics are disabled")
+        return PlainTextResponse(registry.render(),
+                                 media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @app.post("/ocr")
+    def ocr(file: UploadFile = File(...)):
+        """Read the text of an uploaded image, with line and word boxes."""
+        image_data, image_info = _read_upload(file)
+        result = get_pipeline().vision_service.analyze_text(io.BytesIO(image_data),
+                                                            image_info=image_info)
+        if result is None:
+            raise HTTPException(status_code=502, detail="Text extraction failed")
+        return result.to_dict()
+
+    @app.post("/translate")
+    def translate(request: TranslateRequest):
+        translated_text = get_pipeline().translator_service.translate_text(
+            request.text, request.target_language, request.source_language)
+        if translated_text is None:
+            raise HTTPException(status_code=502, detail="Translation failed")
+        return {"translated_text": translated_text, "target_language": request.target_language}
+
+    @app.post("/tts")
+    def tts(request: SpeechRequest):
+        """Stream WAV audio while it is synthesized."""
+        chunks = get_pipeline().speech_service.stream_text_to_speech(
+            request.text, request.language, voice_name=request.voice)
+        # Wait for the first chunk so a failed synthesis is an error, not an empty 200
+        first = next(chunks, None)
+        if first is None:
+            raise HTTPException(status_code=502, detail="Speech synthesis failed")
+        return ClosingStreamingResponse(_stream_in_threadpool(first, chunks),
+                                        media_type="audio/wav")
+
+    @app.post("/pipeline")
+    def run_pipeline(file: UploadFile = File(...), target_language: str = Form(...),
+                     target_speech_language: Optional[str] = Form(None),
+                     source_speech_language: Optional[str] = Form(None),
+                     source_language: Optional[str] = Form(None)):
+        """
+        OCR, translate and optionally synthesize an uploaded image in one call.
+
+        Audio is only synthesized for the speech locales given and is
+        returned base64-encoded; use /tts to stream it instead. Like /ocr,
+        /translate and /tts, the call fails with 502 unless every stage
+        requested succeeded; there are no partial results.
+        """
+        image_data, image_info = _read_upload(file)
+        result = get_pipeline().run(image_data, target_language, target_speech_language,
+                                    source_speech_language, source_language, image_info)
+        if result.extracted_text is None:
+            raise HTTPException(status_code=502, detail="No text could be extracted from the image")
+        failed = [name for name, timing in result.timings.items() if timing.status != SUCCEEDED]
+        if failed:
+            raise HTTPException(status_code=502, detail=f"Stages did not succeed: {', '.join(failed)}")
+
+        def encode(audio):
+            return base64.b64encode(audio).decode("ascii") if audio is not None else None
+
+        return {
+            "extracted_text": result.extracted_text,
+            "translated_text": result.translated_text,
+            "original_audio": encode(result.original_audio),
+            "translated_audio": encode(result.translated_audio),
+            "stages": {name: {"status": timing.status, "duration": timing.duration}
+                       for name, timing in result.timings.items()},
+        }
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.api",
+        description="Serve OCR, translation, speech and the full pipeline over HTTP."
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('-w', '--workers', type=int, default=int(os.getenv('WEB_CONCURRENCY', '1')),
+                        help="Worker processes, each with its own services (default: %(default)s)")
+    parser.add_argument('--threads', type=int, default=int(os.getenv('API_THREADS', '8')),
+                        help="Pipeline stages run at once per worker (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    # Workers are separate processes that build their app from the environment
+    os.environ['API_THREADS'] = str(args.threads)
+    uvicorn.run("backend.api:create_app", factory=True, host=args.host, port=args.port,
+                workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
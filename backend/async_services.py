@@ -0,0 +1,555 @@
+import asyncio
+import os
+import logging
+from typing import TYPE_CHECKING, Optional, Dict, List, IO, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from backend.instrumentation import count, span
+from backend.language_catalog import DEFAULT_VOICES
+from backend.ocr_result import OcrResult, ocr_cache_key
+from backend.polling import PollingStrategy, parse_retry_after
+from backend.translator_service import (
+    MAX_CHARACTERS_PER_REQUEST,
+    MAX_ELEMENTS_PER_REQUEST,
+    RETRY_STATUS_CODES,
+    assemble_translations,
+    pack_requests,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def create_async_client(max_connections: int = 100, timeout: float = 30.0) -> "httpx.AsyncClient":
+    """
+    Create an HTTP client meant to be shared by all async services.
+
+    Args:
+        max_connections: Maximum number of concurrent connections
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        httpx.AsyncClient: Client with keep-alive connection pooling
+    """
+    import httpx
+
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class _AsyncService:
+    # Times a throttled request is queued again behind the limiter
+    THROTTLED_RETRIES = 3
+    # Without a limiter, throttled and 5xx responses are retried like the
+    # sync services' urllib3 Retry does: exponential backoff or Retry-After
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 0.5
+    # Value of the service label on this service's metrics
+    SERVICE = None
+
+    def __init__(self, client: Optional["httpx.AsyncClient"] = None, rate_limiter=None):
+        self._client = client
+        self._owns_client = client is None
+        self.rate_limiter = rate_limiter
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """HTTP client, created with the httpx import on first use unless one was given."""
+        if self._client is None:
+            self._client = create_async_client()
+        return self._client
+
+    async def _request(self, method: str, url: str, characters: int = 0,
+                       **kwargs) -> "httpx.Response":
+        """
+        Send a request through the rate limiter, if any.
+
+        A 429 pauses the limiter for the Retry-After the service asked for
+        and the request waits in the queue again instead of failing. Without
+        a limiter, 429 and 5xx responses are retried after the Retry-After
+        or an exponential backoff.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            characters: Characters the request sends, for character budgets
+            **kwargs: Passed on to httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response: Last response received
+        """
+        if self.rate_limiter is None:
+            for attempt in range(self.MAX_RETRIES + 1):
+                with span("async_request", service=self.SERVICE):
+                    response = await self.client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.MAX_RETRIES:
+                    break
+                count("retries_total", service=self.SERVICE)
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+                await asyncio.sleep(delay if delay is not None else self.BACKOFF_FACTOR * 2 ** attempt)
+            return response
+        for attempt in range(self.THROTTLED_RETRIES + 1):
+            async with self.rate_limiter.limit_async(characters):
+                with span("async_request", service=self.SERVICE):
+                    response = await self.client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == self.THROTTLED_RETRIES:
+                break
+            count("throttled_total", service=self.SERVICE)
+            self.rate_limiter.throttled(parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this service created it."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class AsyncVisionService(_AsyncService):
+    SERVICE = "vision"
+
+    def __init__(self, client: Optional["httpx.AsyncClient"] = None, cache=None,
+                 polling: Optional[PollingStrategy] = None, rate_limiter=None,
+                 preprocessor=None, endpoint: Optional[str] = None, key: Optional[str] = None):
+        """
+        Initialize the async Vision Service with Azure credentials.
+
+        Args:
+            client: Shared HTTP client, a private one is created if omitted
+            cache: Optional OCR result cache keyed by a hash of the image bytes
+            polling: Strategy used to wait for Read operations
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter applied
+                to every call, result polls included
+            preprocessor: Optional backend.image_preprocessing.ImagePreprocessor
+                shrinking images before upload; the cache stays keyed by the
+                original bytes
+            endpoint: Vision endpoint overriding AZURE_VISION_ENDPOINT
+            key: Subscription key overriding AZURE_VISION_KEY
+        """
+        try:
+            self.endpoint = endpoint or os.getenv('AZURE_VISION_ENDPOINT')
+            self.key = key or os.getenv('AZURE_VISION_KEY')
+
+            if not self.endpoint or not self.key:
+                raise ValueError("Azure Vision credentials not found in environment variables")
+
+            self.base_url = self.endpoint.rstrip('/') + '/vision/v3.2'
+            self.cache = cache
+            self.polling = polling if polling is not None else PollingStrategy()
+            self.preprocessor = preprocessor
+            super().__init__(client, rate_limiter)
+            logger.info("Async Vision Service initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Async Vision Service: {str(e)}")
+            raise
+
+    async def extract_text(self, image_data: Union[IO, bytes], image_info=None) -> Optional[str]:
+        """
+        Extract text from an image using Azure's OCR service.
+
+        Args:
+            image_data: Image bytes or file-like object containing the image data
+            image_info: Optional backend.utils.ImageInfo of the same image,
+                whose hash is reused in the cache key
+
+        Returns:
+            str: Extracted text or None if extraction failed
+        """
+        result = await self.analyze_text(image_data, image_info=image_info)
+        return result.text if result is not None else None
+
+    async def analyze_text(self, image_data: Union[IO, bytes],
+                           image_info=None) -> Optional[OcrResult]:
+        """
+        Read the pages, lines and words of an image with their bounding boxes.
+
+        Args:
+            image_data: Image bytes or file-like object containing the image data
+            image_info: Optional backend.utils.ImageInfo of the same image,
+                whose hash is reused in the cache key
+
+        Returns:
+            OcrResult: Structured result or None if extraction failed
+        """
+        try:
+            image_bytes = image_data if isinstance(image_data, bytes) else image_data.read()
+
+            cache_key = None
+            if self.cache is not None:
+                settings = self.preprocessor.settings if self.preprocessor is not None else ""
+                cache_key = ocr_cache_key(image_bytes, image_info, settings)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    count("cache_hits_total", cache="ocr")
+                    logger.info("Text extracted from OCR cache")
+                    return OcrResult.from_json(cached)
+                count("cache_misses_total", cache="ocr")
+
+            upload_bytes = image_bytes
+            if self.preprocessor is not None:
+                try:
+                    # Pillow work is CPU bound, keep it off the event loop
+                    upload_bytes = (await asyncio.to_thread(self.preprocessor.process,
+                                                            image_bytes)).data
+                except Exception as e:
+                    logger.warning(f"Image preprocessing failed, sending the original: {str(e)}")
+
+            # Start the async OCR operation
+            response = await self._request(
+                'POST', self.base_url + '/read/analyze',
+                headers={'Ocp-Apim-Subscription-Key': self.key,
+                         'Content-Type': 'application/octet-stream'},
+                content=upload_bytes
+            )
+            response.raise_for_status()
+            operation_location = response.headers["Operation-Location"]
+
+            # Wait for the operation to complete without blocking the event loop
+            async def fetch_result():
+                poll_response = await self._request(
+                    'GET', operation_location, headers={'Ocp-Apim-Subscription-Key': self.key}
+                )
+                poll_response.raise_for_status()
+                return poll_response.json(), parse_retry_after(poll_response.headers.get("Retry-After"))
+
+            result, poll_stats = await self.polling.poll_async(
+                fetch_result,
+                lambda pending: pending["status"] in ["notStarted", "running"],
+                size_bytes=len(upload_bytes)
+            )
+            logger.info(f"Read operation polled {poll_stats.polls} times "
+                        f"in {poll_stats.wall_time:.2f}s")
+            if poll_stats.timed_out:
+                logger.warning(f"Read operation did not finish within {self.polling.deadline}s")
+                return None
+
+            if result["status"] == "succeeded":
+                ocr_result = OcrResult.from_rest(result["analyzeResult"])
+                if cache_key is not None:
+                    self.cache.set(cache_key, ocr_result.to_json())
+                logger.info("Text extracted successfully")
+                return ocr_result
+            else:
+                logger.warning(f"Text extraction failed with status: {result['status']}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Error in text extraction: {str(e)}")
+            return None
+
+    async def is_valid_image(self, image_data: Union[IO, bytes]) -> bool:
+        """
+        Validate if the provided image data is suitable for OCR.
+
+        Args:
+            image_data: Image bytes or file-like object containing the image data
+
+        Returns:
+            bool: True if image is valid, False otherwise
+        """
+        try:
+            image_bytes = image_data if isinstance(image_data, bytes) else image_data.read()
+            response = await self._request(
+                'POST', self.base_url + '/analyze',
+                params={'visualFeatures': 'Objects,Tags'},
+                headers={'Ocp-Apim-Subscription-Key': self.key,
+                         'Content-Type': 'application/octet-stream'},
+                content=image_bytes
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error(f"Image validation failed: {str(e)}")
+            return False
+
+
+class AsyncTranslatorService(_AsyncService):
+    SERVICE = "translator"
+
+    def __init__(self, client: Optional["httpx.AsyncClient"] = None, rate_limiter=None,
+                 endpoint: Optional[str] = None, key: Optional[str] = None,
+                 region: Optional[str] = None):
+        """
+        Initialize the async Translator Service with Azure credentials.
+
+        Args:
+            client: Shared HTTP client, a private one is created if omitted
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter
+            endpoint: Translator endpoint overriding AZURE_TRANSLATOR_ENDPOINT
+            key: Subscription key overriding AZURE_TRANSLATOR_KEY
+            region: Resource region overriding AZURE_TRANSLATOR_REGION
+        """
+        try:
+            self.key = key or os.getenv('AZURE_TRANSLATOR_KEY')
+            self.region = region or os.getenv('AZURE_TRANSLATOR_REGION')
+            self.endpoint = endpoint or os.getenv('AZURE_TRANSLATOR_ENDPOINT',
+                                                  'https://api.cognitive.microsofttranslator.com')
+
+            if not self.key or not self.region:
+                raise ValueError("Azure Translator credentials not found in environment variables")
+
+            self.headers = {
+                'Ocp-Apim-Subscription-Key': self.key,
+                'Ocp-Apim-Subscription-Region': self.region,
+                'Content-type': 'application/json'
+            }
+            super().__init__(client, rate_limiter)
+            logger.info("Async Translator Service initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Async Translator Service: {str(e)}")
+            raise
+
+    async def translate_text(self, text: str, target_language: str,
+                             source_language: Optional[str] = None) -> Optional[str]:
+        """
+        Translate text to the target language.
+
+        Args:
+            text: Text to translate
+            target_language: Language code to translate to (e.g., 'es' for Spanish)
+            source_language: Optional source language code
+
+        Returns:
+            str: Translated text or None if translation failed
+        """
+        import httpx
+
+        try:
+            translations = await self._send_translate_request([text], [target_language],
+                                                              source_language)
+            logger.info(f"Text translated successfully to {target_language}")
+            return translations[0]["translations"][0]["text"]
+        except httpx.HTTPStatusError as http_err:
+            logger.error(f"HTTP error occurred: {http_err}")
+            logger.error(f"Response content: {http_err.response.content}")
+            return None
+        except Exception as e:
+            logger.error(f"Translation failed: {str(e)}")
+            return None
+
+    async def translate_batch(self, texts: List[str], target_language: str,
+                              source_language: Optional[str] = None,
+                              max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+                              max_characters: int = MAX_CHARACTERS_PER_REQUEST
+                              ) -> List[Optional[str]]:
+        """
+        Translate many texts, sending the packed requests concurrently.
+
+        Args:
+            texts: Texts to translate
+            target_language: Language code to translate to
+            source_language: Optional source language code
+            max_elements: Maximum number of array elements per request
+            max_characters: Maximum number of characters per request
+
+        Returns:
+            List[Optional[str]]: Translations in input order, None where the
+            request carrying that text failed
+        """
+        results = await self._translate_packed(texts, [target_language], source_language,
+                                               max_elements, max_characters)
+        return [result[target_language] if result else None for result in results]
+
+    async def translate_multi(self, text: str, targets: List[str],
+                              source_language: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Translate text to several languages in a single round trip.
+
+        Args:
+            text: Text to translate
+            targets: Language codes to translate to (e.g., ['es', 'fr'])
+            source_language: Optional source language code
+
+        Returns:
+            Dict[str, str]: Translations keyed by language code or None if
+            translation failed
+        """
+        return (await self._translate_packed([text], targets, source_language))[0]
+
+    async def _translate_packed(self, texts: List[str], targets: List[str],
+                                source_language: Optional[str] = None,
+                                max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+                                max_characters: int = MAX_CHARACTERS_PER_REQUEST
+                                ) -> List[Optional[Dict[str, str]]]:
+        requests_to_send = pack_requests(texts, len(targets), max_elements, max_characters)
+        outcomes = await asyncio.gather(
+            *(self._send_translate_request([piece for _, piece, _ in batch], targets,
+                                           source_language)
+              for batch in requests_to_send),
+            return_exceptions=True
+        )
+
+        responses = []
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch translation failed: {str(outcome)}")
+                responses.append(None)
+            else:
+                responses.append(outcome)
+        return assemble_translations(len(texts), targets, requests_to_send, responses)
+
+    async def _send_translate_request(self, texts: List[str], targets: List[str],
+                                      source_language: Optional[str] = None) -> List[Dict]:
+        params = [('api-version', '3.0')] + [('to', target) for target in targets]
+        if source_language:
+            params.append(('from', source_language))
+
+        # The service meters characters once per target language
+        characters = sum(len(text) for text in texts) * len(targets)
+        response = await self._request('POST', self.endpoint + '/translate', characters,
+                                       params=params, headers=self.headers,
+                                       json=[{'text': text} for text in texts])
+        response.raise_for_status()
+        return response.json()
+
+    async def get_available_languages(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get list of supported languages for translation.
+
+        Returns:
+            Dict containing language codes and names
+        """
+        try:
+            response = await self._request(
+                'GET', self.endpoint + '/languages',
+                params={'api-version': '3.0', 'scope': 'translation'}
+            )
+            response.raise_for_status()
+            return response.json()['translation']
+        except Exception as e:
+            logger.error(f"Failed to get available languages: {str(e)}")
+            return {}
+
+
+class AsyncSpeechService(_AsyncService):
+    SERVICE = "speech"
+
+    def __init__(self, client: Optional["httpx.AsyncClient"] = None, rate_limiter=None,
+                 endpoint: Optional[str] = None, key: Optional[str] = None,
+                 region: Optional[str] = None):
+        """
+        Initialize the async Speech Service with Azure credentials.
+
+        Synthesis goes through the Speech REST endpoint so that no thread is
+        held while audio is generated.
+
+        Args:
+            client: Shared HTTP client, a private one is created if omitted
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter
+            endpoint: Full TTS REST URL overriding AZURE_SPEECH_TTS_ENDPOINT
+            key: Subscription key overriding AZURE_SPEECH_KEY
+            region: Resource region overriding AZURE_SPEECH_REGION
+        """
+        try:
+            self.key = key or os.getenv('AZURE_SPEECH_KEY')
+            self.region = region or os.getenv('AZURE_SPEECH_REGION')
+
+            if not self.key or not self.region:
+                raise ValueError("Azure Speech credentials not found in environment variables")
+
+            self.endpoint = endpoint or os.getenv(
+                'AZURE_SPEECH_TTS_ENDPOINT',
+                f'https://{self.region}.tts.speech.microsoft.com/cognitiveservices/v1'
+            )
+            self.voices_endpoint = self.endpoint.rsplit('/', 1)[0] + '/voices/list'
+            self.output_format = 'riff-24khz-16bit-mono-pcm'
+            self._voice_by_locale: Optional[Dict[str, str]] = None
+            super().__init__(client, rate_limiter)
+            logger.info("Async Speech Service initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Async Speech Service: {str(e)}")
+            raise
+
+    async def text_to_speech(self, text: str, language: str = "en-US") -> Optional[bytes]:
+        """
+        Convert text to speech using default voice for the language.
+
+        Locales without a configured voice use the first voice the service
+        lists for them, as the SDK does when only a language is set.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code (e.g., "en-US", "es-ES")
+
+        Returns:
+            bytes: Audio data or None if synthesis failed
+        """
+        voice_name = DEFAULT_VOICES.get(language) or await self._service_voice(language)
+        if voice_name is None:
+            logger.error(f"No voice available for language: {language}")
+            return None
+        return await self._synthesize(text, language, voice_name)
+
+    async def text_to_speech_with_voice(self, text: str, voice_name: str) -> Optional[bytes]:
+        """
+        Convert text to speech using a specific voice.
+
+        Args:
+            text: Text to convert to speech
+            voice_name: Name of the voice to use
+
+        Returns:
+            bytes: Audio data or None if synthesis failed
+        """
+        language = "-".join(voice_name.split("-")[:2])
+        return await self._synthesize(text, language, voice_name)
+
+    async def _service_voice(self, language: str) -> Optional[str]:
+        """
+        Voice the service offers for a locale, or None if it offers none.
+
+        The voice list is fetched once; failures are retried on the next call.
+        """
+        if not language:
+            return None
+        if self._voice_by_locale is None:
+            try:
+                response = await self._request(
+                    'GET', self.voices_endpoint, headers={'Ocp-Apim-Subscription-Key': self.key}
+                )
+                response.raise_for_status()
+                voice_by_locale = {}
+                for voice in response.json():
+                    voice_by_locale.setdefault(voice['Locale'].lower(), voice['ShortName'])
+                self._voice_by_locale = voice_by_locale
+            except Exception as e:
+                logger.error(f"Failed to list voices: {str(e)}")
+                return None
+        return self._voice_by_locale.get(language.lower())
+
+    async def _synthesize(self, text: str, language: str, voice_name: str) -> Optional[bytes]:
+        ssml = (f"<speak version='1.0' xml:lang={quoteattr(language)}>"
+                f"<voice name={quoteattr(voice_name)}>{escape(text)}</voice></speak>")
+        try:
+            response = await self._request(
+                'POST', self.endpoint, len(text),
+                headers={'Ocp-Apim-Subscription-Key': self.key,
+                         'Content-Type': 'application/ssml+xml',
+                         'X-Microsoft-OutputFormat': self.output_format,
+                         'User-Agent': 'image-text-translator'},
+                content=ssml.encode('utf-8')
+            )
+            response.raise_for_status()
+            logger.info(f"Text-to-speech conversion successful using voice: {voice_name}")
+            return response.content
+        except Exception as e:
+            logger.error(f"Text-to-speech conversion failed: {str(e)}")
+            return None
+
+    async def verify_service(self) -> bool:
+        """
+        Verify that the speech service is working correctly.
+
+        Returns:
+            bool: True if service is working, False otherwise
+        """
+        result = await self.text_to_speech("Testing speech service.", "en-US")
+        return result is not None
@@ -0,0 +1,108 @@
+import struct
+from typing import Iterable, Tuple
+
+# Riff24Khz16BitMonoPcm, the format produced by SpeechService
+SAMPLE_RATE = 24000
+BITS_PER_SAMPLE = 16
+CHANNELS = 1
+
+# Data size written into headers of streams whose length is not known yet
+STREAMING_DATA_SIZE = 0xFFFFFFFF - 36
+
+
+def wav_header(data_size: int, sample_rate: int = SAMPLE_RATE,
+               bits_per_sample: int = BITS_PER_SAMPLE, channels: int = CHANNELS) -> bytes:
+    """
+    Build a canonical 44-byte RIFF/WAVE header for PCM audio.
+
+    Args:
+        data_size: Size of the PCM data in bytes, STREAMING_DATA_SIZE if unknown
+        sample_rate: Samples per second
+        bits_per_sample: Bits per sample
+        channels: Number of channels
+
+    Returns:
+        bytes: WAV header
+    """
+    block_align = channels * bits_per_sample // 8
+    byte_rate = sample_rate * block_align
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def parse_wav(data: bytes) -> Tuple[Tuple[int, int, int], memoryview]:
+    """
+    Locate the format and PCM data of a RIFF/WAVE payload.
+
+    Args:
+        data: Complete WAV file contents
+
+    Returns:
+        Tuple[Tuple[int, int, int], memoryview]: ((channels, sample_rate,
+        bits_per_sample), PCM data without copying)
+
+    Raises:
+        ValueError: If the payload is not a PCM WAV file
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE payload")
+
+    audio_format = None
+    position = 12
+    while position + 8 <= len(view):
+        chunk_id = bytes(view[position:position + 4])
+        chunk_size = struct.unpack_from("<I", view, position + 4)[0]
+        body_start = position + 8
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from(
+                "<HHIIHH", view, body_start
+            )
+            if format_tag != 1:
+                raise ValueError("Only PCM WAV payloads are supported")
+            audio_format = (channels, sample_rate, bits_per_sample)
+        elif chunk_id == b"data":
+            if audio_format is None:
+                raise ValueError("WAV data chunk precedes its fmt chunk")
+            # Streamed payloads may carry a placeholder size, clamp to what is there
+            return audio_format, view[body_start:min(len(view), body_start + chunk_size)]
+        # Chunks are padded to an even size
+        position = body_start + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV payload has no data chunk")
+
+
+def concat_wav(payloads: Iterable[bytes]) -> bytes:
+    """
+    Join WAV payloads of the same format into one WAV file.
+
+    Args:
+        payloads: WAV file contents in playback order
+
+    Returns:
+        bytes: Single WAV file with a header covering all PCM data
+
+    Raises:
+        ValueError: If the payloads are not PCM WAV files of the same format
+    """
+    audio_format = None
+    pcm_parts = []
+    for payload in payloads:
+        payload_format, pcm = parse_wav(payload)
+        if audio_format is None:
+            audio_format = payload_format
+        elif payload_format != audio_format:
+            raise ValueError("Cannot join WAV payloads with different formats")
+        pcm_parts.append(pcm)
+    if audio_format is None:
+        raise ValueError("No WAV payloads to join")
+
+    channels, sample_rate, bits_per_sample = audio_format
+    data_size = sum(len(pcm) for pcm in pcm_parts)
+    output = bytearray(wav_header(data_size, sample_rate, bits_per_sample, channels))
+    for pcm in pcm_parts:
+        output += pcm
+    return bytes(output)
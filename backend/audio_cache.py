@@ -0,0 +1,96 @@
+from typing import Optional
+
+from backend.cache import CacheStats, DirectoryCache, MemoryCache, TieredCache, content_key
+from backend.text_segmentation import normalize_text
+
+
+def audio_cache_key(text: str, voice: str, output_format: str) -> str:
+    """
+    Build the cache key of a synthesized phrase.
+
+    Args:
+        text: Synthesized text
+        voice: Voice name, or language code when the default voice is used
+        output_format: Name of the audio output format
+
+    Returns:
+        str: Content-addressed cache key
+    """
+    material = "\0".join([voice, output_format, normalize_text(text)])
+    return content_key(material.encode("utf-8"), namespace="tts")
+
+
+class AudioCache:
+    def __init__(self, directory: Optional[str] = None,
+                 memory_max_bytes: int = 32 * 1024 * 1024,
+                 memory_max_entries: int = 256,
+                 memory_max_entry_bytes: int = 1024 * 1024,
+                 disk_max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize a content-addressed cache for synthesized audio.
+
+        Small clips live in an in-process LRU tier; everything is also kept
+        on disk when a directory is given. Clips above memory_max_entry_bytes
+        stay on disk only and can be mapped with get_view.
+
+        Args:
+            directory: Root directory of the disk tier, memory only if None
+            memory_max_bytes: Byte budget of the memory tier
+            memory_max_entries: Maximum number of clips in the memory tier
+            memory_max_entry_bytes: Largest clip kept in the memory tier
+            disk_max_bytes: Byte budget of the disk tier
+        """
+        self.memory = MemoryCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes,
+                                  max_entry_bytes=memory_max_entry_bytes)
+        self.disk = DirectoryCache(directory, max_bytes=disk_max_bytes) if directory else None
+        self._tiers = TieredCache(self.memory, self.disk)
+
+    def get(self, text: str, voice: str, output_format: str) -> Optional[bytes]:
+        """
+        Look up synthesized audio.
+
+        Args:
+            text: Synthesized text
+            voice: Voice name, or language code when the default voice is used
+            output_format: Name of the audio output format
+
+        Returns:
+            bytes: Cached audio or None on a miss
+        """
+        return self._tiers.get(audio_cache_key(text, voice, output_format))
+
+    def get_view(self, text: str, voice: str, output_format: str) -> Optional[memoryview]:
+        """
+        Look up synthesized audio without copying large clips into memory.
+
+        Args:
+            text: Synthesized text
+            voice: Voice name, or language code when the default voice is used
+            output_format: Name of the audio output format
+
+        Returns:
+            memoryview: Cached audio, mmap-backed when served from disk, or None on a miss
+        """
+        key = audio_cache_key(text, voice, output_format)
+        value = self.memory.get(key)
+        if value is not None:
+            return memoryview(value)
+        if self.disk is not None:
+            return self.disk.get_view(key)
+        return None
+
+    def set(self, text: str, voice: str, output_format: str, audio: bytes) -> None:
+        """
+        Store synthesized audio.
+
+        Args:
+            text: Synthesized text
+            voice: Voice name, or language code when the default voice is used
+            output_format: Name of the audio output format
+            audio: Audio data
+        """
+        self._tiers.set(audio_cache_key(text, voice, output_format), audio)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._tiers.stats
@@ -0,0 +1,380 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from dotenv import load_dotenv
+
+from backend import instrumentation
+from backend.language_catalog import SUPPORTED_LANGUAGES
+from backend.pipeline import SUCCEEDED, Pipeline
+from backend.rate_limiter import ServiceLimiter, limiter_from_env
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# Speech locale of each translator code, e.g. 'es' -> 'es-ES'
+SPEECH_CODES = {config['code']: config['speech_code'] for config in SUPPORTED_LANGUAGES.values()}
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class BatchItem:
+    """One image to process."""
+    id: str
+    path: str
+    target_language: Optional[str] = None
+
+
+def discover_items(source: str) -> List[BatchItem]:
+    """
+    List the images described by a directory, glob pattern or JSONL manifest.
+
+    Manifest lines are objects with a "path" and optional "id" and
+    "target_language"; relative paths are resolved against the manifest.
+
+    Args:
+        source: Directory, glob pattern or path of a .jsonl manifest
+
+    Returns:
+        List[BatchItem]: Items in a stable order
+    """
+    if source.endswith('.jsonl') and os.path.isfile(source):
+        base_dir = os.path.dirname(os.path.abspath(source))
+        items = []
+        with open(source, 'r', encoding='utf-8') as manifest:
+            for line_number, line in enumerate(manifest, 1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'path' not in entry:
+                    raise ValueError(f"Manifest line {line_number} has no path")
+                path = entry['path']
+                if not os.path.isabs(path):
+                    path = os.path.join(base_dir, path)
+                items.append(BatchItem(str(entry.get('id', entry['path'])), path,
+                                       entry.get('target_language')))
+        return items
+
+    if os.path.isdir(source):
+        paths = [os.path.join(root, name)
+                 for root, _, names in os.walk(source) for name in names]
+        base_dir = source
+    else:
+        paths = glob.glob(source, recursive=True)
+        base_dir = None
+
+    items = []
+    for path in sorted(paths):
+        if not os.path.isfile(path) or not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        item_id = os.path.relpath(path, base_dir) if base_dir else path
+        items.append(BatchItem(item_id, path))
+    return items
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """
+    Read the ids already processed successfully from a results file.
+
+    A line cut short by a crash is ignored, so that item is redone.
+
+    Args:
+        output_path: JSONL results file written by a previous run
+
+    Returns:
+        Set[str]: Ids of the items that finished successfully
+    """
+    finished = set()
+    if not os.path.exists(output_path):
+        return finished
+    with open(output_path, 'r', encoding='utf-8') as results:
+        for line in results:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('status') == STATUS_OK:
+                finished.add(record['id'])
+    return finished
+
+
+class BatchProcessor:
+    def __init__(self, pipeline: Pipeline, target_language: str = 'es',
+                 workers: int = 4, audio_dir: Optional[str] = None,
+                 source_speech_language: str = 'en-US'):
+        """
+        Initialize a bulk processor running the pipeline over many images.
+
+        Args:
+            pipeline: Pipeline running OCR, translation and synthesis
+            target_language: Default translator code of the translations
+            workers: Maximum number of images processed at once
+            audio_dir: Directory receiving synthesized audio, no TTS if None
+            source_speech_language: Speech locale of the extracted text
+        """
+        self.pipeline = pipeline
+        self.target_language = target_language
+        self.workers = workers
+        self.audio_dir = audio_dir
+        self.source_speech_language = source_speech_language
+
+    def _save_audio(self, item: BatchItem, suffix: str, audio: Optional[bytes]) -> Optional[str]:
+        if audio is None:
+            return None
+        file_name = item.id.replace(os.sep, '_').replace('/', '_')
+        path = os.path.join(self.audio_dir, f"{os.path.splitext(file_name)[0]}.{suffix}.wav")
+        with open(path, 'wb') as audio_file:
+            audio_file.write(audio)
+        return path
+
+    def process_item(self, item: BatchItem) -> Dict[str, Any]:
+        """
+        Run the pipeline on one image.
+
+        Args:
+            item: Image to process
+
+        Returns:
+            Dict[str, Any]: Result record written to the output file
+        """
+        target_language = item.target_language or self.target_language
+        record = {'id': item.id, 'path': item.path, 'target_language': target_language}
+        try:
+            with open(item.path, 'rb') as image_file:
+                image_data = image_file.read()
+
+            synthesize = self.audio_dir is not None
+            result = self.pipeline.run(
+                image_data,
+                target_language,
+                target_speech_language=SPEECH_CODES.get(target_language) if synthesize else None,
+                source_speech_language=self.source_speech_language if synthesize else None
+            )
+
+            record['extracted_text'] = result.extracted_text
+            record['translated_text'] = result.translated_text
+            if synthesize:
+                record['original_audio'] = self._save_audio(item, 'original', result.original_audio)
+                record['translated_audio'] = self._save_audio(item, target_language,
+                                                              result.translated_audio)
+            record['timings'] = {name: {'status': timing.status, 'duration': timing.duration}
+                                 for name, timing in result.timings.items()}
+            failed = [name for name, timing in result.timings.items() if timing.status != SUCCEEDED]
+            record['status'] = STATUS_FAILED if failed else STATUS_OK
+            if failed:
+                record['error'] = f"Stages did not succeed: {', '.join(failed)}"
+        except Exception as e:
+            logger.error(f"Failed to process {item.path}: {str(e)}")
+            record['status'] = STATUS_FAILED
+            record['error'] = str(e)
+        return record
+
+    def process(self, items: List[BatchItem], output_path: str,
+                resume: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Process items, appending one JSON line per item as it finishes.
+
+        At most 2 * workers items are in flight so large manifests do not
+        queue every image up front.
+
+        Args:
+            items: Images to process
+            output_path: JSONL results file, also the checkpoint to resume from
+            resume: Skip items the results file already records as finished
+
+        Yields:
+            Dict[str, Any]: Result record of each processed item
+        """
+        finished = load_checkpoint(output_path) if resume else set()
+        todo = iter([item for item in items if item.id not in finished])
+        if finished:
+            logger.info(f"Resuming, {len(finished)} items already processed")
+        if self.audio_dir:
+            os.makedirs(self.audio_dir, exist_ok=True)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch") as executor, \
+                open(output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+            if resume and output.tell() > 0:
+                # Start on a fresh line after a record cut short by a crash
+                with open(output_path, 'rb') as existing:
+                    existing.seek(-1, os.SEEK_END)
+                    if existing.read(1) != b'\n':
+                        output.write('\n')
+
+            in_flight = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < 2 * self.workers:
+                    item = next(todo, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        in_flight.add(executor.submit(self.process_item, item))
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    # Flush per record so a crash loses at most the items in flight
+                    output.flush()
+                    yield record
+
+
+def build_limiters(vision_rate: Optional[float] = None, translator_rate: Optional[float] = None,
+                   translator_characters: Optional[float] = None,
+                   speech_streams: Optional[int] = None) -> Dict[str, Optional[ServiceLimiter]]:
+    """
+    Build the per-service limiters, falling back to the environment.
+
+    Args:
+        vision_rate: Maximum OCR calls per second, result polls included
+        translator_rate: Maximum translation requests per second
+        translator_characters: Maximum characters translated per minute
+        speech_streams: Maximum concurrent syntheses
+
+    Returns:
+        Dict[str, Optional[ServiceLimiter]]: Limiter per service name, None
+        for services without limits
+    """
+    limiters = {}
+    for service, options in (('vision', {'requests_per_second': vision_rate}),
+                             ('translator', {'requests_per_second': translator_rate,
+                                             'characters_per_minute': translator_characters}),
+                             ('speech', {'max_concurrent': speech_streams})):
+        if any(options.values()):
+            limiters[service] = ServiceLimiter(service, **options)
+        else:
+            limiters[service] = limiter_from_env(service)
+    return limiters
+
+
+def build_pipeline(workers: int, with_speech: bool,
+                   limiters: Optional[Dict[str, Optional[ServiceLimiter]]] = None,
+                   preprocess: bool = True) -> Pipeline:
+    """
+    Create the services from the environment and wrap them in a pipeline.
+
+    Args:
+        workers: Number of images processed at once
+        with_speech: Whether to create the speech service
+        limiters: Optional limiter per service name, see build_limiters
+        preprocess: Shrink images before uploading them to OCR
+
+    Returns:
+        Pipeline: Pipeline over the configured services
+    """
+    from backend.audio_cache import AudioCache
+    from backend.cache import MemoryCache, SQLiteCache, TieredCache
+    from backend.image_preprocessing import ImagePreprocessor
+    from backend.speech_service import SpeechService
+    from backend.translation_memory import TranslationMemory
+    from backend.translator_service import TranslatorService
+    from backend.vision_service import VisionService
+
+    limiters = limiters or {}
+    ocr_cache_path = os.getenv('OCR_CACHE_PATH')
+    vision_service = VisionService(
+        cache=TieredCache(MemoryCache(), SQLiteCache(ocr_cache_path) if ocr_cache_path else None),
+        rate_limiter=limiters.get('vision'),
+        preprocessor=ImagePreprocessor() if preprocess else None
+    )
+    translator_service = TranslatorService(
+        pool_size=max(10, workers),
+        translation_memory=TranslationMemory(os.getenv('TRANSLATION_MEMORY_PATH', ':memory:')),
+        rate_limiter=limiters.get('translator')
+    )
+    speech_service = None
+    if with_speech:
+        speech_service = SpeechService(pool_size=max(8, workers),
+                                       cache=AudioCache(os.getenv('TTS_CACHE_DIR')),
+                                       rate_limiter=limiters.get('speech'))
+
+    # Up to two stages of each image run at once
+    return Pipeline(vision_service, translator_service, speech_service, max_workers=2 * workers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.batch",
+        description="Extract, translate and optionally synthesize text from many images."
+    )
+    parser.add_argument('source', help="Image directory, glob pattern or JSONL manifest")
+    parser.add_argument('-o', '--output', default='output/results.jsonl',
+                        help="JSONL results file, also used as checkpoint (default: %(default)s)")
+    parser.add_argument('-t', '--target-language', default='es',
+                        help="Translator code to translate to (default: %(default)s)")
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                        help="Images processed at once (default: %(default)s)")
+    parser.add_argument('--audio-dir', help="Synthesize audio into this directory")
+    parser.add_argument('--source-speech-language', default='en-US',
+                        help="Speech locale of the extracted text (default: %(default)s)")
+    parser.add_argument('--vision-rate', type=float,
+                        help="Maximum OCR calls per second, result polls included")
+    parser.add_argument('--translator-rate', type=float,
+                        help="Maximum translation requests per second")
+    parser.add_argument('--translator-characters', type=float,
+                        help="Maximum characters translated per minute")
+    parser.add_argument('--speech-streams', type=int, help="Maximum concurrent syntheses")
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help="Upload images to OCR as they are instead of shrinking them")
+    parser.add_argument('--restart', action='store_true',
+                        help="Overwrite the results file instead of resuming from it")
+    parser.add_argument('--metrics',
+                        help="Write per-stage timings and counters to this file in the "
+                             "Prometheus text format when done")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    registry = instrumentation.enable() if args.metrics else instrumentation.enable_from_env()
+    items = discover_items(args.source)
+    if not items:
+        logger.error(f"No images found in {args.source}")
+        return 1
+
+    limiters = build_limiters(args.vision_rate, args.translator_rate,
+                              args.translator_characters, args.speech_streams)
+    pipeline = build_pipeline(args.workers, args.audio_dir is not None, limiters,
+                              not args.no_preprocess)
+    processor = BatchProcessor(pipeline, args.target_language, args.workers,
+                               args.audio_dir, args.source_speech_language)
+
+    processed = failed = 0
+    started = time.monotonic()
+    try:
+        for record in processor.process(items, args.output, resume=not args.restart):
+            processed += 1
+            if record['status'] != STATUS_OK:
+                failed += 1
+            logger.info(f"[{processed}] {record['id']}: {record['status']}")
+    finally:
+        pipeline.shutdown()
+
+    logger.info(f"Processed {processed} of {len(items)} items in "
+                f"{time.monotonic() - started:.1f}s, {failed} failed")
+    for limiter in filter(None, limiters.values()):
+        logger.info(f"{limiter.name} limiter: {limiter.stats.acquired} requests, "
+                    f"{limiter.stats.waited} waited (mean {limiter.stats.mean_wait:.2f}s, "
+                    f"max {limiter.stats.max_wait:.2f}s), {limiter.stats.throttled} throttled")
+    if args.metrics:
+        with open(args.metrics, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(registry.render())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+import argparse
+import io
+import json
+import logging
+import math
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from backend.fake_azure import FakeAzureServer, FakeEndpoint, Latency
+from backend.image_preprocessing import ImagePreprocessor
+from backend.pipeline import Pipeline
+from backend.polling import PollingStrategy
+from backend.speech_service import SpeechService
+from backend.translator_service import TranslatorService
+from backend.vision_service import VisionService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("vision", "translator", "speech", "pipeline")
+
+# Text translated and synthesized by the single-service scenarios
+SAMPLE_TEXT = ("The quick brown fox jumps over the lazy dog. "
+               "Pack my box with five dozen liquor jugs.")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list, q between 0 and 100."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """
+    Latency summary in seconds.
+
+    Args:
+        durations: Durations of the successful operations
+
+    Returns:
+        Dict[str, float]: count, mean, p50, p95, p99 and max
+    """
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else 0.0,
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def sample_image(width: int = 1600, height: int = 1200) -> bytes:
+    """JPEG with a few lines of text, sized like a phone photo after upload."""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(SAMPLE_TEXT.split(". ")):
+        draw.text((100, 100 + 60 * index), line, fill="black")
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=90)
+    return output.getvalue()
+
+
+def run_concurrently(operation: Callable[[int], Any], requests: int,
+                     concurrency: int) -> Tuple[List[Any], List[float], float]:
+    """
+    Call operation(index) for every index with at most concurrency calls at once.
+
+    Args:
+        operation: Function returning None or raising on failure
+        requests: Number of calls
+        concurrency: Maximum number of concurrent calls
+
+    Returns:
+        Tuple[List[Any], List[float], float]: Outputs in index order (None
+        for failures), durations of the successful calls and wall time
+    """
+    def timed(index):
+        started = time.perf_counter()
+        try:
+            output = operation(index)
+        except Exception as e:
+            logger.error(f"Benchmark operation failed: {str(e)}")
+            output = None
+        return output, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    wall_time = time.perf_counter() - started
+
+    outputs = [output for output, _ in results]
+    durations = [duration for output, duration in results if output is not None]
+    return outputs, durations, wall_time
+
+
+class Benchmark:
+    def __init__(self, server: FakeAzureServer, requests: int = 50, concurrency: int = 8,
+                 image_data: Optional[bytes] = None, target_language: str = "es",
+                 speech_language: str = "en-US", target_speech_language: str = "es-ES",
+                 preprocess: bool = True):
+        """
+        Initialize a benchmark of the real services against fake endpoints.
+
+        The services are configured like the app (pooled sessions, adaptive
+        polling, optional preprocessing) but without caches, so every
+        operation reaches the fake server.
+
+        Args:
+            server: Running fake server answering every service
+            requests: Operations per scenario
+            concurrency: Maximum number of concurrent operations
+            image_data: Image sent to OCR, a synthetic one if omitted
+            target_language: Translation target
+            speech_language: Speech locale of the extracted text
+            target_speech_language: Speech locale of the translation
+            preprocess: Shrink images before OCR, as the app does
+        """
+        self.server = server
+        self.requests = requests
+        self.concurrency = concurrency
+        self.image_data = image_data if image_data is not None else sample_image()
+        self.target_language = target_language
+        self.speech_language = speech_language
+        self.target_speech_language = target_speech_language
+
+        key = server.key or "fake-key"
+        self.vision_service = VisionService(
+            polling=PollingStrategy(min_delay=0.05),
+            preprocessor=ImagePreprocessor() if preprocess else None,
+            max_tile_workers=concurrency, endpoint=server.url, key=key
+        )
+        self.translator_service = TranslatorService(pool_size=concurrency, endpoint=server.url,
+                                                    key=key, region="local")
+        # A pipeline run synthesizes both texts at once
+        self.speech_service = SpeechService(pool_size=concurrency * 2,
+                                            endpoint=server.url + "/cognitiveservices/v1",
+                                            key=key, region="local")
+        # Room for every concurrent run's OCR, translation and two syntheses
+        self.pipeline = Pipeline(self.vision_service, self.translator_service,
+                                 self.speech_service, max_workers=concurrency * 3)
+
+    def close(self) -> None:
+        self.pipeline.shutdown()
+        self.translator_service.close()
+
+    def _scenario(self, operation: Callable[[int], Any],
+                  stage_durations: Optional[Callable[[List[Any]], Dict[str, List[float]]]] = None
+                  ) -> Dict[str, Any]:
+        self.server.reset_stats()
+        outputs, durations, wall_time = run_concurrently(operation, self.requests, self.concurrency)
+
+        latency = {"total": summarize(durations)}
+        if stage_durations is not None:
+            for stage, values in stage_durations(outputs).items():
+                latency[stage] = summarize(values)
+
+        succeeded = len(durations)
+        return {
+            "requests": self.requests,
+            "failed": self.requests - succeeded,
+            "concurrency": self.concurrency,
+            "wall_time": wall_time,
+            "throughput": succeeded / wall_time if wall_time else 0.0,
+            "latency": latency,
+            "traffic": {route: {"requests": stats.requests, "throttled": stats.throttled,
+                                "errors": stats.errors, "bytes_in": stats.bytes_in,
+                                "bytes_out": stats.bytes_out}
+                        for route, stats in self.server.stats().items()},
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def run_vision(self) -> Dict[str, Any]:
+        return self._scenario(
+            lambda _: self.vision_service.analyze_text(io.BytesIO(self.image_data))
+        )
+
+    def run_translator(self) -> Dict[str, Any]:
+        return self._scenario(
+            lambda index: self.translator_service.translate_text(f"{SAMPLE_TEXT} #{index}",
+                                                                 self.target_language)
+        )
+
+    def run_speech(self) -> Dict[str, Any]:
+        return self._scenario(
+            lambda _: self.speech_service.text_to_speech(SAMPLE_TEXT, self.speech_language)
+        )
+
+    def run_pipeline(self) -> Dict[str, Any]:
+        """The app flow: OCR, then translation and both syntheses."""
+        def operation(_):
+            result = self.pipeline.run(self.image_data, self.target_language,
+                                       self.target_speech_language, self.speech_language)
+            if result.translated_audio is None or result.original_audio is None:
+                return None
+            return result
+
+        def stage_durations(results):
+            durations = {}
+            for result in results:
+                if result is None:
+                    continue
+                for stage, timing in result.timings.items():
+                    if timing.duration is not None:
+                        durations.setdefault(stage, []).append(timing.duration)
+            return durations
+
+        return self._scenario(operation, stage_durations)
+
+    def run(self, scenarios=SCENARIOS) -> Dict[str, Dict[str, Any]]:
+        """
+        Run scenarios one after the other.
+
+        Args:
+            scenarios: Names from SCENARIOS
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Results keyed by scenario
+        """
+        results = {}
+        for name in scenarios:
+            logger.info(f"Running {name} benchmark: {self.requests} requests, "
+                        f"concurrency {self.concurrency}")
+            results[name] = getattr(self, f"run_{name}")()
+        return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """
+    Relative change of every p95 latency and throughput against a baseline.
+
+    Args:
+        results: Report written by this module
+        baseline: Earlier report
+
+    Returns:
+        List[Tuple[str, float]]: (metric, change) where a positive change is
+        a regression, e.g. 0.1 for a p95 10% slower or a throughput 10% lower
+    """
+    changes = []
+    for name, scenario in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for stage, summary in scenario["latency"].items():
+            old = previous["latency"].get(stage, {}).get("p95")
+            if old:
+                changes.append((f"{name}.{stage}.p95", summary["p95"] / old - 1))
+        if previous.get("throughput"):
+            changes.append((f"{name}.throughput", 1 - scenario["throughput"] / previous["throughput"]))
+    return changes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.benchmark",
+        description="Benchmark OCR, translation, speech and the full pipeline against fake Azure endpoints."
+    )
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), metavar='SCENARIO',
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('-n', '--requests', type=int, default=50, help="Operations per scenario")
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--image', help="Image to OCR, a synthetic 1600x1200 JPEG by default")
+    parser.add_argument('--no-preprocess', action='store_true')
+    parser.add_argument('--read-latency', type=Latency.parse, default=Latency(0.5),
+                        help="Read operation duration (default: 0.5)")
+    parser.add_argument('--vision-latency', type=Latency.parse, default=Latency(0.02))
+    parser.add_argument('--translator-latency', type=Latency.parse, default=Latency(0.05))
+    parser.add_argument('--speech-latency', type=Latency.parse, default=Latency(0.1))
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="Earlier JSON results to compare against")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Keep per-request logging")
+    parser.add_argument('--max-regression', type=float,
+                        help="Exit with status 1 if a p95 or throughput is this much worse "
+                             "than the baseline, e.g. 0.2")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    if not args.verbose:
+        # Per-request log lines would be measured along with the services
+        logging.getLogger().setLevel(logging.WARNING)
+
+    image_data = None
+    if args.image:
+        with open(args.image, 'rb') as image_file:
+            image_data = image_file.read()
+
+    def endpoint(latency):
+        return FakeEndpoint(latency, args.throttle_rate, args.error_rate, retry_after=0)
+
+    server = FakeAzureServer(vision=endpoint(args.vision_latency),
+                             translator=endpoint(args.translator_latency),
+                             speech=endpoint(args.speech_latency),
+                             read_latency=args.read_latency, seed=args.seed)
+    with server:
+        benchmark = Benchmark(server, args.requests, args.concurrency, image_data,
+                              preprocess=not args.no_preprocess)
+        try:
+            scenarios = benchmark.run(args.scenarios)
+        finally:
+            benchmark.close()
+
+    report = {
+        "revision": git_revision(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: (vars(value) if isinstance(value, Latency) else value)
+                   for key, value in vars(args).items()
+                   if key not in ("output", "baseline", "max_regression", "verbose")},
+        "scenarios": scenarios,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+    for name, scenario in scenarios.items():
+        print(f"{name}: {scenario['throughput']:.1f} ops/s, {scenario['failed']} failed")
+        for stage, summary in scenario["latency"].items():
+            print(f"  {stage:<17} p50 {summary['p50'] * 1000:7.1f}ms  p95 {summary['p95'] * 1000:7.1f}ms"
+                  f"  p99 {summary['p99'] * 1000:7.1f}ms")
+        bytes_in = sum(route["bytes_in"] for route in scenario["traffic"].values())
+        bytes_out = sum(route["bytes_out"] for route in scenario["traffic"].values())
+        print(f"  sent {bytes_in} bytes, received {bytes_out} bytes")
+    if report["peak_rss_bytes"] is not None:
+        print(f"Peak RSS: {report['peak_rss_bytes'] / 2 ** 20:.1f} MiB (fake server included)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            changes = compare(report, json.load(baseline_file))
+        regressions = []
+        for metric, change in changes:
+            print(f"{metric}: {change:+.1%}")
+            if args.max_regression is not None and change > args.max_regression:
+                regressions.append(metric)
+        if regressions:
+            print(f"Regressed beyond {args.max_regression:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def content_key(data: bytes, namespace: str = "") -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        data: Raw bytes to hash
+        namespace: Optional prefix separating unrelated caches
+
+    Returns:
+        str: Hex digest of the data, prefixed with the namespace
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{namespace}:{digest}" if namespace else digest
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss/eviction counters for a cache tier."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 max_entry_bytes: Optional[int] = None):
+        """
+        Initialize an in-process LRU cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total size of the cached values
+            max_entry_bytes: Values larger than this are not kept, defaults to max_bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes if max_entry_bytes is None else max_entry_bytes
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently used entries when over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if len(value) > min(self.max_bytes, self.max_entry_bytes):
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize an on-disk cache backed by SQLite that survives restarts.
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Maximum total size of the cached values
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and refresh its access time.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.stats.hits += 1
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently used entries when over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), time.time())
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            while total > self.max_bytes:
+                oldest = self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed ASC LIMIT 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (oldest[0],))
+                total -= oldest[1]
+                self.stats.evictions += 1
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class DirectoryCache:
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize an on-disk cache storing one file per entry in sharded directories.
+
+        Entries can be read back through mmap, so large blobs are served
+        from the page cache instead of being copied into the heap.
+
+        Args:
+            directory: Root directory of the cache
+            max_bytes: Maximum total size of the cached files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # File name -> (size, modification time in ns) as last written or read here
+        self._index = OrderedDict()
+        self._size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Rebuild the LRU order from modification times left by earlier runs
+        existing = []
+        for shard in os.listdir(directory):
+            shard_path = os.path.join(directory, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                if name.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(shard_path, name))
+                existing.append((stat.st_mtime_ns, name, stat.st_size))
+        for mtime, name, size in sorted(existing):
+            self._index[name] = (size, mtime)
+            self._size += size
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name[:2], name)
+
+    def _touch(self, key: str) -> Optional[str]:
+        name = self._name(key)
+        path = self._path(name)
+        now = time.time_ns()
+        with self._lock:
+            if name not in self._index:
+                self.stats.misses += 1
+                return None
+            self._index.move_to_end(name)
+            self._index[name] = (self._index[name][0], now)
+            self.stats.hits += 1
+            try:
+                os.utime(path, ns=(now, now))
+            except OSError:
+                pass
+        return path
+
+    def _evict(self, name: str, size: int, mtime: int) -> None:
+        """Delete an evicted file unless it changed since it was indexed; call with the lock held."""
+        path = self._path(name)
+        try:
+            stat = os.stat(path)
+            # Rewritten or read by another process sharing the directory, leave it
+            if stat.st_size != size or stat.st_mtime_ns > mtime:
+                return
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read a value into memory.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value or None on a miss
+        """
+        path = self._touch(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as cached_file:
+                return cached_file.read()
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry: {str(e)}")
+            return None
+
+    def get_view(self, key: str) -> Optional[memoryview]:
+        """
+        Map a value from disk without reading it into memory.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            memoryview: Read-only view backed by mmap or None on a miss
+        """
+        path = self._touch(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as cached_file:
+                if os.fstat(cached_file.fileno()).st_size == 0:
+                    return memoryview(b"")
+                return memoryview(mmap.mmap(cached_file.fileno(), 0, access=mmap.ACCESS_READ))
+        except OSError as e:
+            logger.warning(f"Failed to map cache entry: {str(e)}")
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently used files when over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if len(value) > self.max_bytes:
+            return
+        name = self._name(key)
+        path = self._path(name)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+
+        # Write to a unique file then rename, so readers never see a partial
+        # file and concurrent writers, in any process, never share one
+        descriptor, temp_path = tempfile.mkstemp(dir=shard, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as cached_file:
+                cached_file.write(value)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        # Renaming and evicting under the lock keeps a fresh write from being
+        # deleted by an eviction of the same key in another thread
+        now = time.time_ns()
+        with self._lock:
+            os.replace(temp_path, path)
+            os.utime(path, ns=(now, now))
+            self._size -= self._index.pop(name, (0, 0))[0]
+            self._index[name] = (len(value), now)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                oldest, (size, mtime) = self._index.popitem(last=False)
+                self._size -= size
+                self.stats.evictions += 1
+                self._evict(oldest, size, mtime)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            names, self._index = list(self._index), OrderedDict()
+            self._size = 0
+        for name in names:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class TieredCache:
+    def __init__(self, memory: Optional[MemoryCache] = None, disk=None):
+        """
+        Combine an in-process LRU tier with an optional persistent tier.
+
+        Args:
+            memory: In-process tier, a default MemoryCache is created if omitted
+            disk: Optional persistent tier (e.g. SQLiteCache or DirectoryCache)
+        """
+        self.memory = memory if memory is not None else MemoryCache()
+        self.disk = disk
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value in memory first, then on disk, promoting disk hits.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value or None on a miss
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value in every tier.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        """Remove all entries from every tier."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hits and misses across tiers, evictions summed over every tier."""
+        evictions = self.memory.stats.evictions
+        if self.disk is not None:
+            evictions += self.disk.stats.evictions
+        return CacheStats(hits=self._hits, misses=self._misses, evictions=evictions)
@@ -0,0 +1,472 @@
+import argparse
+import json
+import logging
+import math
+import random
+import struct
+import sys
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ElementTree
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backend.audio import SAMPLE_RATE, wav_header
+from backend.language_catalog import SUPPORTED_LANGUAGES
+from backend.utils import inspect_image
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# One period of a 400 Hz tone at the output sample rate, repeated as synthetic speech
+_TONE_PERIOD = b"".join(
+    struct.pack("<h", int(8000 * math.sin(2 * math.pi * sample / (SAMPLE_RATE // 400))))
+    for sample in range(SAMPLE_RATE // 400)
+)
+
+DEFAULT_OCR_LINES = ["Fake Azure OCR", "The quick brown fox jumps over the lazy dog."]
+
+
+@dataclass
+class Latency:
+    """Delay distribution in seconds."""
+    median: float = 0.0
+    spread: float = 0.0
+    distribution: str = "fixed"
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draw one delay.
+
+        fixed always returns the median, uniform draws within median +/- spread,
+        lognormal uses spread as the sigma of the log and exponential ignores it.
+        """
+        if self.median <= 0 or self.distribution == "fixed":
+            return max(0.0, self.median)
+        if self.distribution == "uniform":
+            return rng.uniform(max(0.0, self.median - self.spread), self.median + self.spread)
+        if self.distribution == "lognormal":
+            return self.median * math.exp(rng.gauss(0.0, self.spread))
+        if self.distribution == "exponential":
+            # Median of an exponential is ln(2) / rate
+            return rng.expovariate(math.log(2) / self.median)
+        raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """
+        Parse a command line latency, e.g. "0.2", "uniform:0.2:0.05" or "lognormal:0.2:0.5".
+        """
+        parts = spec.split(":")
+        if len(parts) == 1:
+            return cls(float(parts[0]))
+        distribution, median = parts[0], float(parts[1])
+        spread = float(parts[2]) if len(parts) > 2 else 0.0
+        latency = cls(median, spread, distribution)
+        latency.sample(random.Random(0))
+        return latency
+
+
+@dataclass
+class FakeEndpoint:
+    """Behaviour of one fake service."""
+    latency: Latency = field(default_factory=Latency)
+    # Share of requests answered with 429 and with 500
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    # Whole seconds, as sent by Azure and as urllib3 expects
+    retry_after: int = 1
+
+
+@dataclass
+class EndpointStats:
+    """Counters of one fake route."""
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    characters: int = 0
+    busy_time: float = 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real endpoints, pooled clients depend on it
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle would hold the body for an ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.fake._handle(self)
+
+    def do_POST(self):
+        self.server.fake._handle(self)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakeAzureServer:
+    def __init__(self, vision: Optional[FakeEndpoint] = None,
+                 translator: Optional[FakeEndpoint] = None,
+                 speech: Optional[FakeEndpoint] = None,
+                 read_latency: Optional[Latency] = None,
+                 ocr_lines: Optional[List[str]] = None, key: Optional[str] = None,
+                 seconds_per_character: float = 0.06, seed: Optional[int] = None,
+                 operation_ttl: float = 300.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize a local stand-in for the Read, Translator and TTS REST APIs.
+
+        One threaded HTTP server answers all three services, so the real
+        clients (the Computer Vision SDK, requests and httpx) run unchanged
+        against it. Responses are deterministic; only the injected latency
+        and faults are random, and a seed makes them reproducible.
+
+        Args:
+            vision: Latency and faults of every Read API request, polls included
+            translator: Latency and faults of /translate and /languages
+            speech: Latency and faults of text to speech
+            read_latency: Time a Read operation stays running before it succeeds
+            ocr_lines: Lines every Read operation returns
+            key: Subscription key requests must carry, any key is accepted if omitted
+            seconds_per_character: Length of the synthesized audio per character
+            seed: Seed of the latency and fault draws
+            operation_ttl: Seconds a Read operation is kept when its result is
+                never fetched; fetched results are dropped right away
+            host: Interface to listen on
+            port: Port to listen on, a free one is picked if 0
+        """
+        self.endpoints = {
+            "vision": vision or FakeEndpoint(),
+            "translator": translator or FakeEndpoint(),
+            "speech": speech or FakeEndpoint(),
+        }
+        self.read_latency = read_latency or Latency()
+        self.ocr_lines = list(ocr_lines) if ocr_lines is not None else list(DEFAULT_OCR_LINES)
+        self.key = key
+        self.seconds_per_character = seconds_per_character
+        self.operation_ttl = operation_ttl
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # Operation id -> (submitted, ready_at, width, height), in submission order
+        self._operations: Dict[str, Tuple[float, float, int, int]] = {}
+        self._stats: Dict[str, EndpointStats] = {}
+        self._started = None
+        self._thread = None
+
+        self._languages = json.dumps({"translation": {
+            config["code"]: {"name": name, "nativeName": name, "dir": "ltr"}
+            for name, config in SUPPORTED_LANGUAGES.items()
+        }}).encode("utf-8")
+        self._languages_etag = f'"{uuid.uuid5(uuid.NAMESPACE_OID, self._languages.decode())}"'
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables pointing the services at this server."""
+        key = self.key or "fake-key"
+        return {
+            "AZURE_VISION_ENDPOINT": self.url,
+            "AZURE_VISION_KEY": key,
+            "AZURE_TRANSLATOR_ENDPOINT": self.url,
+            "AZURE_TRANSLATOR_KEY": key,
+            "AZURE_TRANSLATOR_REGION": "local",
+            "AZURE_SPEECH_TTS_ENDPOINT": self.url + "/cognitiveservices/v1",
+            "AZURE_SPEECH_KEY": key,
+            "AZURE_SPEECH_REGION": "local",
+        }
+
+    def start(self) -> "FakeAzureServer":
+        """Serve requests from a background thread."""
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,),
+                                        name="fake-azure", daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Azure services listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeAzureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, EndpointStats]:
+        """
+        Copy of the counters per route: read, read-result, translate, languages and tts.
+        """
+        with self._lock:
+            return {route: EndpointStats(**asdict(stats)) for route, stats in self._stats.items()}
+
+    def throughput(self) -> Dict[str, float]:
+        """Requests per second per route since the server started."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {route: stats.requests / elapsed if elapsed else 0.0
+                for route, stats in self.stats().items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._started = time.monotonic()
+
+    def _route(self, method: str, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Route and service name of a request, (None, None) if unknown."""
+        if method == "POST" and path.endswith("/vision/v3.2/read/analyze"):
+            return "read", "vision"
+        if method == "GET" and "/vision/v3.2/read/analyzeResults/" in path:
+            return "read-result", "vision"
+        if method == "POST" and path.endswith("/translate"):
+            return "translate", "translator"
+        if method == "GET" and path.endswith("/languages"):
+            return "languages", "translator"
+        if method == "POST" and path.endswith("/cognitiveservices/v1"):
+            return "tts", "speech"
+        return None, None
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        started = time.monotonic()
+        url = urlsplit(request.path)
+        body = self._read_body(request)
+        route, service = self._route(request.command, url.path)
+
+        if route is None:
+            self._respond(request, 404, {}, b"")
+            return
+        if self.key is not None and request.headers.get("Ocp-Apim-Subscription-Key") != self.key:
+            self._respond(request, 401, {}, self._error("401", "Access denied due to invalid subscription key."))
+            return
+
+        endpoint = self.endpoints[service]
+        with self._lock:
+            delay = endpoint.latency.sample(self._rng)
+            draw = self._rng.random()
+        time.sleep(delay)
+
+        characters = 0
+        if draw < endpoint.throttle_rate:
+            status, headers, payload = 429, {"Retry-After": str(endpoint.retry_after)}, \
+                self._error("429", "Rate limit is exceeded.")
+        elif draw < endpoint.throttle_rate + endpoint.error_rate:
+            status, headers, payload = 500, {}, self._error("500", "Injected server error.")
+        else:
+            params = parse_qs(url.query)
+            if route == "read":
+                status, headers, payload = self._read(request, url.path, body)
+            elif route == "read-result":
+                status, headers, payload = self._read_result(url.path)
+            elif route == "translate":
+                status, headers, payload, characters = self._translate(params, body)
+            elif route == "languages":
+                status, headers, payload = self._languages_response(request)
+            else:
+                status, headers, payload, characters = self._tts(request, body)
+
+        # Count before replying so a client sees its own request in the stats
+        with self._lock:
+            stats = self._stats.setdefault(route, EndpointStats())
+            stats.requests += 1
+            stats.throttled += status == 429
+            stats.errors += status >= 500
+            stats.bytes_in += len(body)
+            stats.bytes_out += len(payload)
+            stats.characters += characters
+            stats.busy_time += time.monotonic() - started
+        self._respond(request, status, headers, payload)
+
+    @staticmethod
+    def _read_body(request: BaseHTTPRequestHandler) -> bytes:
+        """Request body, the Vision SDK uploads streams with chunked encoding."""
+        if request.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return request.rfile.read(int(request.headers.get("Content-Length") or 0))
+        chunks = []
+        while True:
+            size = int(request.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                # Skip trailers up to the blank line ending the body
+                while request.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(request.rfile.read(size))
+            request.rfile.readline()
+
+    @staticmethod
+    def _error(code: str, message: str) -> bytes:
+        return json.dumps({"error": {"code": code, "message": message}}).encode("utf-8")
+
+    @staticmethod
+    def _respond(request: BaseHTTPRequestHandler, status: int, headers: Dict[str, str],
+                 payload: bytes) -> None:
+        request.send_response(status)
+        headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _read(self, request: BaseHTTPRequestHandler, path: str,
+              body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        image_info, error = inspect_image(body, max_bytes=len(body), max_dimension=None)
+        if image_info is None:
+            return 400, {}, self._error("InvalidImage", error or "Input data is not a valid image.")
+
+        operation_id = uuid.uuid4().hex
+        with self._lock:
+            now = time.monotonic()
+            # Oldest first, so only the expired entries are looked at
+            for expired_id, operation in list(self._operations.items()):
+                if operation[0] + self.operation_ttl > now:
+                    break
+                del self._operations[expired_id]
+            ready_at = now + self.read_latency.sample(self._rng)
+            self._operations[operation_id] = (now, ready_at, image_info.width, image_info.height)
+        location = (f"http://{request.headers.get('Host')}"
+                    f"{path[:-len('/analyze')]}/analyzeResults/{operation_id}")
+        return 202, {"Operation-Location": location}, b""
+
+    def _read_result(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        operation_id = path.rsplit("/", 1)[-1]
+        with self._lock:
+            operation = self._operations.get(operation_id)
+            # A finished operation is fetched once, keeping it would grow memory under load
+            if operation is not None and time.monotonic() >= operation[1]:
+                del self._operations[operation_id]
+        if operation is None:
+            return 404, {}, self._error("NotFound", "Operation not found.")
+
+        _, ready_at, width, height = operation
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        result = {"status": "running", "createdDateTime": now, "lastUpdatedDateTime": now}
+        if time.monotonic() >= ready_at:
+            result["status"] = "succeeded"
+            result["analyzeResult"] = {
+                "version": "3.2.0",
+                "modelVersion": "2022-04-30",
+                "readResults": [{"page": 1, "angle": 0, "width": width, "height": height,
+                                 "unit": "pixel", "lines": self._ocr_lines()}],
+            }
+        return 200, {}, json.dumps(result).encode("utf-8")
+
+    def _ocr_lines(self) -> List[dict]:
+        """Lines stacked top to bottom, 10 pixels per character and 40 per line."""
+        lines = []
+        for index, text in enumerate(self.ocr_lines):
+            top, bottom = 20 + 40 * index, 50 + 40 * index
+            words, left = [], 20
+            for word in text.split():
+                right = left + 10 * len(word)
+                words.append({"boundingBox": [left, top, right, top, right, bottom, left, bottom],
+                              "text": word, "confidence": 0.99})
+                left = right + 10
+            lines.append({"boundingBox": [20, top, left - 10, top, left - 10, bottom, 20, bottom],
+                          "text": text, "words": words})
+        return lines
+
+    def _translate(self, params: Dict[str, List[str]],
+                   body: bytes) -> Tuple[int, Dict[str, str], bytes, int]:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            return 400, {}, self._error("400000", "The request body is not valid JSON."), 0
+        targets = params.get("to", [])
+        if not targets:
+            return 400, {}, self._error("400036", "The target language is not valid."), 0
+
+        texts = [item.get("Text", item.get("text", "")) for item in items]
+        response = []
+        for text in texts:
+            translated = {"translations": [{"text": f"[{target}] {text}", "to": target}
+                                           for target in targets]}
+            if "from" not in params:
+                translated["detectedLanguage"] = {"language": "en", "score": 1.0}
+            response.append(translated)
+        characters = sum(len(text) for text in texts) * len(targets)
+        return 200, {}, json.dumps(response, ensure_ascii=False).encode("utf-8"), characters
+
+    def _languages_response(self, request: BaseHTTPRequestHandler) -> Tuple[int, Dict[str, str], bytes]:
+        headers = {"ETag": self._languages_etag}
+        if request.headers.get("If-None-Match") == self._languages_etag:
+            return 304, headers, b""
+        return 200, headers, self._languages
+
+    def _tts(self, request: BaseHTTPRequestHandler,
+             body: bytes) -> Tuple[int, Dict[str, str], bytes, int]:
+        try:
+            text = "".join(ElementTree.fromstring(body).itertext())
+        except ElementTree.ParseError:
+            return 400, {}, self._error("400", "The SSML is not valid XML."), 0
+
+        samples = int(len(text) * self.seconds_per_character * SAMPLE_RATE)
+        periods, remainder = divmod(samples * 2, len(_TONE_PERIOD))
+        pcm = _TONE_PERIOD * periods + _TONE_PERIOD[:remainder]
+        output_format = request.headers.get("X-Microsoft-OutputFormat", "riff-24khz-16bit-mono-pcm")
+        if output_format.startswith("raw-"):
+            return 200, {"Content-Type": "audio/x-wav"}, pcm, len(text)
+        return 200, {"Content-Type": "audio/x-wav"}, wav_header(len(pcm)) + pcm, len(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.fake_azure",
+        description="Serve fake Read, Translator and text to speech endpoints for load testing."
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--key', help="Subscription key to require")
+    parser.add_argument('--read-latency', type=Latency.parse, default=Latency(1.0),
+                        help="Read operation duration, e.g. lognormal:1.0:0.3 (default: 1.0)")
+    for service in ('vision', 'translator', 'speech'):
+        parser.add_argument(f'--{service}-latency', type=Latency.parse, default=Latency(),
+                            help=f"Per request {service} latency, e.g. uniform:0.1:0.05")
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help="Share of requests answered with 429")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Share of requests answered with 500")
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    def endpoint(latency):
+        return FakeEndpoint(latency, args.throttle_rate, args.error_rate, args.retry_after)
+
+    server = FakeAzureServer(vision=endpoint(args.vision_latency),
+                             translator=endpoint(args.translator_latency),
+                             speech=endpoint(args.speech_latency),
+                             read_latency=args.read_latency, key=args.key, seed=args.seed,
+                             host=args.host, port=args.port)
+    with server:
+        for name, value in server.environment().items():
+            print(f"export {name}={value}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        for route, stats in server.stats().items():
+            print(f"{route}: {stats.requests} requests, {stats.throttled} throttled, "
+                  f"{stats.errors} errors, {stats.bytes_in} bytes in, {stats.bytes_out} bytes out")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import io
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreprocessingResult:
+    """Image bytes to send to OCR and what preprocessing changed."""
+    data: bytes
+    format: str
+    original_bytes: int
+    original_size: Tuple[int, int]
+    size: Tuple[int, int]
+    duration: float
+    changed: bool = True
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.data)
+
+
+@dataclass
+class PreprocessingStats:
+    """Totals over every image handled by a preprocessor."""
+    images: int = 0
+    unchanged: int = 0
+    original_bytes: int = 0
+    processed_bytes: int = 0
+    total_time: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.processed_bytes
+
+    @property
+    def ratio(self) -> float:
+        return self.processed_bytes / self.original_bytes if self.original_bytes else 1.0
+
+
+class ImagePreprocessor:
+    def __init__(self, max_dimension: int = 2048, grayscale: bool = True,
+                 output_format: str = 'JPEG', quality: int = 85,
+                 min_dimension: int = 50):
+        """
+        Initialize a preprocessor shrinking images before they are sent to OCR.
+
+        Images are rotated upright from their EXIF orientation, downscaled so
+        their longest side is at most max_dimension, optionally converted to
+        grayscale and re-encoded. The original bytes are kept whenever the
+        result would not be smaller.
+
+        Args:
+            max_dimension: Longest side after downscaling, in pixels; the Read
+                API needs about 12px high characters, which 2048px keeps for
+                typical photos of documents and signs
+            grayscale: Drop color, which OCR does not use
+            output_format: Pillow format of the re-encoded image ('JPEG' or 'PNG')
+            quality: JPEG quality
+            min_dimension: Images with a side below this are left untouched,
+                the Read API rejects images under 50px; long, narrow images
+                are downscaled less so their short side stays at least this
+        """
+        self.max_dimension = max_dimension
+        self.grayscale = grayscale
+        self.output_format = output_format.upper()
+        self.quality = quality
+        self.min_dimension = min_dimension
+        self.stats = PreprocessingStats()
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self) -> str:
+        """Every setting that changes the output, e.g. for cache keys."""
+        return (f"max_dimension={self.max_dimension},grayscale={self.grayscale},"
+                f"format={self.output_format},quality={self.quality},"
+                f"min_dimension={self.min_dimension}")
+
+    def _scale(self, size: Tuple[int, int]) -> float:
+        """Downscale factor for an image size, 1.0 if it is left as is."""
+        scale = self.max_dimension / max(size)
+        if scale >= 1:
+            return 1.0
+        # Never shrink the short side below what the Read API accepts
+        return min(1.0, max(scale, self.min_dimension / min(size)))
+
+    def _record(self, result: PreprocessingResult) -> None:
+        with self._lock:
+            self.stats.images += 1
+            self.stats.unchanged += 0 if result.changed else 1
+            self.stats.original_bytes += result.original_bytes
+            self.stats.processed_bytes += len(result.data)
+            self.stats.total_time += result.duration
+
+    def process(self, image_data: bytes) -> PreprocessingResult:
+        """
+        Prepare image bytes for OCR.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            PreprocessingResult: Bytes to upload with the size and time saved
+
+        Raises:
+            PIL.UnidentifiedImageError: If the bytes are not a readable image
+        """
+        # Imported here so importing the module stays cheap at startup
+        from PIL import Image, ImageOps
+
+        started = time.monotonic()
+        image = Image.open(io.BytesIO(image_data))
+        original_format = image.format
+        original_size = image.size
+
+        scale = self._scale(image.size)
+        if scale < 1:
+            # Let the JPEG decoder skip detail we would throw away anyway
+            image.draft('L' if self.grayscale else 'RGB',
+                        (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+        image = ImageOps.exif_transpose(image)
+
+        if min(image.size) < self.min_dimension:
+            result = PreprocessingResult(image_data, original_format, len(image_data),
+                                         original_size, original_size,
+                                         time.monotonic() - started, changed=False)
+            self._record(result)
+            return result
+
+        if self.grayscale and image.mode != 'L':
+            image = image.convert('L')
+        elif image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        # Rescaled from the drafted size, which may already be reduced
+        scale = self._scale(image.size)
+        if scale < 1:
+            image = image.resize((max(1, round(image.width * scale)),
+                                  max(1, round(image.height * scale))), Image.LANCZOS)
+
+        output = io.BytesIO()
+        if self.output_format == 'JPEG':
+            image.save(output, 'JPEG', quality=self.quality, optimize=True)
+        else:
+            image.save(output, self.output_format, optimize=True)
+        processed = output.getvalue()
+
+        if len(processed) < len(image_data):
+            result = PreprocessingResult(processed, self.output_format, len(image_data),
+                                         original_size, image.size, time.monotonic() - started)
+        else:
+            result = PreprocessingResult(image_data, original_format, len(image_data),
+                                         original_size, original_size,
+                                         time.monotonic() - started, changed=False)
+        self._record(result)
+        logger.info(f"Preprocessed image {original_size[0]}x{original_size[1]} -> "
+                    f"{result.size[0]}x{result.size[1]}, {result.original_bytes} -> "
+                    f"{len(result.data)} bytes in {result.duration * 1000:.0f}ms")
+        return result
+
+
+def compare_ocr_latency(vision_service, preprocessor: ImagePreprocessor,
+                        image_data: bytes) -> dict:
+    """
+    Run OCR on the raw and the preprocessed image and report the difference.
+
+    The vision service should have no cache, or the second call is free.
+
+    Args:
+        vision_service: VisionService without a preprocessor
+        preprocessor: Preprocessor under test
+        image_data: Raw image bytes
+
+    Returns:
+        dict: Bytes and OCR latency of both variants and whether the
+        extracted texts match
+    """
+    result = preprocessor.process(image_data)
+
+    started = time.monotonic()
+    raw_text = vision_service.extract_text(io.BytesIO(image_data))
+    raw_latency = time.monotonic() - started
+
+    started = time.monotonic()
+    processed_text = vision_service.extract_text(io.BytesIO(result.data))
+    processed_latency = time.monotonic() - started
+
+    return {
+        'original_bytes': result.original_bytes,
+        'processed_bytes': len(result.data),
+        'preprocessing_time': result.duration,
+        'raw_ocr_latency': raw_latency,
+        'processed_ocr_latency': processed_latency,
+        'latency_change': processed_latency + result.duration - raw_latency,
+        'same_text': raw_text == processed_text,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.image_preprocessing",
+        description="Report how much OCR preprocessing shrinks images and changes OCR latency."
+    )
+    parser.add_argument('images', nargs='+', help="Image files")
+    parser.add_argument('--max-dimension', type=int, default=2048)
+    parser.add_argument('--color', action='store_true', help="Keep color")
+    parser.add_argument('--format', default='JPEG', help="Output format (default: %(default)s)")
+    parser.add_argument('--quality', type=int, default=85)
+    parser.add_argument('--ocr', action='store_true',
+                        help="Also run Azure OCR on both variants and compare latency")
+    args = parser.parse_args(argv)
+
+    preprocessor = ImagePreprocessor(args.max_dimension, not args.color, args.format, args.quality)
+    vision_service = None
+    if args.ocr:
+        from dotenv import load_dotenv
+        from backend.vision_service import VisionService
+        load_dotenv()
+        vision_service = VisionService()
+
+    for path in args.images:
+        with open(path, 'rb') as image_file:
+            image_data = image_file.read()
+        if vision_service is not None:
+            report = compare_ocr_latency(vision_service, preprocessor, image_data)
+            print(f"{os.path.basename(path)}: {report['original_bytes']} -> "
+                  f"{report['processed_bytes']} bytes, OCR {report['raw_ocr_latency']:.2f}s -> "
+                  f"{report['processed_ocr_latency']:.2f}s (+{report['preprocessing_time']:.2f}s "
+                  f"preprocessing), same text: {report['same_text']}")
+        else:
+            result = preprocessor.process(image_data)
+            print(f"{os.path.basename(path)}: {result.original_bytes} -> {len(result.data)} bytes "
+                  f"({result.original_size[0]}x{result.original_size[1]} -> "
+                  f"{result.size[0]}x{result.size[1]}) in {result.duration * 1000:.0f}ms")
+
+    stats = preprocessor.stats
+    print(f"Total: {stats.original_bytes} -> {stats.processed_bytes} bytes "
+          f"({stats.bytes_saved} saved, {stats.ratio:.0%} of original)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the span duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = ['{}="{}"'.format(key, value.replace("\\", "\\\\").replace('"', '\\"')
+                              .replace("\n", "\\n"))
+             for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "image_translator_", buckets=DEFAULT_BUCKETS):
+        """
+        Initialize an in-process store of counters and histograms.
+
+        Args:
+            prefix: Prepended to every metric name in the Prometheus export
+            buckets: Upper bounds of the histogram buckets, ascending
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        # Per series: observations per bucket, the last one unbounded, then sum and count
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, object]] = None) -> None:
+        key = (name, _labels(labels or {}))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float,
+                labels: Optional[Dict[str, object]] = None) -> None:
+        key = (name, _labels(labels or {}))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(self.buckets) + 3)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter, 0 if it was never incremented."""
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels) -> Tuple[int, float]:
+        """(count, sum) of a histogram, (0, 0.0) if nothing was observed."""
+        with self._lock:
+            series = self._histograms.get((name, _labels(labels)))
+            return (int(series[-1]), series[-2]) if series else (0, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Export every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, e.g. served on /metrics
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(series)) for key, series in self._histograms.items())
+
+        lines = []
+        previous = None
+        for (name, labels), value in counters:
+            if name != previous:
+                lines.append(f"# TYPE {self.prefix}{name} counter")
+                previous = name
+            lines.append(f"{self.prefix}{name}{_format_labels(labels)} {_format_value(value)}")
+
+        previous = None
+        for (name, labels), series in histograms:
+            if name != previous:
+                lines.append(f"# TYPE {self.prefix}{name} histogram")
+                previous = name
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="{}"'.format("+Inf" if bound == float("inf") else repr(bound))
+                lines.append(f"{self.prefix}{name}_bucket{_format_labels(labels, le)} {int(cumulative)}")
+            lines.append(f"{self.prefix}{name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.prefix}{name}_count{_format_labels(labels)} {int(series[-1])}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+# Set by enable(); None keeps every helper below a no-op
+_registry: Optional[MetricsRegistry] = None
+_tracer = None
+_NOOP_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "labels", "started", "otel_span")
+
+    def __init__(self, name: str, labels: Dict[str, object]):
+        self.name = name
+        self.labels = labels
+        self.otel_span = None
+
+    def __enter__(self):
+        if _tracer is not None:
+            self.otel_span = _tracer.start_as_current_span(
+                self.name, attributes={key: str(value) for key, value in self.labels.items()})
+            self.otel_span.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self.started
+        registry = _registry
+        if registry is not None:
+            registry.observe(f"{self.name}_seconds", duration, self.labels)
+            if exc_type is not None:
+                registry.inc(f"{self.name}_failures_total", 1, self.labels)
+        if self.otel_span is not None:
+            self.otel_span.__exit__(exc_type, exc, traceback)
+        return False
+
+
+def span(name: str, **labels):
+    """
+    Time a block into the {name}_seconds histogram and, if enabled, an OpenTelemetry span.
+
+    Blocks that raise also increment {name}_failures_total. While
+    instrumentation is disabled this returns a shared no-op context manager.
+
+    Args:
+        name: Metric and span name, e.g. "vision_read_poll"
+        **labels: Label values, e.g. service="translator"
+
+    Returns:
+        Context manager timing the block
+    """
+    if _registry is None and _tracer is None:
+        return _NOOP_SPAN
+    return _Span(name, labels)
+
+
+def enabled() -> bool:
+    """Whether metrics are recorded, to skip computing values nobody will see."""
+    return _registry is not None
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter, e.g. count("cache_hits_total", cache="ocr")."""
+    registry = _registry
+    if registry is not None and value:
+        registry.inc(name, value, labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record a value in a histogram."""
+    registry = _registry
+    if registry is not None:
+        registry.observe(name, value, labels)
+
+
+def enable(registry: Optional[MetricsRegistry] = None,
+           opentelemetry: bool = False) -> MetricsRegistry:
+    """
+    Start recording metrics, and OpenTelemetry spans if asked and installed.
+
+    Spans go to the globally configured OpenTelemetry tracer provider, so
+    exporters are set up the usual way, e.g. with opentelemetry-instrument.
+
+    Args:
+        registry: Registry to record into, a new one is created if omitted
+        opentelemetry: Also emit spans through the opentelemetry API
+
+    Returns:
+        MetricsRegistry: The active registry
+    """
+    global _registry, _tracer
+    _registry = registry if registry is not None else (_registry or MetricsRegistry())
+    if opentelemetry:
+        try:
+            from opentelemetry import trace
+            _tracer = trace.get_tracer("image-text-translator")
+        except ImportError:
+            logger.warning("OpenTelemetry requested but the opentelemetry-api package is not installed")
+    return _registry
+
+
+def disable() -> None:
+    """Stop recording; the helpers go back to being no-ops."""
+    global _registry, _tracer
+    _registry = None
+    _tracer = None
+
+
+def get_registry() -> Optional[MetricsRegistry]:
+    return _registry
+
+
+def enable_from_env() -> Optional[MetricsRegistry]:
+    """
+    Enable instrumentation when METRICS_ENABLED or OTEL_ENABLED is set to a true value.
+
+    Returns:
+        MetricsRegistry: The active registry, None if instrumentation stays off
+    """
+    def flag(name):
+        return os.getenv(name, '').lower() in ('1', 'true', 'yes')
+
+    if flag('METRICS_ENABLED') or flag('OTEL_ENABLED'):
+        return enable(opentelemetry=flag('OTEL_ENABLED'))
+    return None
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """
+    Serve the active registry on http://host:port/metrics from a daemon thread.
+
+    Args:
+        port: Port to listen on
+        host: Interface to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server, shutdown() stops it
+    """
+    # Imported here so importing the module stays cheap at startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            registry = _registry
+            body = (registry.render() if registry is not None else "").encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
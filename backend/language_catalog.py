@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Languages offered by the app: translator code, default voice and speech locale
+SUPPORTED_LANGUAGES = {
+    'English': {'code': 'en', 'voice': 'en-US-JennyMultilingualNeural', 'speech_code': 'en-US'},
+    'Spanish': {'code': 'es', 'voice': 'es-ES-ElviraNeural', 'speech_code': 'es-ES'},
+    'French': {'code': 'fr', 'voice': 'fr-FR-DeniseNeural', 'speech_code': 'fr-FR'},
+    'Arabic': {'code': 'ar', 'voice': 'ar-SA-ZariyahNeural', 'speech_code': 'ar-SA'},
+    'German': {'code': 'de', 'voice': 'de-DE-KatjaNeural', 'speech_code': 'de-DE'},
+}
+
+# Default voice per speech locale, e.g. 'es-ES' -> 'es-ES-ElviraNeural'
+DEFAULT_VOICES = {config['speech_code']: config['voice'] for config in SUPPORTED_LANGUAGES.values()}
+
+
+class LanguageCatalog:
+    def __init__(self, endpoint: str = 'https://api.cognitive.microsofttranslator.com',
+                 session=None, cache_path: Optional[str] = None,
+                 max_age_seconds: float = 24 * 3600, timeout: float = 30.0):
+        """
+        Initialize the catalog of languages supported by the Translator service.
+
+        The catalog is loaded from cache_path when present, fetched once
+        otherwise, and revalidated in the background with the stored ETag
+        once it is older than max_age_seconds.
+
+        Args:
+            endpoint: Translator endpoint
+            session: HTTP session to reuse, a new one is created if omitted
+            cache_path: Optional JSON file persisting the catalog and its ETag
+            max_age_seconds: Age after which the catalog is revalidated
+            timeout: Per-request timeout in seconds
+        """
+        self.endpoint = endpoint
+        if session is None:
+            # Imported here so importing the module stays cheap at startup
+            import requests
+            session = requests.Session()
+        self.session = session
+        self.cache_path = cache_path
+        self.max_age_seconds = max_age_seconds
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._languages = {}
+        self._etag = None
+        self._fetched_at = 0.0
+        self._name_by_code = {}
+        self._code_by_name = {}
+        self._voice_by_code = {}
+
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                    cached = json.load(cache_file)
+                self._apply(cached['languages'], cached.get('etag'), cached.get('fetched_at', 0.0))
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load language catalog: {str(e)}")
+        self._apply({}, None, 0.0)
+
+    def _save(self, languages: Dict[str, Dict[str, str]], etag: Optional[str],
+              fetched_at: float) -> None:
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            # Unique per writer, a foreground and a background refresh may overlap
+            temp_path = f"{self.cache_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'languages': languages, 'etag': etag,
+                           'fetched_at': fetched_at}, cache_file, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to persist language catalog: {str(e)}")
+
+    def _apply(self, languages: Dict[str, Dict[str, str]], etag: Optional[str],
+               fetched_at: float) -> None:
+        """Swap in a catalog version with its ETag and indexes at once, readers never mix versions."""
+        indexes = self._build_indexes(languages)
+        with self._lock:
+            self._languages = languages
+            self._etag = etag
+            self._fetched_at = fetched_at
+            self._name_by_code, self._code_by_name, self._voice_by_code = indexes
+
+    @staticmethod
+    def _build_indexes(languages: Dict[str, Dict[str, str]]) -> Tuple[Dict, Dict, Dict]:
+        """Build the lookup tables once per catalog version instead of per request."""
+        name_by_code = {code: details['name'] for code, details in languages.items()}
+        for name, config in SUPPORTED_LANGUAGES.items():
+            name_by_code.setdefault(config['code'], name)
+
+        code_by_name = {}
+        for code, name in name_by_code.items():
+            code_by_name[name.casefold()] = code
+            native_name = languages.get(code, {}).get('nativeName')
+            if native_name:
+                code_by_name.setdefault(native_name.casefold(), code)
+
+        voice_by_code = {config['code']: config['voice'] for config in SUPPORTED_LANGUAGES.values()}
+        return name_by_code, code_by_name, voice_by_code
+
+    def refresh(self) -> bool:
+        """
+        Fetch the catalog, sending the stored ETag so unchanged catalogs cost no body.
+
+        Returns:
+            bool: True if the catalog is up to date, False if the request failed
+        """
+        try:
+            with self._lock:
+                languages, etag = self._languages, self._etag
+            headers = {'If-None-Match': etag} if etag else {}
+            response = self.session.get(
+                self.endpoint + '/languages',
+                params={'api-version': '3.0', 'scope': 'translation'},
+                headers=headers,
+                timeout=self.timeout
+            )
+            if response.status_code == 304:
+                fetched_at = time.time()
+                with self._lock:
+                    # Only the version the ETag was sent for is revalidated
+                    current = self._etag == etag
+                    if current:
+                        self._fetched_at = fetched_at
+                if current:
+                    self._save(languages, etag, fetched_at)
+                logger.info("Language catalog revalidated, unchanged")
+                return True
+            response.raise_for_status()
+
+            languages = response.json()['translation']
+            etag = response.headers.get('ETag')
+            fetched_at = time.time()
+            self._apply(languages, etag, fetched_at)
+            self._save(languages, etag, fetched_at)
+            logger.info(f"Language catalog refreshed with {len(languages)} languages")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh language catalog: {str(e)}")
+            return False
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='language-catalog-refresh', daemon=True).start()
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at > self.max_age_seconds
+
+    def get_languages(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get the supported languages, fetching them on first use.
+
+        A stale catalog is returned immediately while it is revalidated in
+        the background.
+
+        Returns:
+            Dict containing language codes and names, empty if never fetched
+        """
+        if not self._languages:
+            self.refresh()
+        elif self.is_stale:
+            self._refresh_in_background()
+        return self._languages
+
+    def name(self, code: str) -> Optional[str]:
+        """Display name of a language code, e.g. 'es' -> 'Spanish'."""
+        return self._name_by_code.get(code)
+
+    def code(self, name: str) -> Optional[str]:
+        """Language code of an English or native display name, e.g. 'Español' -> 'es'."""
+        return self._code_by_name.get(name.casefold())
+
+    def default_voice(self, code: str) -> Optional[str]:
+        """Default neural voice of a language code, e.g. 'es' -> 'es-ES-ElviraNeural'."""
+        return self._voice_by_code.get(code)
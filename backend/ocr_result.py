@@ -0,0 +1,194 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Axis-aligned box as (left, top, right, bottom) in the page's unit
+Box = Tuple[float, float, float, float]
+
+# Cache namespace of OcrResult.to_json() entries, shared by the sync and async services
+OCR_CACHE_NAMESPACE = "ocr-result"
+
+
+def ocr_cache_key(image_bytes: bytes, image_info=None, settings: str = "") -> str:
+    """
+    Cache key of the OcrResult read from an image.
+
+    Boxes are in the coordinates of the image as read, so everything that
+    changes those (preprocessing, tiling) has to be part of the key.
+
+    Args:
+        image_bytes: Raw image bytes as uploaded
+        image_info: Optional backend.utils.ImageInfo whose hash is reused
+        settings: Description of how the image was prepared for the service,
+            empty if it was sent as is
+
+    Returns:
+        str: Key in OCR_CACHE_NAMESPACE
+    """
+    digest = image_info.sha256 if image_info is not None else hashlib.sha256(image_bytes).hexdigest()
+    if not settings:
+        return f"{OCR_CACHE_NAMESPACE}:{digest}"
+    settings_digest = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+    return f"{OCR_CACHE_NAMESPACE}:{digest}:{settings_digest}"
+
+
+def polygon_box(polygon: Optional[Sequence[float]], dx: float = 0, dy: float = 0) -> Box:
+    """
+    Bounding box of a Read API polygon ([x1, y1, ..., x4, y4]), shifted by (dx, dy).
+    """
+    if not polygon:
+        return (dx, dy, dx, dy)
+    xs = polygon[0::2]
+    ys = polygon[1::2]
+    return (min(xs) + dx, min(ys) + dy, max(xs) + dx, max(ys) + dy)
+
+
+@dataclass(slots=True)
+class OcrWord:
+    text: str
+    box: Box
+    confidence: float
+
+
+@dataclass(slots=True)
+class OcrLine:
+    text: str
+    box: Box
+    words: List[OcrWord] = field(default_factory=list)
+
+    @property
+    def confidence(self) -> Optional[float]:
+        """Lowest word confidence, None if the service returned no words."""
+        return min((word.confidence for word in self.words), default=None)
+
+
+@dataclass(slots=True)
+class OcrPage:
+    number: int
+    width: float
+    height: float
+    unit: str
+    angle: float
+    lines: List[OcrLine] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class OcrResult:
+    """Pages, lines and words read from one image, with the plain text built on demand."""
+    pages: List[OcrPage] = field(default_factory=list)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def lines(self) -> Iterator[OcrLine]:
+        for page in self.pages:
+            yield from page.lines
+
+    @property
+    def text(self) -> str:
+        """Lines joined by newlines, computed once."""
+        if self._text is None:
+            self._text = "\n".join(line.text for line in self.lines).strip()
+        return self._text
+
+    @classmethod
+    def from_read_results(cls, read_results, dx: float = 0, dy: float = 0) -> "OcrResult":
+        """
+        Build a result from the SDK's ReadResult pages.
+
+        Args:
+            read_results: analyze_result.read_results of a Read operation
+            dx: Offset added to every x coordinate, e.g. a tile's left edge
+            dy: Offset added to every y coordinate, e.g. a tile's top edge
+
+        Returns:
+            OcrResult: Structured result
+        """
+        return cls([
+            OcrPage(
+                page.page, page.width, page.height,
+                getattr(page.unit, 'value', page.unit), page.angle,
+                [OcrLine(line.text, polygon_box(line.bounding_box, dx, dy),
+                         [OcrWord(word.text, polygon_box(word.bounding_box, dx, dy),
+                                  word.confidence)
+                          for word in line.words or []])
+                 for line in page.lines]
+            )
+            for page in read_results
+        ])
+
+    @classmethod
+    def from_rest(cls, analyze_result: dict) -> "OcrResult":
+        """
+        Build a result from the analyzeResult JSON of the Read REST API.
+
+        Args:
+            analyze_result: Decoded analyzeResult object
+
+        Returns:
+            OcrResult: Structured result
+        """
+        return cls([
+            OcrPage(
+                page["page"], page["width"], page["height"], page["unit"], page.get("angle", 0),
+                [OcrLine(line["text"], polygon_box(line.get("boundingBox")),
+                         [OcrWord(word["text"], polygon_box(word.get("boundingBox")),
+                                  word.get("confidence", 1.0))
+                          for word in line.get("words", [])])
+                 for line in page["lines"]]
+            )
+            for page in analyze_result["readResults"]
+        ])
+
+    def to_dict(self) -> dict:
+        """
+        Nested dicts for API responses, with the text and line confidences included.
+
+        Returns:
+            dict: text and pages, each with its lines and their words
+        """
+        return {
+            "text": self.text,
+            "pages": [{
+                "number": page.number, "width": page.width, "height": page.height,
+                "unit": page.unit, "angle": page.angle,
+                "lines": [{
+                    "text": line.text, "box": list(line.box), "confidence": line.confidence,
+                    "words": [{"text": word.text, "box": list(word.box),
+                               "confidence": word.confidence} for word in line.words],
+                } for line in page.lines],
+            } for page in self.pages],
+        }
+
+    def to_json(self) -> bytes:
+        """
+        Serialize compactly, lines and words as nested arrays.
+
+        Returns:
+            bytes: UTF-8 JSON
+        """
+        return json.dumps([
+            [page.number, page.width, page.height, page.unit, page.angle,
+             [[line.text, line.box, [[word.text, word.box, word.confidence] for word in line.words]]
+              for line in page.lines]]
+            for page in self.pages
+        ], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "OcrResult":
+        """
+        Rebuild a result serialized with to_json.
+
+        Args:
+            data: UTF-8 JSON
+
+        Returns:
+            OcrResult: Structured result
+        """
+        return cls([
+            OcrPage(number, width, height, unit, angle,
+                    [OcrLine(text, tuple(box), [OcrWord(word_text, tuple(word_box), confidence)
+                                                for word_text, word_box, confidence in words])
+                     for text, box, words in lines])
+            for number, width, height, unit, angle, lines in json.loads(data)
+        ])
@@ -0,0 +1,346 @@
+import io
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stage states
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+
+def _not_none(output: Any) -> bool:
+    return output is not None
+
+
+def _has_text(output: Any) -> bool:
+    return bool(output and output.strip())
+
+
+@dataclass
+class Stage:
+    """A unit of work that runs once all of its dependencies succeeded."""
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+    # Outputs it rejects count as failures, so dependents are skipped
+    accept: Callable[[Any], bool] = _not_none
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock timing and outcome of one stage."""
+    status: str
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+@dataclass
+class PipelineResult:
+    """Outputs of a pipeline run, None for stages that did not succeed."""
+    extracted_text: Optional[str] = None
+    translated_text: Optional[str] = None
+    original_audio: Optional[bytes] = None
+    translated_audio: Optional[bytes] = None
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+
+
+class PipelineRun:
+    # Seconds between checks for cancellation while stages are running
+    CANCEL_CHECK_INTERVAL = 0.05
+
+    def __init__(self, stages: List[Stage], executor: ThreadPoolExecutor):
+        """
+        Track one execution of a stage graph.
+
+        Stages are scheduled from the thread iterating as_completed, so UI
+        code can render each output on its own thread as soon as it exists.
+
+        Args:
+            stages: Stages in any order, dependencies referenced by name
+            executor: Executor running the stage functions
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.executor = executor
+        self.results = {}
+        self.timings = {}
+        self._cancelled = set()
+        self._cancel_all = threading.Event()
+        self._consumed = False
+
+    def cancel(self, stage: Optional[str] = None) -> None:
+        """
+        Cancel one stage, or the whole run when no stage is given.
+
+        Stages that have not started are skipped along with their dependents;
+        a stage already running finishes in the background but its output
+        is discarded.
+
+        Args:
+            stage: Name of the stage to cancel
+        """
+        if stage is None:
+            self._cancel_all.set()
+        else:
+            self._cancelled.add(stage)
+
+    def _is_cancelled(self, name: str) -> bool:
+        return self._cancel_all.is_set() or name in self._cancelled
+
+    def _execute(self, stage: Stage) -> Any:
+        timing = self.timings[stage.name]
+        timing.started = time.monotonic()
+        try:
+            return stage.func(self.results)
+        finally:
+            timing.finished = time.monotonic()
+
+    def as_completed(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the graph, yielding (stage name, output) as stages succeed.
+
+        Independent stages run concurrently. A stage that raised or whose
+        output its accept predicate rejects (by default None) counts as
+        failed, and its dependents are skipped.
+
+        Yields:
+            Tuple[str, Any]: Name and output of each succeeded stage
+        """
+        if self._consumed:
+            raise RuntimeError("A pipeline run can only be consumed once")
+        self._consumed = True
+
+        pending = dict(self.stages)
+        running = {}
+        while pending or running:
+            # Resolve stages that can no longer run, then submit the ready ones
+            for name, stage in list(pending.items()):
+                if self._is_cancelled(name):
+                    self.timings[name] = StageTiming(CANCELLED)
+                    del pending[name]
+                elif any(self.timings.get(dep) and
+                         self.timings[dep].status in (FAILED, SKIPPED, CANCELLED)
+                         for dep in stage.depends_on):
+                    self.timings[name] = StageTiming(SKIPPED)
+                    del pending[name]
+                elif all(dep in self.results for dep in stage.depends_on):
+                    self.timings[name] = StageTiming(RUNNING)
+                    running[self.executor.submit(self._execute, stage)] = name
+                    del pending[name]
+
+            if not running:
+                if pending:
+                    # Dependencies that never resolve, e.g. a typo in depends_on
+                    for name in pending:
+                        self.timings[name] = StageTiming(SKIPPED)
+                    logger.warning(f"Pipeline stages never became ready: {', '.join(pending)}")
+                break
+
+            # Wake up regularly so cancelling a running stage does not wait for it
+            done, _ = wait(running, timeout=self.CANCEL_CHECK_INTERVAL,
+                           return_when=FIRST_COMPLETED)
+            for future, name in list(running.items()):
+                if future not in done and self._is_cancelled(name):
+                    future.cancel()
+                    self.timings[name].status = CANCELLED
+                    del running[future]
+
+            for future in done:
+                name = running.pop(future)
+                timing = self.timings[name]
+                if self._is_cancelled(name):
+                    timing.status = CANCELLED
+                    continue
+                try:
+                    output = future.result()
+                except Exception as e:
+                    logger.error(f"Pipeline stage {name} failed: {str(e)}")
+                    output = None
+                if not self.stages[name].accept(output):
+                    timing.status = FAILED
+                    continue
+                timing.status = SUCCEEDED
+                self.results[name] = output
+                logger.info(f"Pipeline stage {name} finished in {timing.duration:.2f}s")
+                yield name, output
+
+    def wait(self) -> Dict[str, Any]:
+        """
+        Run the graph to completion.
+
+        Returns:
+            Dict[str, Any]: Outputs of the succeeded stages keyed by name
+        """
+        for _ in self.as_completed():
+            pass
+        return self.results
+
+
+class Pipeline:
+    # Stage names, also the keys of PipelineRun.results
+    OCR = "ocr"
+    TRANSLATION = "translation"
+    ORIGINAL_AUDIO = "original_audio"
+    TRANSLATED_AUDIO = "translated_audio"
+
+    def __init__(self, vision_service, translator_service, speech_service, max_workers: int = 4):
+        """
+        Initialize the OCR -> translate -> TTS pipeline.
+
+        Args:
+            vision_service: VisionService used for OCR
+            translator_service: TranslatorService used for translation
+            speech_service: SpeechService used for synthesis
+            max_workers: Maximum number of stages running at once across runs
+        """
+        self.vision_service = vision_service
+        self.translator_service = translator_service
+        self.speech_service = speech_service
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+
+    def build_stages(self, image_data: bytes, target_language: str,
+                     target_speech_language: Optional[str] = None,
+                     source_speech_language: Optional[str] = "en-US",
+                     source_language: Optional[str] = None, image_info=None) -> List[Stage]:
+        """
+        Build the stage graph for one image.
+
+        Original audio and translation both depend only on OCR, so they run
+        concurrently; translated audio waits for the translation.
+
+        Args:
+            image_data: Raw image bytes
+            target_language: Translator code to translate to (e.g., 'es')
+            target_speech_language: Speech locale of the translation, no
+                translated audio if None
+            source_speech_language: Speech locale of the extracted text, no
+                original audio if None
+            source_language: Optional translator code of the extracted text
+            image_info: Optional backend.utils.ImageInfo from validating the image
+
+        Returns:
+            List[Stage]: Stages of the graph
+        """
+        stages = [
+            # An image without text has nothing to translate or read out
+            Stage(self.OCR, lambda results: self.vision_service.extract_text(
+                io.BytesIO(image_data), image_info=image_info), accept=_has_text),
+            Stage(self.TRANSLATION,
+                  lambda results: self.translator_service.translate_text(
+                      results[self.OCR], target_language, source_language),
+                  depends_on=(self.OCR,)),
+        ]
+        if source_speech_language:
+            stages.append(Stage(
+                self.ORIGINAL_AUDIO,
+                lambda results: self.speech_service.text_to_speech(
+                    results[self.OCR], source_speech_language),
+                depends_on=(self.OCR,)
+            ))
+        if target_speech_language:
+            stages.append(Stage(
+                self.TRANSLATED_AUDIO,
+                lambda results: self.speech_service.text_to_speech(
+                    results[self.TRANSLATION], target_speech_language),
+                depends_on=(self.TRANSLATION,)
+            ))
+        return stages
+
+    def start(self, image_data: bytes, target_language: str,
+              target_speech_language: Optional[str] = None,
+              source_speech_language: Optional[str] = "en-US",
+              source_language: Optional[str] = None, image_info=None) -> PipelineRun:
+        """
+        Prepare a run; stages execute while PipelineRun.as_completed is iterated.
+
+        Args:
+            image_data: Raw image bytes
+            target_language: Translator code to translate to (e.g., 'es')
+            target_speech_language: Speech locale of the translation
+            source_speech_language: Speech locale of the extracted text
+            source_language: Optional translator code of the extracted text
+            image_info: Optional backend.utils.ImageInfo from validating the image
+
+        Returns:
+            PipelineRun: Handle used to consume outputs or cancel stages
+        """
+        stages = self.build_stages(image_data, target_language, target_speech_language,
+                                   source_speech_language, source_language, image_info)
+        return PipelineRun(stages, self.executor)
+
+    def run(self, image_data: bytes, target_language: str,
+            target_speech_language: Optional[str] = None,
+            source_speech_language: Optional[str] = "en-US",
+            source_language: Optional[str] = None, image_info=None) -> PipelineResult:
+        """
+        Process one image end to end.
+
+        Args:
+            image_data: Raw image bytes
+            target_language: Translator code to translate to (e.g., 'es')
+            target_speech_language: Speech locale of the translation
+            source_speech_language: Speech locale of the extracted text
+            source_language: Optional translator code of the extracted text
+            image_info: Optional backend.utils.ImageInfo from validating the image
+
+        Returns:
+            PipelineResult: Stage outputs and timings
+        """
+        pipeline_run = self.start(image_data, target_language, target_speech_language,
+                                  source_speech_language, source_language, image_info)
+        results = pipeline_run.wait()
+        return PipelineResult(
+            extracted_text=results.get(self.OCR),
+            translated_text=results.get(self.TRANSLATION),
+            original_audio=results.get(self.ORIGINAL_AUDIO),
+            translated_audio=results.get(self.TRANSLATED_AUDIO),
+            timings=pipeline_run.timings
+        )
+
+    def warm_up(self, speech_languages: Tuple[str, ...] = ("en-US",)) -> List[Future]:
+        """
+        Import the SDKs and open connections for every service in the background.
+
+        Services create their clients on first use; calling this at startup
+        moves that cost off the first request. Warm-up is best effort,
+        failures are logged and the services retry on first use.
+
+        Args:
+            speech_languages: Locales whose synthesizers are pre-connected
+
+        Returns:
+            List[Future]: One future per service, done once it is warm
+        """
+        def warm(name, func):
+            started = time.monotonic()
+            try:
+                func()
+                logger.info(f"Warmed up {name} in {time.monotonic() - started:.2f}s")
+            except Exception as e:
+                logger.warning(f"Warm-up of {name} failed: {str(e)}")
+
+        services = [
+            ("vision", getattr(self.vision_service, "warm_up", None)),
+            ("translator", getattr(self.translator_service, "warm_up", None)),
+            ("speech", getattr(self.speech_service, "warm_up", None)
+             and (lambda: self.speech_service.warm_up(speech_languages))),
+        ]
+        return [self.executor.submit(warm, name, func) for name, func in services if func]
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once running stages finish."""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,221 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollStats:
+    """Outcome of a single polling loop."""
+    polls: int = 0
+    wall_time: float = 0.0
+    timed_out: bool = False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PollingStrategy:
+    def __init__(self, min_delay: float = 0.05, max_delay: float = 2.0,
+                 multiplier: float = 1.6, jitter: float = 0.2, deadline: float = 60.0,
+                 first_poll_fraction: float = 0.5, smoothing: float = 0.3):
+        """
+        Initialize an adaptive, deadline-aware polling strategy.
+
+        Args:
+            min_delay: Shortest wait between polls in seconds
+            max_delay: Longest wait between polls in seconds
+            multiplier: Backoff factor applied after each pending poll
+            jitter: Relative random spread applied to every delay
+            deadline: Overall time budget of one polling loop in seconds
+            first_poll_fraction: Share of the expected completion time to wait
+                before the first poll
+            smoothing: Weight of the newest observation in the learned estimate
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.first_poll_fraction = first_poll_fraction
+        self.smoothing = smoothing
+
+        # Learned seconds per (megabyte + 1), the +1 accounting for fixed overhead
+        self._seconds_per_unit = None
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.total_polls = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def _size_units(size_bytes: int) -> float:
+        return size_bytes / (1024 * 1024) + 1.0
+
+    def estimate_completion(self, size_bytes: int) -> Optional[float]:
+        """
+        Estimate how long an operation on a payload of this size takes.
+
+        Args:
+            size_bytes: Size of the submitted payload
+
+        Returns:
+            float: Expected completion time in seconds or None before any observation
+        """
+        with self._lock:
+            if self._seconds_per_unit is None:
+                return None
+            return self._seconds_per_unit * self._size_units(size_bytes)
+
+    def observe(self, size_bytes: int, elapsed: float) -> None:
+        """
+        Feed an observed completion time back into the estimate.
+
+        Args:
+            size_bytes: Size of the submitted payload
+            elapsed: Seconds until the operation completed
+        """
+        sample = elapsed / self._size_units(size_bytes)
+        with self._lock:
+            if self._seconds_per_unit is None:
+                self._seconds_per_unit = sample
+            else:
+                self._seconds_per_unit += self.smoothing * (sample - self._seconds_per_unit)
+
+    def initial_delay(self, size_bytes: int) -> float:
+        """
+        Pick the wait before the first poll.
+
+        Args:
+            size_bytes: Size of the submitted payload
+
+        Returns:
+            float: Delay in seconds
+        """
+        estimate = self.estimate_completion(size_bytes)
+        if estimate is None:
+            return self.min_delay
+        return min(self.max_delay, max(self.min_delay, estimate * self.first_poll_fraction))
+
+    def _jittered(self, delay: float) -> float:
+        spread = delay * self.jitter
+        return max(0.0, delay + random.uniform(-spread, spread))
+
+    def poll(self, fetch: Callable[[], Tuple[Any, Optional[float]]],
+             is_pending: Callable[[Any], bool], size_bytes: int = 0) -> Tuple[Any, PollStats]:
+        """
+        Poll until the operation leaves the pending state or the deadline passes.
+
+        Args:
+            fetch: Callable returning the latest result and an optional
+                Retry-After delay in seconds
+            is_pending: Callable telling whether a result is still in progress
+            size_bytes: Size of the submitted payload, used for the initial delay
+
+        Returns:
+            Tuple[Any, PollStats]: (last result, polling statistics)
+        """
+        stats = PollStats()
+        start = time.monotonic()
+        deadline_at = start + self.deadline
+        delay = self.initial_delay(size_bytes)
+        next_delay = self._jittered(delay)
+        result = None
+
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                stats.timed_out = True
+                break
+            time.sleep(min(next_delay, remaining))
+
+            result, retry_after = fetch()
+            stats.polls += 1
+            if not is_pending(result):
+                break
+
+            delay = min(self.max_delay, delay * self.multiplier)
+            next_delay = retry_after if retry_after is not None else self._jittered(delay)
+
+        stats.wall_time = time.monotonic() - start
+        self._record(stats, size_bytes)
+        return result, stats
+
+    async def poll_async(self, fetch: Callable[[], Awaitable[Tuple[Any, Optional[float]]]],
+                         is_pending: Callable[[Any], bool],
+                         size_bytes: int = 0) -> Tuple[Any, PollStats]:
+        """
+        Coroutine version of poll that waits with asyncio.sleep.
+
+        Args:
+            fetch: Coroutine function returning the latest result and an
+                optional Retry-After delay in seconds
+            is_pending: Callable telling whether a result is still in progress
+            size_bytes: Size of the submitted payload, used for the initial delay
+
+        Returns:
+            Tuple[Any, PollStats]: (last result, polling statistics)
+        """
+        # Only async callers pay for importing asyncio
+        import asyncio
+
+        stats = PollStats()
+        start = time.monotonic()
+        deadline_at = start + self.deadline
+        delay = self.initial_delay(size_bytes)
+        next_delay = self._jittered(delay)
+        result = None
+
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                stats.timed_out = True
+                break
+            await asyncio.sleep(min(next_delay, remaining))
+
+            result, retry_after = await fetch()
+            stats.polls += 1
+            if not is_pending(result):
+                break
+
+            delay = min(self.max_delay, delay * self.multiplier)
+            next_delay = retry_after if retry_after is not None else self._jittered(delay)
+
+        stats.wall_time = time.monotonic() - start
+        self._record(stats, size_bytes)
+        return result, stats
+
+    def _record(self, stats: PollStats, size_bytes: int) -> None:
+        if not stats.timed_out:
+            self.observe(size_bytes, stats.wall_time)
+
+        with self._lock:
+            self.calls += 1
+            self.total_polls += stats.polls
+            if stats.timed_out:
+                self.timeouts += 1
@@ -0,0 +1,451 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterStats:
+    """Counters of a rate limiter."""
+    acquired: int = 0
+    waited: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    throttled: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _FifoGate:
+    """Condition handing a resource to threads and coroutines strictly in arrival order."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue = deque()
+        # (event loop, future) of coroutines waiting for a notification
+        self._async_waiters = []
+
+    def _notify(self) -> None:
+        """Wake every waiting thread and coroutine; call with the condition held."""
+        self._condition.notify_all()
+        for loop, future in self._async_waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        self._async_waiters.clear()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def _wait_turn(self, ticket: object, ready, deadline: Optional[float]) -> None:
+        """
+        Block until ticket is first in line and ready() returns 0.
+
+        ready is called with the condition held and returns the number of
+        seconds to sleep before checking again, 0 when the resource can be
+        taken, or None to wait for a notification.
+        """
+        while True:
+            if self._queue[0] is ticket:
+                delay = ready()
+                if delay == 0:
+                    return
+            else:
+                delay = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for the rate limiter")
+                delay = remaining if delay is None else min(delay, remaining)
+            self._condition.wait(delay)
+
+    async def _wait_turn_async(self, ticket: object, ready, take) -> None:
+        """
+        Coroutine version of _wait_turn that queues ticket and calls take() once ready.
+
+        No thread is blocked while waiting; release() and pause() wake the
+        coroutine through its event loop. A cancelled waiter leaves the
+        queue without taking anything.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._condition:
+                    delay = ready() if self._queue[0] is ticket else None
+                    if delay == 0:
+                        take()
+                        return
+                    future = loop.create_future()
+                    self._async_waiters.append((loop, future))
+                try:
+                    await asyncio.wait_for(future, delay)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    with self._condition:
+                        if (loop, future) in self._async_waiters:
+                            self._async_waiters.remove((loop, future))
+        finally:
+            with self._condition:
+                self._queue.remove(ticket)
+                self._notify()
+
+
+class TokenBucket(_FifoGate):
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a token bucket refilled continuously at a fixed rate.
+
+        Callers are served first come, first served: a large request at the
+        head of the queue is not overtaken by smaller ones behind it.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst, one second worth of tokens if omitted
+        """
+        super().__init__()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Take tokens, waiting for earlier callers and for the bucket to refill.
+
+        Requests larger than the capacity wait for a full bucket and leave it
+        in debt, so they are delayed rather than rejected.
+
+        Args:
+            amount: Number of tokens to take
+            timeout: Maximum seconds to wait, forever if None
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the tokens could not be taken within the timeout
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = object()
+
+        with self._condition:
+            self._queue.append(ticket)
+            try:
+                self._wait_turn(ticket, self._ready(amount), deadline)
+                self._tokens -= amount
+            finally:
+                self._queue.remove(ticket)
+                self._notify()
+        return time.monotonic() - started
+
+    async def acquire_async(self, amount: float = 1.0) -> float:
+        """Coroutine version of acquire, waiting without blocking a thread."""
+        started = time.monotonic()
+
+        def take():
+            self._tokens -= amount
+
+        await self._wait_turn_async(object(), self._ready(amount), take)
+        return time.monotonic() - started
+
+    def _ready(self, amount: float):
+        """Readiness check for _wait_turn: seconds until amount tokens are available."""
+        needed = min(amount, self.capacity)
+
+        def ready():
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= needed:
+                return 0
+            return (needed - self._tokens) / self.rate
+        return ready
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hand out no tokens for a while, e.g. after the service answered 429.
+
+        Args:
+            seconds: Pause duration
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._notify()
+
+
+class ConcurrencyLimiter(_FifoGate):
+    def __init__(self, max_concurrent: int):
+        """
+        Initialize a FIFO semaphore bounding the number of concurrent holders.
+
+        Args:
+            max_concurrent: Maximum number of simultaneous holders
+        """
+        super().__init__()
+        self.max_concurrent = max_concurrent
+        self.in_use = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Take a slot, waiting for earlier callers and for a slot to free up.
+
+        Args:
+            timeout: Maximum seconds to wait, forever if None
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            TimeoutError: If no slot was available within the timeout
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = object()
+
+        with self._condition:
+            self._queue.append(ticket)
+            try:
+                self._wait_turn(ticket, self._ready, deadline)
+                self.in_use += 1
+            finally:
+                self._queue.remove(ticket)
+                self._notify()
+        return time.monotonic() - started
+
+    async def acquire_async(self) -> float:
+        """Coroutine version of acquire, waiting without blocking a thread."""
+        started = time.monotonic()
+
+        def take():
+            self.in_use += 1
+
+        await self._wait_turn_async(object(), self._ready, take)
+        return time.monotonic() - started
+
+    def _ready(self):
+        return 0 if self.in_use < self.max_concurrent else None
+
+    def release(self) -> None:
+        """Give a slot back."""
+        with self._condition:
+            self.in_use -= 1
+            self._notify()
+
+
+class ServiceLimiter:
+    def __init__(self, name: str, requests_per_second: Optional[float] = None,
+                 characters_per_minute: Optional[float] = None,
+                 max_concurrent: Optional[int] = None):
+        """
+        Initialize the client-side limits of one Azure service.
+
+        Work over the limits is queued in arrival order instead of being sent
+        and throttled by the service.
+
+        Args:
+            name: Service name used in logs
+            requests_per_second: Maximum sustained request rate
+            characters_per_minute: Maximum sustained characters sent per minute
+            max_concurrent: Maximum number of requests or streams in flight
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_second) if requests_per_second else None
+        self.characters = (TokenBucket(characters_per_minute / 60.0, capacity=characters_per_minute)
+                           if characters_per_minute else None)
+        self.concurrency = ConcurrencyLimiter(max_concurrent) if max_concurrent else None
+        self.stats = LimiterStats()
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for this limiter."""
+        return self._waiting
+
+    def acquire(self, characters: int = 0, timeout: Optional[float] = None) -> float:
+        """
+        Wait until a request may be sent; pair with release().
+
+        The concurrency slot is taken first so rate tokens are not spent by
+        callers that would then sit waiting for a slot.
+
+        Args:
+            characters: Characters the request sends, counted against the
+                per-minute character budget
+            timeout: Maximum seconds to wait for each limit, forever if None
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            TimeoutError: If a limit could not be satisfied within the timeout
+        """
+        with self._lock:
+            self._waiting += 1
+        started = time.monotonic()
+        holds_slot = False
+        try:
+            if self.concurrency is not None:
+                self.concurrency.acquire(timeout)
+                holds_slot = True
+            if self.requests is not None:
+                self.requests.acquire(1, timeout)
+            if self.characters is not None and characters:
+                self.characters.acquire(characters, timeout)
+        except BaseException:
+            if holds_slot:
+                self.concurrency.release()
+            raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return self._record(time.monotonic() - started)
+
+    async def acquire_async(self, characters: int = 0) -> float:
+        """
+        Coroutine version of acquire; pair with release().
+
+        Waiting happens on the event loop, and a cancelled call gives back
+        whatever it already took.
+
+        Args:
+            characters: Characters the request sends
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            self._waiting += 1
+        started = time.monotonic()
+        holds_slot = False
+        try:
+            if self.concurrency is not None:
+                await self.concurrency.acquire_async()
+                holds_slot = True
+            if self.requests is not None:
+                await self.requests.acquire_async(1)
+            if self.characters is not None and characters:
+                await self.characters.acquire_async(characters)
+        except BaseException:
+            if holds_slot:
+                self.concurrency.release()
+            raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return self._record(time.monotonic() - started)
+
+    def _record(self, waited: float) -> float:
+        with self._lock:
+            self.stats.acquired += 1
+            self.stats.total_wait += waited
+            self.stats.max_wait = max(self.stats.max_wait, waited)
+            if waited > 0.001:
+                self.stats.waited += 1
+        if waited > 1.0:
+            logger.info(f"{self.name} request waited {waited:.2f}s for the rate limiter")
+        return waited
+
+    def release(self) -> None:
+        """Give back the concurrency slot taken by acquire()."""
+        if self.concurrency is not None:
+            self.concurrency.release()
+
+    @contextmanager
+    def limit(self, characters: int = 0):
+        """Hold the limiter for the duration of a request or stream."""
+        self.acquire(characters)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def limit_async(self, characters: int = 0):
+        """Async variant of limit, waiting on the event loop."""
+        await self.acquire_async(characters)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a 429 from the service and pause the rate limits.
+
+        Args:
+            retry_after: Seconds requested by the service, 1 second if unknown
+        """
+        seconds = retry_after if retry_after is not None else 1.0
+        with self._lock:
+            self.stats.throttled += 1
+        logger.warning(f"{self.name} throttled by the service, pausing for {seconds:.1f}s")
+        for bucket in (self.requests, self.characters):
+            if bucket is not None:
+                bucket.pause(seconds)
+
+
+def limited(rate_limiter: Optional[ServiceLimiter], characters: int = 0):
+    """
+    Context manager holding rate_limiter, or doing nothing when it is None.
+
+    Args:
+        rate_limiter: Optional service limiter
+        characters: Characters the request sends
+
+    Returns:
+        Context manager wrapping one request
+    """
+    return rate_limiter.limit(characters) if rate_limiter is not None else nullcontext()
+
+
+def limiter_from_env(service: str) -> Optional[ServiceLimiter]:
+    """
+    Build a service limiter from environment variables.
+
+    Reads <SERVICE>_REQUESTS_PER_SECOND, <SERVICE>_CHARACTERS_PER_MINUTE and
+    <SERVICE>_MAX_CONCURRENT, e.g. TRANSLATOR_CHARACTERS_PER_MINUTE.
+
+    Args:
+        service: Service name, e.g. 'vision', 'translator' or 'speech'
+
+    Returns:
+        ServiceLimiter: Configured limiter, or None if no limit is set
+    """
+    prefix = service.upper()
+    requests_per_second = os.getenv(f'{prefix}_REQUESTS_PER_SECOND')
+    characters_per_minute = os.getenv(f'{prefix}_CHARACTERS_PER_MINUTE')
+    max_concurrent = os.getenv(f'{prefix}_MAX_CONCURRENT')
+    if not (requests_per_second or characters_per_minute or max_concurrent):
+        return None
+    return ServiceLimiter(
+        service,
+        requests_per_second=float(requests_per_second) if requests_per_second else None,
+        characters_per_minute=float(characters_per_minute) if characters_per_minute else None,
+        max_concurrent=int(max_concurrent) if max_concurrent else None
+    )
@@ -1,36 +1,128 @@
 import os
-import azure.cognitiveservices.speech as speechsdk
 import logging
-from typing import Optional
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from backend.audio import STREAMING_DATA_SIZE, concat_wav, wav_header
+from backend.instrumentation import count, span
+from backend.language_catalog import DEFAULT_VOICES
+from backend.rate_limiter import limited
+from backend.text_segmentation import chunk_text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Name of the speech SDK output format, also part of every TTS cache key
+OUTPUT_FORMAT = 'Riff24Khz16BitMonoPcm'
+
 class SpeechService:
-    def __init__(self):
-        """Initialize the Speech Service with Azure credentials."""
+    def __init__(self, pool_size: int = 8, max_idle_seconds: float = 300.0,
+                 preconnect: bool = True, max_chunk_chars: int = 1000,
+                 max_concurrency: int = 4, cache=None, rate_limiter=None,
+                 endpoint: Optional[str] = None, key: Optional[str] = None,
+                 region: Optional[str] = None):
+        """
+        Initialize the Speech Service with Azure credentials.
+
+        Args:
+            pool_size: Maximum number of pooled synthesizers
+            max_idle_seconds: Idle time after which a pooled synthesizer is closed
+            preconnect: Open the service connection when a synthesizer is created
+            max_chunk_chars: Texts longer than this are split at sentence
+                boundaries and synthesized chunk by chunk
+            max_concurrency: Maximum number of chunks synthesized at once per call
+            cache: Optional audio cache (backend.audio_cache.AudioCache) consulted
+                for every synthesized chunk
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter; a
+                streamed synthesis holds it until the stream ends
+            endpoint: Full TTS REST URL; when given, audio is synthesized over
+                REST with a pooled HTTP session instead of the Speech SDK,
+                e.g. against a backend.fake_azure.FakeAzureServer
+            key: Subscription key overriding AZURE_SPEECH_KEY
+            region: Resource region overriding AZURE_SPEECH_REGION
+
+        The Speech SDK (or the HTTP session in REST mode) is imported and set
+        up on first use, see warm_up() to do it ahead of the first request.
+        """
         try:
-            self.key = os.getenv('AZURE_SPEECH_KEY')
-            self.region = os.getenv('AZURE_SPEECH_REGION')
+            self.cache = cache
+            self.rate_limiter = rate_limiter
+            self.max_chunk_chars = max_chunk_chars
+            self.max_concurrency = max_concurrency
+            self.key = key or os.getenv('AZURE_SPEECH_KEY')
+            self.region = region or os.getenv('AZURE_SPEECH_REGION')
+            self.endpoint = endpoint
             
             if not self.key or not self.region:
                 raise ValueError("Azure Speech credentials not found in environment variables")
             
-            self.speech_config = speechsdk.SpeechConfig(
-                subscription=self.key,
-                region=self.region
-            )
-            # Set default output format
-            self.speech_config.set_speech_synthesis_output_format(
-                speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm
-            )
-            logger.info("Speech Service initialized successfully")
+            self.output_format = OUTPUT_FORMAT
+            self.pool_size = pool_size
+            self.max_idle_seconds = max_idle_seconds
+            self.preconnect = preconnect
+            self._synthesizer_pool = None
+            self._session = None
+            self._lock = threading.Lock()
+            logger.info("Speech Service initialized successfully"
+                        + (" (REST)" if self.endpoint else ""))
             
         except Exception as e:
             logger.error(f"Failed to initialize Speech Service: {str(e)}")
             raise
 
+    @property
+    def synthesizer_pool(self):
+        """Pool of Speech SDK synthesizers, created on first use; None in REST mode."""
+        if self._synthesizer_pool is None and not self.endpoint:
+            with self._lock:
+                if self._synthesizer_pool is None:
+                    import azure.cognitiveservices.speech as speechsdk
+                    from backend.synthesizer_pool import SynthesizerPool
+                    self._synthesizer_pool = SynthesizerPool(
+                        self.key,
+                        self.region,
+                        output_format=getattr(speechsdk.SpeechSynthesisOutputFormat,
+                                              self.output_format),
+                        max_size=self.pool_size,
+                        max_idle_seconds=self.max_idle_seconds,
+                        preconnect=self.preconnect
+                    )
+        return self._synthesizer_pool
+
+    @property
+    def session(self):
+        """Pooled HTTP session used in REST mode, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    session.mount(self.endpoint, HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size))
+                    session.headers.update({'Ocp-Apim-Subscription-Key': self.key,
+                                            'Content-Type': 'application/ssml+xml',
+                                            'User-Agent': 'image-text-translator'})
+                    self._session = session
+        return self._session
+
+    def warm_up(self, languages=("en-US",)) -> None:
+        """
+        Import the SDK and open a pooled, pre-connected synthesizer per language now.
+
+        In REST mode only the session is created.
+
+        Args:
+            languages: Languages whose default voice gets a synthesizer
+        """
+        with span("warm_up", service="speech"):
+            if self.endpoint:
+                self.session
+                return
+            for language in languages:
+                with self.synthesizer_pool.checkout(language=language):
+                    pass
+
     def text_to_speech(self, text: str, language: str = "en-US") -> Optional[bytes]:
         """
         Convert text to speech using default voice for the language.
@@ -43,43 +135,14 @@ class SpeechService:
             bytes: Audio data or None if synthesis failed
         """
         try:
-            # Create output file name
-            output_file = f"temp_speech_{int(time.time())}.wav"
-            
-            # Configure speech synthesizer
-            self.speech_config.speech_synthesis_language = language
-            audio_config = speechsdk.audio.AudioOutputConfig(filename=output_file)
-            
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
-            
-            # Simple synthesis without SSML
-            result = synthesizer.speak_text_async(text).get()
-            
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                # Read the audio file
-                with open(output_file, "rb") as audio_file:
-                    audio_data = audio_file.read()
+            audio_data = self._synthesize(text, language=language)
+            if audio_data is not None:
                 logger.info(f"Text-to-speech conversion successful for language: {language}")
-                return audio_data
-            else:
-                error_details = f"Speech synthesis failed with reason: {result.reason}"
-                logger.error(error_details)
-                return None
+            return audio_data
 
         except Exception as e:
             logger.error(f"Text-to-speech conversion failed: {str(e)}")
             return None
-            
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(output_file):
-                try:
-                    os.remove(output_file)
-                except Exception as e:
-                    logger.warning(f"Failed to remove temporary file: {str(e)}")
 
     def text_to_speech_with_voice(self, text: str, voice_name: str) -> Optional[bytes]:
         """
@@ -93,43 +156,224 @@ class SpeechService:
             bytes: Audio data or None if synthesis failed
         """
         try:
-            # Create output file name
-            output_file = f"temp_speech_{int(time.time())}.wav"
-            
-            # Configure speech synthesizer
-            self.speech_config.speech_synthesis_voice_name = voice_name
-            audio_config = speechsdk.audio.AudioOutputConfig(filename=output_file)
-            
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
-            
-            # Synthesize text to speech
-            result = synthesizer.speak_text_async(text).get()
-            
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                # Read the audio file
-                with open(output_file, "rb") as audio_file:
-                    audio_data = audio_file.read()
+            audio_data = self._synthesize(text, voice_name=voice_name)
+            if audio_data is not None:
                 logger.info(f"Text-to-speech conversion successful using voice: {voice_name}")
-                return audio_data
-            else:
-                error_details = f"Speech synthesis failed with reason: {result.reason}"
-                logger.error(error_details)
-                return None
+            return audio_data
 
         except Exception as e:
             logger.error(f"Text-to-speech conversion failed: {str(e)}")
             return None
-            
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(output_file):
-                try:
-                    os.remove(output_file)
-                except Exception as e:
-                    logger.warning(f"Failed to remove temporary file: {str(e)}")
+
+    def _synthesize(self, text: str, language: Optional[str] = None,
+                    voice_name: Optional[str] = None) -> Optional[bytes]:
+        """
+        Synthesize text, in concurrent sentence-aligned chunks when it is long.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code used when no voice is given
+            voice_name: Name of the voice to use
+
+        Returns:
+            bytes: Audio data or None if synthesis failed
+        """
+        if len(text) <= self.max_chunk_chars:
+            return self._synthesize_chunk(text, language, voice_name)
+
+        # Voice names start with their locale, e.g. "ar-SA-ZariyahNeural"
+        chunk_language = language or "-".join(voice_name.split("-")[:2])
+        chunks = chunk_text(text, self.max_chunk_chars, chunk_language)
+        logger.info(f"Synthesizing {len(chunks)} chunks of up to {self.max_chunk_chars} characters")
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+            audio_chunks = list(executor.map(
+                lambda chunk: self._synthesize_chunk(chunk, language, voice_name), chunks
+            ))
+
+        if any(audio is None for audio in audio_chunks):
+            logger.error("Speech synthesis failed for at least one chunk")
+            return None
+        return concat_wav(audio_chunks)
+
+    def _synthesize_chunk(self, text: str, language: Optional[str] = None,
+                          voice_name: Optional[str] = None) -> Optional[bytes]:
+        """
+        Synthesize text straight into memory with a pooled synthesizer.
+
+        Pooled synthesizers have no audio output config, so the SDK keeps the
+        complete audio, including the RIFF header, on the result object.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code used when no voice is given
+            voice_name: Name of the voice to use
+
+        Returns:
+            bytes: Audio data or None if synthesis failed
+        """
+        if self.cache is not None:
+            cached = self.cache.get(text, voice_name or language, self.output_format)
+            if cached is not None:
+                count("cache_hits_total", cache="tts")
+                logger.info("Audio served from TTS cache")
+                return cached
+            count("cache_misses_total", cache="tts")
+
+        if self.endpoint:
+            with limited(self.rate_limiter, len(text)), span("speech_synthesize", mode="rest"):
+                response = self._rest_request(text, language, voice_name,
+                                              'riff-24khz-16bit-mono-pcm')
+                audio_data = response.content if response is not None else None
+            if audio_data is not None:
+                count("bytes_received_total", len(audio_data), service="speech")
+                if self.cache is not None:
+                    self.cache.set(text, voice_name or language, self.output_format, audio_data)
+            return audio_data
+
+        import azure.cognitiveservices.speech as speechsdk
+        with limited(self.rate_limiter, len(text)), \
+                self.synthesizer_pool.checkout(language=language, voice_name=voice_name) as synthesizer, \
+                span("speech_synthesize", mode="sdk"):
+            # Simple synthesis without SSML
+            result = synthesizer.speak_text_async(text).get()
+
+        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            count("bytes_received_total", len(result.audio_data), service="speech")
+            if self.cache is not None:
+                self.cache.set(text, voice_name or language, self.output_format,
+                               result.audio_data)
+            return result.audio_data
+
+        error_details = f"Speech synthesis failed with reason: {result.reason}"
+        if result.reason == speechsdk.ResultReason.Canceled:
+            error_details += f" ({result.cancellation_details.error_details})"
+        logger.error(error_details)
+        return None
+
+    def stream_text_to_speech(self, text: str, language: Optional[str] = "en-US",
+                              voice_name: Optional[str] = None,
+                              chunk_size: int = 16384) -> Iterator[bytes]:
+        """
+        Yield WAV audio chunks while the service is still synthesizing.
+
+        The first chunk starts with a RIFF header whose size fields mark a
+        stream of unknown length, so a player (e.g. a chunked HTTP response
+        consumed by an <audio> element) can start on the first chunk.
+
+        Audio already in the cache is streamed from it instead, complete
+        with its own header.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code used when no voice is given
+            voice_name: Optional name of the voice to use
+            chunk_size: Maximum size of each yielded chunk in bytes
+
+        Yields:
+            bytes: Consecutive pieces of one WAV stream
+        """
+        if self.cache is not None:
+            # Large clips come back mmap-backed from the disk tier, so only
+            # one chunk at a time is copied into memory
+            cached = self.cache.get_view(text, voice_name or language, self.output_format)
+            if cached is not None:
+                count("cache_hits_total", cache="tts")
+                logger.info("Streaming audio from TTS cache")
+                for start in range(0, len(cached), chunk_size):
+                    yield bytes(cached[start:start + chunk_size])
+                return
+
+        if self.endpoint:
+            yield from self._stream_rest(text, language, voice_name, chunk_size)
+            return
+
+        import azure.cognitiveservices.speech as speechsdk
+        with limited(self.rate_limiter, len(text)), \
+                self.synthesizer_pool.checkout(language=language, voice_name=voice_name) as synthesizer:
+            # Returns as soon as synthesis starts, audio keeps arriving on the stream
+            with span("speech_stream_start", mode="sdk"):
+                result = synthesizer.start_speaking_text_async(text).get()
+            if result.reason == speechsdk.ResultReason.Canceled:
+                logger.error(f"Speech synthesis failed with reason: {result.reason} "
+                             f"({result.cancellation_details.error_details})")
+                return
+
+            stream = speechsdk.AudioDataStream(result)
+            # The SDK fills a bytes buffer in place, slices copy it out
+            buffer = bytes(chunk_size)
+            header_sent = False
+            finished = False
+            try:
+                while True:
+                    filled = stream.read_data(buffer)
+                    if filled == 0:
+                        break
+                    chunk = buffer[:filled]
+                    if not header_sent:
+                        header_sent = True
+                        if not chunk.startswith(b"RIFF"):
+                            yield wav_header(STREAMING_DATA_SIZE)
+                    yield chunk
+                finished = True
+            finally:
+                if not finished:
+                    # The consumer stopped early, do not keep synthesizing
+                    synthesizer.stop_speaking()
+
+            if stream.status == speechsdk.StreamStatus.Canceled:
+                logger.error("Streaming speech synthesis was canceled")
+            else:
+                logger.info("Streaming text-to-speech conversion completed")
+
+    def _rest_request(self, text: str, language: Optional[str], voice_name: Optional[str],
+                      output_format: str, stream: bool = False):
+        """
+        Send one SSML synthesis request to the REST endpoint.
+
+        Args:
+            text: Text to convert to speech
+            language: Language code, its default voice is used when no voice is given
+            voice_name: Name of the voice to use
+            output_format: REST output format, e.g. 'riff-24khz-16bit-mono-pcm'
+            stream: Leave the body unread so it can be iterated
+
+        Returns:
+            requests.Response: Successful response or None if synthesis failed
+        """
+        # Pulls in urllib.request, only the REST mode needs it
+        from xml.sax.saxutils import escape, quoteattr
+
+        voice_name = voice_name or DEFAULT_VOICES.get(language)
+        if voice_name is None:
+            logger.error(f"No default voice configured for language: {language}")
+            return None
+        language = language or "-".join(voice_name.split("-")[:2])
+        ssml = (f"<speak version='1.0' xml:lang={quoteattr(language)}>"
+                f"<voice name={quoteattr(voice_name)}>{escape(text)}</voice></speak>")
+        try:
+            response = self.session.post(self.endpoint, data=ssml.encode('utf-8'),
+                                         headers={'X-Microsoft-OutputFormat': output_format},
+                                         stream=stream, timeout=30)
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            logger.error(f"Speech synthesis failed: {str(e)}")
+            return None
+
+    def _stream_rest(self, text: str, language: Optional[str], voice_name: Optional[str],
+                     chunk_size: int) -> Iterator[bytes]:
+        """Stream raw PCM from the REST endpoint behind a streaming WAV header."""
+        with limited(self.rate_limiter, len(text)):
+            with span("speech_stream_start", mode="rest"):
+                response = self._rest_request(text, language, voice_name,
+                                              'raw-24khz-16bit-mono-pcm', stream=True)
+            if response is None:
+                return
+            with response:
+                yield wav_header(STREAMING_DATA_SIZE)
+                yield from response.iter_content(chunk_size)
+            logger.info("Streaming text-to-speech conversion completed")
 
     def verify_service(self) -> bool:
         """
@@ -0,0 +1,224 @@
+import argparse
+import importlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SERVICES = ("vision", "translator", "speech")
+
+# Phases timed in every child process, in order
+PHASES = ("import", "construct", "warm_up", "first_request", "second_request")
+
+# Modules the services load lazily; none of them should be imported by
+# merely importing a service module
+HEAVY_MODULES = ("azure.cognitiveservices.vision.computervision",
+                 "azure.cognitiveservices.speech", "msrest", "requests", "PIL", "asyncio")
+
+KEY = "fake-key"
+
+
+def _create(service: str, url: str):
+    """Construct a service pointed at the fake server, importing its module first."""
+    if service == "vision":
+        from backend.polling import PollingStrategy
+        from backend.vision_service import VisionService
+        return VisionService(polling=PollingStrategy(min_delay=0.01), endpoint=url, key=KEY)
+    if service == "translator":
+        from backend.translator_service import TranslatorService
+        return TranslatorService(endpoint=url, key=KEY, region="local")
+    from backend.speech_service import SpeechService
+    return SpeechService(endpoint=url + "/cognitiveservices/v1", key=KEY, region="local")
+
+
+def _request(service: str, instance, image_data: bytes) -> bool:
+    if service == "vision":
+        return instance.extract_text(io.BytesIO(image_data)) is not None
+    if service == "translator":
+        return instance.translate_text("Hello world", "es") is not None
+    return instance.text_to_speech("Hello world", "en-US") is not None
+
+
+def measure(service: str, url: str, image_data: bytes = b"",
+            warm_up: bool = False) -> Dict[str, object]:
+    """
+    Time importing, constructing and calling one service in this process.
+
+    Only meaningful in a fresh interpreter, see run_child().
+
+    Args:
+        service: One of SERVICES
+        url: Base URL of a backend.fake_azure.FakeAzureServer
+        image_data: Image read by the vision service
+        warm_up: Call the service's warm_up() before the first request
+
+    Returns:
+        Dict[str, object]: Seconds per phase, whether the requests succeeded
+        and which HEAVY_MODULES were loaded by the import alone
+    """
+    module_name = {"vision": "backend.vision_service",
+                   "translator": "backend.translator_service",
+                   "speech": "backend.speech_service"}[service]
+    timings = {}
+
+    started = time.perf_counter()
+    importlib.import_module(module_name)
+    timings["import"] = time.perf_counter() - started
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    started = time.perf_counter()
+    instance = _create(service, url)
+    timings["construct"] = time.perf_counter() - started
+
+    if warm_up:
+        started = time.perf_counter()
+        instance.warm_up()
+        timings["warm_up"] = time.perf_counter() - started
+
+    succeeded = True
+    for phase in ("first_request", "second_request"):
+        started = time.perf_counter()
+        succeeded = _request(service, instance, image_data) and succeeded
+        timings[phase] = time.perf_counter() - started
+
+    return {"timings": timings, "succeeded": succeeded, "eager_imports": eager}
+
+
+def run_child(service: str, url: str, image_path: str, warm_up: bool) -> Dict[str, object]:
+    """
+    Run measure() in a new interpreter so nothing is imported yet.
+
+    Returns:
+        Dict[str, object]: measure()'s result plus the process wall time,
+        interpreter startup included
+    """
+    command = [sys.executable, "-m", "backend.startup_benchmark", "--child", service,
+               "--url", url, "--image", image_path]
+    if warm_up:
+        command.append("--warm-up")
+    started = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=120,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    wall_time = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"{service} child failed: {completed.stderr.strip()[-500:]}")
+    # The last line is the JSON result, service logging goes to stderr
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process"] = wall_time
+    return result
+
+
+def run(services: List[str], repeat: int, url: str, image_path: str) -> Dict[str, Dict]:
+    """
+    Measure every service cold and with warm-up, repeat times each.
+
+    Returns:
+        Dict[str, Dict]: Per "service/mode", the median seconds per phase,
+        the number of failed runs and the modules imported eagerly
+    """
+    report = {}
+    for service in services:
+        for mode in ("cold", "warm"):
+            runs = [run_child(service, url, image_path, mode == "warm") for _ in range(repeat)]
+            phases = [phase for phase in PHASES if phase in runs[0]["timings"]]
+            medians = {phase: statistics.median(result["timings"][phase] for result in runs)
+                       for phase in phases}
+            medians["process"] = statistics.median(result["process"] for result in runs)
+            report[f"{service}/{mode}"] = {
+                "median": medians,
+                "runs": len(runs),
+                "failed": sum(not result["succeeded"] for result in runs),
+                "eager_imports": sorted({name for result in runs for name in result["eager_imports"]}),
+            }
+    return report
+
+
+def format_report(report: Dict[str, Dict]) -> str:
+    columns = PHASES + ("process",)
+    lines = ["{:<18}".format("service/mode") + "".join(f"{column:>16}" for column in columns)]
+    for name, result in report.items():
+        cells = "".join(
+            f"{result['median'][column] * 1000:>14.1f}ms" if column in result["median"] else f"{'-':>16}"
+            for column in columns
+        )
+        lines.append(f"{name:<18}{cells}")
+        if result["failed"]:
+            lines.append(f"  {result['failed']} of {result['runs']} runs had a failed request")
+        if result["eager_imports"]:
+            lines.append(f"  imported eagerly: {', '.join(result['eager_imports'])}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.startup_benchmark",
+        description="Measure import, construction and first-request latency of each service "
+                    "in fresh interpreters against fake Azure endpoints."
+    )
+    parser.add_argument('services', nargs='*', default=list(SERVICES), metavar='SERVICE',
+                        help=f"Services to measure: {', '.join(SERVICES)} (default: all)")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="Fresh processes per service and mode; medians are reported")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this file")
+    # Used by run_child() inside the measured process
+    parser.add_argument('--child', choices=SERVICES, help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--image', help=argparse.SUPPRESS)
+    parser.add_argument('--warm-up', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        logging.getLogger().setLevel(logging.WARNING)
+        with open(args.image, 'rb') as image_file:
+            image_data = image_file.read()
+        print(json.dumps(measure(args.child, args.url, image_data, args.warm_up)))
+        return 0
+
+    unknown = [name for name in args.services if name not in SERVICES]
+    if unknown:
+        parser.error(f"unknown service: {', '.join(unknown)}")
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from backend.benchmark import git_revision, sample_image
+    from backend.fake_azure import FakeAzureServer, FakeEndpoint, Latency
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = os.path.join(directory, "sample.jpg")
+        with open(image_path, 'wb') as image_file:
+            image_file.write(sample_image(800, 600))
+        # Near-instant endpoints so the numbers are dominated by the client side
+        server = FakeAzureServer(vision=FakeEndpoint(Latency(0.0)),
+                                 translator=FakeEndpoint(Latency(0.0)),
+                                 speech=FakeEndpoint(Latency(0.0)),
+                                 read_latency=Latency(0.0), key=KEY)
+        with server:
+            services = run(args.services, args.repeat, server.url, image_path)
+
+    print(format_report(services))
+    if args.output:
+        report = {
+            "revision": git_revision(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "services": services,
+        }
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import azure.cognitiveservices.speech as speechsdk
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _PooledSynthesizer:
+    __slots__ = ("synthesizer", "connection", "key", "last_used")
+
+    def __init__(self, synthesizer, connection, key: Tuple[Optional[str], Optional[str]]):
+        self.synthesizer = synthesizer
+        self.connection = connection
+        self.key = key
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close synthesizer connection: {str(e)}")
+
+
+class SynthesizerPool:
+    def __init__(self, key: str, region: str,
+                 output_format=speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm,
+                 max_size: int = 8, max_idle_seconds: float = 300.0, preconnect: bool = True):
+        """
+        Initialize a bounded pool of pre-warmed speech synthesizers.
+
+        Every synthesizer owns its SpeechConfig, so concurrent requests for
+        different voices never mutate shared state.
+
+        Args:
+            key: Azure Speech subscription key
+            region: Azure Speech region
+            output_format: Audio format produced by every synthesizer
+            max_size: Maximum number of synthesizers, idle or checked out
+            max_idle_seconds: Idle time after which a synthesizer is closed
+            preconnect: Open the service connection when a synthesizer is created
+        """
+        self.key = key
+        self.region = region
+        self.output_format = output_format
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.preconnect = preconnect
+
+        self._idle = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _create(self, pool_key: Tuple[Optional[str], Optional[str]]) -> _PooledSynthesizer:
+        language, voice_name = pool_key
+        speech_config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+        speech_config.set_speech_synthesis_output_format(self.output_format)
+        if language:
+            speech_config.speech_synthesis_language = language
+        if voice_name:
+            speech_config.speech_synthesis_voice_name = voice_name
+
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+
+        connection = None
+        if self.preconnect:
+            # Pre-connect so the first request does not pay the connection setup
+            connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+            connection.open(True)
+
+        with self._condition:
+            self.created += 1
+        return _PooledSynthesizer(synthesizer, connection, pool_key)
+
+    def _evict_expired(self, now: float) -> list:
+        expired = [entry for entry in self._idle
+                   if now - entry.last_used > self.max_idle_seconds]
+        for entry in expired:
+            self._idle.remove(entry)
+        self.evicted += len(expired)
+        return expired
+
+    def _acquire(self, pool_key: Tuple[Optional[str], Optional[str]],
+                 timeout: Optional[float]) -> _PooledSynthesizer:
+        to_close = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            with self._condition:
+                while True:
+                    to_close.extend(self._evict_expired(time.monotonic()))
+
+                    # Most recently used synthesizer for this voice first
+                    for entry in reversed(self._idle):
+                        if entry.key == pool_key:
+                            self._idle.remove(entry)
+                            self._in_use += 1
+                            self.reused += 1
+                            return entry
+
+                    if len(self._idle) + self._in_use < self.max_size:
+                        break
+                    if self._idle:
+                        # Make room by dropping the least recently used idle synthesizer
+                        to_close.append(self._idle.pop(0))
+                        self.evicted += 1
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No speech synthesizer available in the pool")
+                    self._condition.wait(remaining)
+
+                # Reserve the slot before creating outside the lock
+                self._in_use += 1
+        finally:
+            for entry in to_close:
+                entry.close()
+
+        try:
+            return self._create(pool_key)
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, entry: _PooledSynthesizer, healthy: bool) -> None:
+        with self._condition:
+            self._in_use -= 1
+            if healthy:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._condition.notify()
+        if not healthy:
+            entry.close()
+
+    @contextmanager
+    def checkout(self, language: Optional[str] = None, voice_name: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Borrow a synthesizer configured for a language or voice.
+
+        Args:
+            language: Language code (e.g., "en-US") used when no voice is given
+            voice_name: Name of the voice to use
+            timeout: Seconds to wait for a free slot, forever if None
+
+        Yields:
+            speechsdk.SpeechSynthesizer: Synthesizer reserved for the caller
+        """
+        pool_key = (None, voice_name) if voice_name else (language, None)
+        entry = self._acquire(pool_key, timeout)
+        healthy = False
+        try:
+            yield entry.synthesizer
+            healthy = True
+        finally:
+            # A synthesizer that raised is discarded rather than reused
+            self._release(entry, healthy)
+
+    def evict_idle(self) -> int:
+        """
+        Close synthesizers idle for longer than max_idle_seconds.
+
+        Returns:
+            int: Number of synthesizers closed
+        """
+        with self._condition:
+            expired = self._evict_expired(time.monotonic())
+        for entry in expired:
+            entry.close()
+        return len(expired)
+
+    def close(self) -> None:
+        """Close every idle synthesizer."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            entry.close()
+
+    @property
+    def size(self) -> int:
+        with self._condition:
+            return len(self._idle) + self._in_use
@@ -0,0 +1,150 @@
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+# Sentence terminators: Latin, Arabic question mark and full stop, CJK
+_SENTENCE_END = re.compile(r'([.!?؟۔。！？]+["\'»”)\]]*)(\s+|$)|\n+')
+
+# Boundaries of translation segments: a sentence end followed by whitespace, or a blank line
+_SEGMENT_END = re.compile(r'([.!?؟۔。！？]+["\'»”)\]]*)(\s+)|\n[ \t]*\n\s*')
+
+# Clause separators used when a single sentence is too long: Latin and Arabic comma, semicolons
+_CLAUSE_END = re.compile(r'(?<=[,;:،؛])\s+')
+_WHITESPACE = re.compile(r'\s+')
+
+# Abbreviations that end with a period but do not end a sentence, by language prefix
+ABBREVIATIONS = {
+    'en': {'mr', 'mrs', 'ms', 'dr', 'prof', 'st', 'vs', 'etc', 'e.g', 'i.e', 'no'},
+    'es': {'sr', 'sra', 'srta', 'dr', 'dra', 'etc', 'ud', 'uds', 'pág'},
+    'fr': {'m', 'mme', 'mlle', 'dr', 'etc', 'p', 'cf'},
+    'de': {'hr', 'fr', 'dr', 'prof', 'bzw', 'usw', 'z.b', 'd.h', 'nr', 'ca'},
+}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different inputs compare equal.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: NFC-normalized text with whitespace collapsed
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _is_abbreviation(sentence: str, language: Optional[str]) -> bool:
+    if not language or not sentence.endswith('.'):
+        return False
+    abbreviations = ABBREVIATIONS.get(language.split('-')[0].lower())
+    if not abbreviations:
+        return False
+    last_word = sentence[:-1].rsplit(None, 1)[-1].lower() if sentence[:-1].strip() else ''
+    return last_word in abbreviations
+
+
+def split_sentences(text: str, language: Optional[str] = None) -> List[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text: Text to split
+        language: Optional language code (e.g., "en-US", "ar-SA") enabling
+            abbreviation handling for that language
+
+    Returns:
+        List[str]: Non-empty sentences with surrounding whitespace removed
+    """
+    sentences = []
+    pending = ''
+    position = 0
+    for match in _SENTENCE_END.finditer(text):
+        candidate = pending + text[position:match.start()] + (match.group(1) or '')
+        position = match.end()
+        if match.group(1) and _is_abbreviation(candidate, language):
+            pending = candidate + (match.group(2) or '')
+            continue
+        pending = ''
+        if candidate.strip():
+            sentences.append(candidate.strip())
+    tail = pending + text[position:]
+    if tail.strip():
+        sentences.append(tail.strip())
+    return sentences
+
+
+def segment_text(text: str, language: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Split text into sentences for translation, keeping what separates them.
+
+    Unlike split_sentences, a single newline is not a boundary: OCR wraps
+    sentences across lines, and a fragment translated alone reads badly.
+    Blank lines still separate segments, so headings and paragraphs stay apart.
+
+    Args:
+        text: Text to split
+        language: Optional language code enabling abbreviation handling
+
+    Returns:
+        List[Tuple[str, str]]: (segment, separator following it) pairs;
+        joining every segment with its separator rebuilds the original text
+    """
+    segments = []
+    start = 0
+    for match in _SEGMENT_END.finditer(text):
+        end = match.end(1) if match.group(1) else match.start()
+        if match.group(1) and _is_abbreviation(text[start:end].strip(), language):
+            continue
+        segments.append((text[start:end], text[end:match.end()]))
+        start = match.end()
+    if start < len(text) or not segments:
+        segments.append((text[start:], ''))
+    return segments
+
+
+def _pack(parts: List[str], max_chars: int) -> List[str]:
+    chunks = []
+    current = ''
+    for part in parts:
+        if current and len(current) + 1 + len(part) > max_chars:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    for separator in (_CLAUSE_END, _WHITESPACE):
+        parts = [part for part in separator.split(sentence) if part]
+        if all(len(part) <= max_chars for part in parts):
+            return _pack(parts, max_chars)
+    # No usable separator, cut hard
+    return [sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars)]
+
+
+def chunk_text(text: str, max_chars: int, language: Optional[str] = None) -> List[str]:
+    """
+    Group sentences into chunks no longer than max_chars.
+
+    Consecutive sentences share a chunk while they fit; sentences longer
+    than max_chars are split at clause separators, then at whitespace.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum number of characters per chunk
+        language: Optional language code used for sentence splitting
+
+    Returns:
+        List[str]: Chunks in reading order
+    """
+    parts = []
+    for sentence in split_sentences(text, language):
+        if len(sentence) <= max_chars:
+            parts.append(sentence)
+        else:
+            parts.extend(_split_long_sentence(sentence, max_chars))
+    return _pack(parts, max_chars)
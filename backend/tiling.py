@@ -0,0 +1,115 @@
+from typing import List, Tuple
+
+from backend.ocr_result import Box, OcrLine
+
+
+def tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+    """
+    Offsets of the tiles covering one axis.
+
+    Args:
+        length: Image size along the axis
+        tile_size: Tile size along the axis
+        overlap: Pixels shared by neighbouring tiles
+
+    Returns:
+        List[int]: Tile offsets; the last tile ends exactly at the image edge
+    """
+    if length <= tile_size:
+        return [0]
+    stride = tile_size - overlap
+    starts = list(range(0, length - tile_size, stride))
+    starts.append(length - tile_size)
+    return starts
+
+
+def tile_boxes(width: int, height: int, tile_size: int = 2048,
+               overlap: int = 256) -> List[Tuple[int, int, int, int]]:
+    """
+    Split an image into overlapping tiles.
+
+    Args:
+        width: Image width
+        height: Image height
+        tile_size: Maximum tile width and height
+        overlap: Pixels shared by neighbouring tiles, should exceed the
+            height of a text line so every line is whole in some tile
+
+    Returns:
+        List[Tuple[int, int, int, int]]: (left, top, right, bottom) per tile,
+        row by row
+    """
+    if overlap >= tile_size:
+        raise ValueError("Tile overlap must be smaller than the tile size")
+    return [(left, top, min(left + tile_size, width), min(top + tile_size, height))
+            for top in tile_starts(height, tile_size, overlap)
+            for left in tile_starts(width, tile_size, overlap)]
+
+
+def _area(box: Box) -> float:
+    return max(0.0, box[2] - box[0]) * max(0.0, box[3] - box[1])
+
+
+def _containment(a: Box, b: Box) -> float:
+    """Share of the smaller box covered by the other one."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min(_area(a), _area(b))
+    return width * height / smaller if smaller else 0.0
+
+
+def reading_order(lines: List[OcrLine]) -> List[OcrLine]:
+    """
+    Sort lines top to bottom, then left to right within a row.
+
+    Lines whose vertical centers are closer than half a line height belong
+    to the same row.
+
+    Args:
+        lines: Lines in any order
+
+    Returns:
+        List[OcrLine]: The same lines in reading order
+    """
+    rows = []
+    for line in sorted(lines, key=lambda line: (line.box[1] + line.box[3]) / 2):
+        center = (line.box[1] + line.box[3]) / 2
+        if rows:
+            row_box = rows[-1][-1].box
+            row_center = (row_box[1] + row_box[3]) / 2
+            if abs(center - row_center) < (row_box[3] - row_box[1]) / 2:
+                rows[-1].append(line)
+                continue
+        rows.append([line])
+    return [line for row in rows for line in sorted(row, key=lambda line: line.box[0])]
+
+
+def merge_tile_lines(tiles: List[List[OcrLine]], min_overlap: float = 0.5) -> List[OcrLine]:
+    """
+    Merge the lines read from overlapping tiles.
+
+    A line seen by two tiles is kept once; the larger reading wins, since
+    the smaller one is usually the same line cut by a tile edge.
+
+    Args:
+        tiles: Lines per tile, boxes in image coordinates
+        min_overlap: Share of the smaller box that must be covered for two
+            lines of different tiles to count as the same line
+
+    Returns:
+        List[OcrLine]: Unique lines in reading order
+    """
+    candidates = sorted(
+        ((line, tile_index) for tile_index, lines in enumerate(tiles) for line in lines),
+        key=lambda candidate: _area(candidate[0].box),
+        reverse=True
+    )
+    kept = []
+    for line, tile_index in candidates:
+        if any(other_tile != tile_index and _containment(line.box, other.box) >= min_overlap
+               for other, other_tile in kept):
+            continue
+        kept.append((line, tile_index))
+    return reading_order([line for line, _ in kept])
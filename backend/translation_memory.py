@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from backend.text_segmentation import normalize_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def segment_hash(segment: str) -> str:
+    """
+    Hash a segment for translation memory lookups.
+
+    Args:
+        segment: Text segment
+
+    Returns:
+        str: Hex digest of the segment
+    """
+    return hashlib.sha256(segment.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TranslationMemoryStats:
+    """Lookup counters of a translation memory."""
+    exact_hits: int = 0
+    normalized_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.exact_hits + self.normalized_hits + self.misses
+        return (self.exact_hits + self.normalized_hits) / total if total else 0.0
+
+
+class TranslationMemory:
+    def __init__(self, path: str = ":memory:", ttl_seconds: Optional[float] = 30 * 24 * 3600,
+                 version: str = "1"):
+        """
+        Initialize a SQLite-backed translation memory.
+
+        Entries are indexed by (source language, target language, segment
+        hash) for both the exact segment and its normalized form. Entries
+        older than the TTL or written under another version are ignored.
+
+        Args:
+            path: SQLite database file, in-memory database if omitted
+            ttl_seconds: Maximum age of a reusable entry, None to keep forever
+            version: Version tag of stored entries; bump it to invalidate
+                translations after a glossary or model change
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self.stats = TranslationMemoryStats()
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "source_language TEXT NOT NULL, target_language TEXT NOT NULL, "
+            "exact_hash TEXT NOT NULL, normalized_hash TEXT NOT NULL, "
+            "translation TEXT NOT NULL, version TEXT NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (source_language, target_language, exact_hash))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS segments_normalized "
+            "ON segments (source_language, target_language, normalized_hash)"
+        )
+        self._conn.commit()
+
+    def _oldest_valid(self) -> float:
+        return 0.0 if self.ttl_seconds is None else time.time() - self.ttl_seconds
+
+    def lookup(self, segments: List[str], source_language: str,
+               target_language: str) -> Dict[str, str]:
+        """
+        Find stored translations, preferring exact over normalized matches.
+
+        Args:
+            segments: Segments to look up
+            source_language: Source language code, 'auto' when detected
+            target_language: Target language code
+
+        Returns:
+            Dict[str, str]: Translations keyed by the segments that were found
+        """
+        found = {}
+        oldest = self._oldest_valid()
+        with self._lock:
+            for segment in set(segments):
+                row = self._conn.execute(
+                    "SELECT translation FROM segments WHERE source_language = ? "
+                    "AND target_language = ? AND exact_hash = ? AND version = ? AND created >= ?",
+                    (source_language, target_language, segment_hash(segment), self.version, oldest)
+                ).fetchone()
+                if row is not None:
+                    self.stats.exact_hits += 1
+                    found[segment] = row[0]
+                    continue
+                row = self._conn.execute(
+                    "SELECT translation FROM segments WHERE source_language = ? "
+                    "AND target_language = ? AND normalized_hash = ? AND version = ? "
+                    "AND created >= ? ORDER BY created DESC LIMIT 1",
+                    (source_language, target_language, segment_hash(normalize_text(segment)),
+                     self.version, oldest)
+                ).fetchone()
+                if row is not None:
+                    self.stats.normalized_hits += 1
+                    found[segment] = row[0]
+                else:
+                    self.stats.misses += 1
+        return found
+
+    def store(self, translations: Dict[str, str], source_language: str,
+              target_language: str) -> None:
+        """
+        Store translated segments.
+
+        Args:
+            translations: Translations keyed by source segment
+            source_language: Source language code, 'auto' when detected
+            target_language: Target language code
+        """
+        now = time.time()
+        rows = [
+            (source_language, target_language, segment_hash(segment),
+             segment_hash(normalize_text(segment)), translation, self.version, now)
+            for segment, translation in translations.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments (source_language, target_language, exact_hash, "
+                "normalized_hash, translation, version, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def purge(self) -> int:
+        """
+        Delete expired entries and entries of other versions.
+
+        Returns:
+            int: Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM segments WHERE version != ? OR created < ?",
+                (self.version, self._oldest_valid())
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
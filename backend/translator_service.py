@@ -1,29 +1,279 @@
 import os
-import requests
+import re
+import threading
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from backend.instrumentation import count, enabled as metrics_enabled, span
+from backend.polling import parse_retry_after
+from backend.rate_limiter import limited
+from backend.text_segmentation import segment_text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Translator v3 request limits
+MAX_ELEMENTS_PER_REQUEST = 1000
+MAX_CHARACTERS_PER_REQUEST = 50000
+
+# Preferred split points for texts longer than one request, best first
+_SPLIT_PATTERNS = [re.compile(pattern) for pattern in (r'\n+', r'(?<=[.!?。؟])\s+', r'\s+')]
+
+
+def split_text(text: str, limit: int) -> List[Tuple[str, str]]:
+    """
+    Split text into pieces no longer than the limit.
+
+    Args:
+        text: Text to split
+        limit: Maximum number of characters per piece
+
+    Returns:
+        List[Tuple[str, str]]: (piece, separator following it) pairs; joining
+        every piece with its separator rebuilds the original text
+    """
+    pieces = []
+    # Scan from a position rather than slicing, long texts are not copied per piece
+    start = 0
+    while len(text) - start > limit:
+        for pattern in _SPLIT_PATTERNS:
+            boundary = None
+            for match in pattern.finditer(text, start, start + limit + 1):
+                if match.start() > start:
+                    boundary = match
+            if boundary is not None:
+                pieces.append((text[start:boundary.start()], boundary.group()))
+                start = boundary.end()
+                break
+        else:
+            # No natural boundary, cut hard
+            pieces.append((text[start:start + limit], ''))
+            start += limit
+    pieces.append((text[start:], ''))
+    return pieces
+
+
+def pack_requests(texts: List[str], target_count: int = 1,
+                  max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+                  max_characters: int = MAX_CHARACTERS_PER_REQUEST
+                  ) -> List[List[Tuple[int, str, str]]]:
+    """
+    Pack texts greedily into as few /translate requests as the limits allow.
+
+    The service counts each character once per target language, so the
+    per-request character budget shrinks with the number of targets.
+
+    Args:
+        texts: Texts to translate
+        target_count: Number of target languages per request
+        max_elements: Maximum number of array elements per request
+        max_characters: Maximum number of characters per request
+
+    Returns:
+        List[List[Tuple[int, str, str]]]: Requests as lists of
+        (text index, piece, separator following the piece)
+    """
+    character_budget = max(1, max_characters // target_count)
+
+    # Flatten texts into pieces that each fit in a request
+    pieces = []
+    for index, text in enumerate(texts):
+        for piece, separator in split_text(text, character_budget):
+            pieces.append((index, piece, separator))
+
+    requests_to_send = []
+    current, current_characters = [], 0
+    for piece in pieces:
+        length = len(piece[1])
+        if current and (len(current) >= max_elements or
+                        current_characters + length > character_budget):
+            requests_to_send.append(current)
+            current, current_characters = [], 0
+        current.append(piece)
+        current_characters += length
+    if current:
+        requests_to_send.append(current)
+    return requests_to_send
+
+
+def assemble_translations(text_count: int, targets: List[str],
+                          requests_sent: List[List[Tuple[int, str, str]]],
+                          responses: List[Optional[List[Dict]]]
+                          ) -> List[Optional[Dict[str, str]]]:
+    """
+    Map packed /translate responses back onto the original texts.
+
+    Args:
+        text_count: Number of original texts
+        targets: Language codes, in the order sent as 'to' parameters
+        requests_sent: Requests as returned by pack_requests
+        responses: Decoded response per request, None for failed requests
+
+    Returns:
+        List[Optional[Dict[str, str]]]: Translations keyed by language code
+        in input order, None where the request carrying that text failed
+    """
+    translated_pieces = [{target: [] for target in targets} for _ in range(text_count)]
+    failed = set()
+    for batch, translations in zip(requests_sent, responses):
+        if translations is None:
+            failed.update(index for index, _, _ in batch)
+            continue
+        for (index, _, separator), item in zip(batch, translations):
+            # Translations come back in the order of the 'to' parameters
+            for target, translation in zip(targets, item["translations"]):
+                translated_pieces[index][target].append(translation["text"] + separator)
+
+    return [None if index in failed else
+            {target: "".join(parts) for target, parts in translated_pieces[index].items()}
+            for index in range(text_count)]
+
+
 class TranslatorService:
-    def __init__(self):
-        """Initialize the Translator Service with Azure credentials."""
+    def __init__(self, pool_size: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, timeout: float = 30.0,
+                 translation_memory=None, rate_limiter=None, endpoint: Optional[str] = None,
+                 key: Optional[str] = None, region: Optional[str] = None):
+        """
+        Initialize the Translator Service with Azure credentials.
+
+        Args:
+            pool_size: Number of keep-alive connections kept to the endpoint
+            max_retries: Retries for throttled (429) and 5xx responses
+            backoff_factor: Base of the exponential backoff between retries
+            timeout: Per-request timeout in seconds
+            translation_memory: Optional backend.translation_memory.TranslationMemory;
+                translate_text then only sends lines it has not seen before
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter; requests
+                wait for it, and throttled requests are queued behind the
+                service's Retry-After, up to max_retries times, instead of
+                being retried by the session
+            endpoint: Translator endpoint overriding AZURE_TRANSLATOR_ENDPOINT,
+                e.g. a backend.fake_azure.FakeAzureServer URL
+            key: Subscription key overriding AZURE_TRANSLATOR_KEY
+            region: Resource region overriding AZURE_TRANSLATOR_REGION
+
+        The HTTP session and the language catalog are created on first use,
+        see warm_up() to do it ahead of the first request.
+        """
         try:
-            self.key = os.getenv('AZURE_TRANSLATOR_KEY')
-            self.region = os.getenv('AZURE_TRANSLATOR_REGION')
-            self.endpoint = os.getenv('AZURE_TRANSLATOR_ENDPOINT', 
-                                    'https://api.cognitive.microsofttranslator.com')
+            self.translation_memory = translation_memory
+            self.rate_limiter = rate_limiter
+            self.max_retries = max_retries
+            self.key = key or os.getenv('AZURE_TRANSLATOR_KEY')
+            self.region = region or os.getenv('AZURE_TRANSLATOR_REGION')
+            self.endpoint = endpoint or os.getenv('AZURE_TRANSLATOR_ENDPOINT', 
+                                                  'https://api.cognitive.microsofttranslator.com')
+            self.timeout = timeout
             
             if not self.key or not self.region:
                 raise ValueError("Azure Translator credentials not found in environment variables")
-            
+
+            self.pool_size = pool_size
+            self.backoff_factor = backoff_factor
+            self._session = None
+            self._language_catalog = None
+            self._lock = threading.Lock()
+
             logger.info("Translator Service initialized successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize Translator Service: {str(e)}")
             raise
 
+    @property
+    def session(self):
+        """Pooled HTTP session, created with its imports on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session(self.pool_size, self.max_retries,
+                                                         self.backoff_factor)
+        return self._session
+
+    @session.setter
+    def session(self, session) -> None:
+        self._session = session
+
+    @property
+    def language_catalog(self):
+        """Catalog of supported languages sharing the session, created on first use."""
+        if self._language_catalog is None:
+            session = self.session
+            with self._lock:
+                if self._language_catalog is None:
+                    from backend.language_catalog import LanguageCatalog
+                    self._language_catalog = LanguageCatalog(
+                        self.endpoint,
+                        session=session,
+                        cache_path=os.getenv('LANGUAGE_CATALOG_PATH'),
+                        timeout=self.timeout
+                    )
+        return self._language_catalog
+
+    def warm_up(self) -> None:
+        """
+        Create the session and load the language catalog now.
+
+        Fetching the catalog also opens a pooled keep-alive connection that
+        the first translation reuses.
+        """
+        with span("warm_up", service="translator"):
+            self.get_available_languages()
+
+    def _create_session(self, pool_size: int, max_retries: int, backoff_factor: float):
+        """
+        Build the pooled HTTP session shared by all requests of this service.
+
+        The session keeps connections alive between calls so the TCP and TLS
+        handshakes are paid once per pooled connection. The underlying urllib3
+        pool is thread-safe, so one service instance can be shared by threads.
+
+        Args:
+            pool_size: Number of keep-alive connections kept to the endpoint
+            max_retries: Retries for throttled (429) and 5xx responses
+            backoff_factor: Base of the exponential backoff between retries
+
+        Returns:
+            requests.Session: Configured session
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # With a rate limiter, 429s are queued again behind it in
+        # _send_translate_request; retrying them here as well would multiply
+        # the attempts and keep hitting the service while everyone else waits
+        status_forcelist = RETRY_STATUS_CODES if self.rate_limiter is None else tuple(
+            code for code in RETRY_STATUS_CODES if code != 429)
+        retry = Retry(
+            total=max_retries,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(['GET', 'POST']),
+            backoff_factor=backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Ocp-Apim-Subscription-Key': self.key,
+            'Ocp-Apim-Subscription-Region': self.region,
+            'Content-type': 'application/json'
+        })
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None:
+            self._session.close()
+
     def translate_text(self, text: str, target_language: str, 
                     source_language: Optional[str] = None) -> Optional[str]:
         """
@@ -37,37 +287,20 @@ class TranslatorService:
         Returns:
             str: Translated text or None if translation failed
         """
-        try:
-            path = '/translate'
-            constructed_url = self.endpoint + path
-
-            params = {
-                'api-version': '3.0',
-                'to': target_language
-            }
-            
-            if source_language:
-                params['from'] = source_language
-
-            headers = {
-                'Ocp-Apim-Subscription-Key': self.key,
-                'Ocp-Apim-Subscription-Region': self.region,
-                'Content-type': 'application/json'
-            }
+        import requests
 
-            body = [{
-                'text': text
-            }]
-
-            logger.info(f"Sending translation request for text: {text[:50]}...")
-            response = requests.post(constructed_url, params=params, 
-                                headers=headers, json=body)
-            response.raise_for_status()
+        try:
+            with span("translator_translate_text"):
+                if self.translation_memory is not None:
+                    return self._translate_with_memory(text, target_language, source_language)
 
-            translations = response.json()
-            translated_text = translations[0]["translations"][0]["text"]
-            logger.info(f"Text translated successfully to {target_language}")
-            return translated_text
+                # Only the size is logged, the text itself may be sensitive
+                logger.info(f"Sending translation request for {len(text)} characters")
+                translations = self._send_translate_request([text], [target_language],
+                                                            source_language)
+                translated_text = translations[0]["translations"][0]["text"]
+                logger.info(f"Text translated successfully to {target_language}")
+                return translated_text
 
         except requests.exceptions.HTTPError as http_err:
             logger.error(f"HTTP error occurred: {http_err}")
@@ -77,28 +310,202 @@ class TranslatorService:
             logger.error(f"Translation failed: {str(e)}")
             return None
 
+    def _translate_with_memory(self, text: str, target_language: str,
+                               source_language: Optional[str] = None) -> Optional[str]:
+        """
+        Translate text sentence by sentence, reusing sentences found in the translation memory.
+
+        Sentences wrapped across OCR lines are translated whole; see
+        backend.text_segmentation.segment_text. Sentences missing from the
+        memory are translated in one batched call and stored; the output
+        keeps the original whitespace and line breaks between sentences.
+
+        Args:
+            text: Text to translate
+            target_language: Language code to translate to
+            source_language: Optional source language code
+
+        Returns:
+            str: Translated text or None if translation failed
+        """
+        memory_source = source_language or 'auto'
+        parts = segment_text(text, source_language)
+        segments = [part.strip() for part, _ in parts]
+        unique_segments = [segment for segment in dict.fromkeys(segments) if segment]
+
+        translations = self.translation_memory.lookup(unique_segments, memory_source,
+                                                      target_language)
+        misses = [segment for segment in unique_segments if segment not in translations]
+        count("cache_hits_total", len(unique_segments) - len(misses), cache="translation_memory")
+        count("cache_misses_total", len(misses), cache="translation_memory")
+        logger.info(f"Translation memory matched {len(unique_segments) - len(misses)} "
+                    f"of {len(unique_segments)} segments")
+
+        if misses:
+            translated = self.translate_batch(misses, target_language, source_language)
+            if any(translation is None for translation in translated):
+                return None
+            new_translations = dict(zip(misses, translated))
+            self.translation_memory.store(new_translations, memory_source, target_language)
+            translations.update(new_translations)
+
+        output = []
+        for (part, separator), segment in zip(parts, segments):
+            if segment:
+                leading = part[:len(part) - len(part.lstrip())]
+                trailing = part[len(part.rstrip()):]
+                part = leading + translations[segment] + trailing
+            output.append(part + separator)
+        logger.info(f"Text translated successfully to {target_language}")
+        return ''.join(output)
+
+    def translate_batch(self, texts: List[str], target_language: str,
+                        source_language: Optional[str] = None,
+                        max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+                        max_characters: int = MAX_CHARACTERS_PER_REQUEST) -> List[Optional[str]]:
+        """
+        Translate many texts using as few requests as the API limits allow.
+
+        Texts longer than one request are split at line, sentence or word
+        boundaries and their translations joined back together.
+
+        Args:
+            texts: Texts to translate
+            target_language: Language code to translate to (e.g., 'es' for Spanish)
+            source_language: Optional source language code
+            max_elements: Maximum number of array elements per request
+            max_characters: Maximum number of characters per request
+
+        Returns:
+            List[Optional[str]]: Translations in input order, None where the
+            request carrying that text failed
+        """
+        results = self._translate_packed(texts, [target_language], source_language,
+                                         max_elements, max_characters)
+        return [result[target_language] if result else None for result in results]
+
+    def translate_multi(self, text: str, targets: List[str],
+                        source_language: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Translate text to several languages in a single round trip.
+
+        Args:
+            text: Text to translate
+            targets: Language codes to translate to (e.g., ['es', 'fr'])
+            source_language: Optional source language code
+
+        Returns:
+            Dict[str, str]: Translations keyed by language code or None if
+            translation failed
+        """
+        logger.info(f"Translating text to {', '.join(targets)}")
+        return self._translate_packed([text], targets, source_language)[0]
+
+    def _translate_packed(self, texts: List[str], targets: List[str],
+                          source_language: Optional[str] = None,
+                          max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+                          max_characters: int = MAX_CHARACTERS_PER_REQUEST
+                          ) -> List[Optional[Dict[str, str]]]:
+        """
+        Translate texts to every target, packing them into as few requests as possible.
+
+        Args:
+            texts: Texts to translate
+            targets: Language codes to translate to
+            source_language: Optional source language code
+            max_elements: Maximum number of array elements per request
+            max_characters: Maximum number of characters per request
+
+        Returns:
+            List[Optional[Dict[str, str]]]: Translations keyed by language code
+            in input order, None where the request carrying that text failed
+        """
+        import requests
+
+        requests_to_send = pack_requests(texts, len(targets), max_elements, max_characters)
+
+        logger.info(f"Translating {len(texts)} texts to {len(targets)} languages "
+                    f"in {len(requests_to_send)} requests")
+
+        responses = []
+        for batch in requests_to_send:
+            try:
+                responses.append(self._send_translate_request(
+                    [piece for _, piece, _ in batch], targets, source_language
+                ))
+            except requests.exceptions.HTTPError as http_err:
+                logger.error(f"HTTP error occurred: {http_err}")
+                logger.error(f"Response content: {http_err.response.content}")
+                responses.append(None)
+            except Exception as e:
+                logger.error(f"Batch translation failed: {str(e)}")
+                responses.append(None)
+
+        return assemble_translations(len(texts), targets, requests_to_send, responses)
+
+    def _send_translate_request(self, texts: List[str], targets: List[str],
+                                source_language: Optional[str] = None) -> List[Dict]:
+        """
+        Send a single /translate request.
+
+        Args:
+            texts: Texts forming the request body array
+            targets: Language codes to translate to
+            source_language: Optional source language code
+
+        Returns:
+            List[Dict]: Decoded response, one item per input text
+        """
+        constructed_url = self.endpoint + '/translate'
+
+        params = {
+            'api-version': '3.0',
+            'to': targets
+        }
+
+        if source_language:
+            params['from'] = source_language
+
+        body = [{'text': text} for text in texts]
+
+        # The service meters characters once per target language
+        characters = sum(len(text) for text in texts) * len(targets)
+        for attempt in range(self.max_retries + 1):
+            with limited(self.rate_limiter, characters), span("translator_request"):
+                response = self.session.post(constructed_url, params=params,
+                                             json=body, timeout=self.timeout)
+            if metrics_enabled():
+                self._count_traffic(response)
+            if response.status_code != 429 or self.rate_limiter is None or attempt == self.max_retries:
+                break
+            # Pause everyone sharing the limiter and queue this request again
+            count("throttled_total", service="translator")
+            self.rate_limiter.throttled(parse_retry_after(response.headers.get('Retry-After')))
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _count_traffic(response) -> None:
+        """Record the bytes and the urllib3 retries behind one response."""
+        retries = getattr(response.raw, 'retries', None)
+        count("retries_total", len(retries.history) if retries is not None else 0,
+              service="translator")
+        count("bytes_sent_total", len(response.request.body or b''), service="translator")
+        count("bytes_received_total", len(response.content), service="translator")
+
     def get_available_languages(self) -> Dict[str, Dict[str, str]]:
         """
         Get list of supported languages for translation.
+
+        The catalog is fetched once, persisted and revalidated in the
+        background; see backend.language_catalog.LanguageCatalog.
         
         Returns:
             Dict containing language codes and names
         """
         try:
-            path = '/languages'
-            constructed_url = self.endpoint + path
-
-            params = {
-                'api-version': '3.0',
-                'scope': 'translation'
-            }
-
-            response = requests.get(constructed_url, params=params)
-            response.raise_for_status()
-
-            languages = response.json()
-            return languages['translation']
+            return self.language_catalog.get_languages()
 
         except Exception as e:
             logger.error(f"Failed to get available languages: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
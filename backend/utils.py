@@ -1,11 +1,130 @@
+import hashlib
 import logging
+import struct
+from dataclasses import dataclass
 from typing import Optional, Tuple
-from PIL import Image
-import io
+from backend.language_catalog import LanguageCatalog
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Limits of the Azure Read API
+MAX_IMAGE_BYTES = 4 * 1024 * 1024
+MAX_IMAGE_DIMENSION = 4096
+
+# Uploads accepted by the app; larger images are shrunk or tiled before OCR
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_UPLOAD_DIMENSION = 10000
+
+# First bytes of the supported formats
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_JPEG_SIGNATURE = b'\xff\xd8'
+_BMP_SIGNATURE = b'BM'
+
+# JPEG start-of-frame markers carrying the dimensions (C4, C8 and CC are not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """What validation learned about an image, reusable by later steps."""
+    format: str
+    size: int
+    width: int
+    height: int
+    sha256: str
+
+
+def _jpeg_dimensions(view: memoryview) -> Tuple[int, int]:
+    position = 2
+    while position + 4 <= len(view):
+        if view[position] != 0xFF:
+            raise ValueError("Corrupt JPEG marker")
+        marker = view[position + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            position += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Markers without a length
+            position += 2
+            continue
+        if marker == 0xDA:
+            raise ValueError("JPEG scan data before any frame header")
+        segment_length = struct.unpack_from('>H', view, position + 2)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack_from('>HH', view, position + 5)
+            return width, height
+        position += 2 + segment_length
+    raise ValueError("JPEG frame header not found")
+
+
+def _image_dimensions(view: memoryview) -> Tuple[str, int, int]:
+    """
+    Read the format and dimensions from the image header without decoding.
+
+    Raises:
+        ValueError: If the format is unsupported
+        struct.error: If the header is truncated
+    """
+    if view[:8] == _PNG_SIGNATURE:
+        # The IHDR chunk always comes first
+        width, height = struct.unpack_from('>II', view, 16)
+        return 'PNG', width, height
+    if view[:2] == _JPEG_SIGNATURE:
+        return ('JPEG',) + _jpeg_dimensions(view)
+    if view[:2] == _BMP_SIGNATURE:
+        header_size = struct.unpack_from('<I', view, 14)[0]
+        if header_size == 12:
+            width, height = struct.unpack_from('<HH', view, 18)
+        else:
+            width, height = struct.unpack_from('<ii', view, 18)
+        # Negative heights mark top-down bitmaps
+        return 'BMP', width, abs(height)
+    raise ValueError("Unsupported image format")
+
+
+def inspect_image(image_data, max_bytes: int = MAX_IMAGE_BYTES,
+                  max_dimension: Optional[int] = MAX_IMAGE_DIMENSION
+                  ) -> Tuple[Optional[ImageInfo], Optional[str]]:
+    """
+    Validate an image from its header only, without decoding or copying it.
+
+    The payload size is checked before anything is parsed.
+
+    Args:
+        image_data: Raw image data (bytes, bytearray or memoryview)
+        max_bytes: Largest accepted payload in bytes
+        max_dimension: Largest accepted width or height in pixels, None for no limit
+
+    Returns:
+        Tuple[Optional[ImageInfo], Optional[str]]: (image info, None) if the
+        image is valid, (None, error_message) otherwise
+    """
+    view = memoryview(image_data)
+    if view.nbytes > max_bytes:
+        return None, f"Image size too large. Maximum size is {max_bytes // (1024 * 1024)}MB."
+
+    try:
+        image_format, width, height = _image_dimensions(view)
+    except ValueError as e:
+        if str(e) == "Unsupported image format":
+            return None, "Unsupported image format. Please use JPEG, PNG, or BMP."
+        logger.error(f"Image validation failed: {str(e)}")
+        return None, "Invalid image file."
+    except struct.error as e:
+        logger.error(f"Image validation failed: truncated header ({str(e)})")
+        return None, "Invalid image file."
+
+    if width <= 0 or height <= 0:
+        return None, "Invalid image file."
+    if max_dimension is not None and (width > max_dimension or height > max_dimension):
+        return None, f"Image dimensions too large. Maximum dimension is {max_dimension}px."
+
+    return ImageInfo(image_format, view.nbytes, width, height,
+                     hashlib.sha256(view).hexdigest()), None
+
+
 def validate_image(image_data: bytes) -> Tuple[bool, Optional[str]]:
     """
     Validate image data and format.
@@ -16,41 +135,23 @@ def validate_image(image_data: bytes) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple[bool, Optional[str]]: (is_valid, error_message)
     """
-    try:
-        # Try to open the image with PIL
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Check image format
-        if image.format not in ['JPEG', 'PNG', 'BMP']:
-            return False, "Unsupported image format. Please use JPEG, PNG, or BMP."
-        
-        # Check image size
-        max_size = 4 * 1024 * 1024  # 4MB
-        if len(image_data) > max_size:
-            return False, "Image size too large. Maximum size is 4MB."
-        
-        # Check dimensions
-        max_dimension = 4096
-        if image.width > max_dimension or image.height > max_dimension:
-            return False, f"Image dimensions too large. Maximum dimension is {max_dimension}px."
-        
-        return True, None
-        
-    except Exception as e:
-        logger.error(f"Image validation failed: {str(e)}")
-        return False, "Invalid image file."
+    image_info, error = inspect_image(image_data)
+    return image_info is not None, error
 
-def get_language_name(language_code: str, languages_dict: dict) -> str:
+def get_language_name(language_code: str, languages_dict) -> str:
     """
     Get the display name for a language code.
     
     Args:
         language_code: ISO language code
-        languages_dict: Dictionary of supported languages
+        languages_dict: Dictionary of supported languages or a
+            backend.language_catalog.LanguageCatalog
         
     Returns:
         str: Display name of the language
     """
+    if isinstance(languages_dict, LanguageCatalog):
+        return languages_dict.name(language_code) or "Unknown"
     try:
         return languages_dict[language_code]
     except KeyError:
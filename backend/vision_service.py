@@ -1,79 +1,288 @@
 # this is for
 # extract text from images using the Computer Vision OCR API.import os
 import os
-from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
-from msrest.authentication import CognitiveServicesCredentials
-import time
-from typing import Optional, IO
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, IO, List
 import logging
+from backend.instrumentation import count, enabled as metrics_enabled, span
+from backend.polling import PollingStrategy, parse_retry_after
+from backend.rate_limiter import limited
+from backend.ocr_result import OcrPage, OcrResult, ocr_cache_key
+from backend.tiling import merge_tile_lines, tile_boxes
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VisionService:
-    def __init__(self):
-        """Initialize the Vision Service with Azure credentials."""
+    def __init__(self, cache=None, polling: Optional[PollingStrategy] = None,
+                 rate_limiter=None, preprocessor=None, tile_threshold: int = 4096,
+                 tile_size: int = 2048, tile_overlap: int = 256, max_tile_workers: int = 4,
+                 endpoint: Optional[str] = None, key: Optional[str] = None):
+        """
+        Initialize the Vision Service with Azure credentials.
+
+        Args:
+            cache: Optional OCR result cache (e.g. backend.cache.TieredCache)
+                keyed by a hash of the image bytes
+            polling: Strategy used to wait for Read operations, an adaptive
+                PollingStrategy is created if omitted
+            rate_limiter: Optional backend.rate_limiter.ServiceLimiter applied
+                to every call, result polls included
+            preprocessor: Optional backend.image_preprocessing.ImagePreprocessor
+                shrinking images before upload; the cache stays keyed by the
+                original bytes
+            tile_threshold: Images whose longest side exceeds this many pixels
+                are read as tiles
+            tile_size: Maximum tile width and height in pixels
+            tile_overlap: Pixels shared by neighbouring tiles, larger than a
+                text line so every line is whole in some tile
+            max_tile_workers: Maximum number of tiles read at once
+            endpoint: Vision endpoint overriding AZURE_VISION_ENDPOINT, e.g.
+                a backend.fake_azure.FakeAzureServer URL
+            key: Subscription key overriding AZURE_VISION_KEY
+
+        The Azure SDK is imported and the client created on first use, see
+        warm_up() to do it ahead of the first request.
+        """
         try:
-            self.endpoint = os.getenv('AZURE_VISION_ENDPOINT')
-            self.key = os.getenv('AZURE_VISION_KEY')
+            self.cache = cache
+            self.tile_threshold = tile_threshold
+            self.tile_size = tile_size
+            self.tile_overlap = tile_overlap
+            self.max_tile_workers = max_tile_workers
+            self.rate_limiter = rate_limiter
+            self.preprocessor = preprocessor
+            self.polling = polling if polling is not None else PollingStrategy()
+            self.endpoint = endpoint or os.getenv('AZURE_VISION_ENDPOINT')
+            self.key = key or os.getenv('AZURE_VISION_KEY')
             
             if not self.endpoint or not self.key:
                 raise ValueError("Azure Vision credentials not found in environment variables")
-            
-            self.client = ComputerVisionClient(
-                endpoint=self.endpoint,
-                credentials=CognitiveServicesCredentials(self.key)
-            )
+
+            self._client = None
+            self._client_lock = threading.Lock()
             logger.info("Vision Service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Vision Service: {str(e)}")
             raise
 
-    def extract_text(self, image_data: IO) -> Optional[str]:
+    @property
+    def client(self):
+        """Computer Vision client, created with its SDK import on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from azure.cognitiveservices.vision.computervision import ComputerVisionClient
+                    from msrest.authentication import CognitiveServicesCredentials
+                    self._client = ComputerVisionClient(
+                        endpoint=self.endpoint,
+                        credentials=CognitiveServicesCredentials(self.key)
+                    )
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    def warm_up(self) -> None:
+        """Import the SDK and Pillow and create the client ahead of the first request."""
+        with span("warm_up", service="vision"):
+            self.client
+            from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes  # noqa: F401
+            # Also used by the preprocessor
+            from PIL import Image, ImageOps  # noqa: F401
+
+    def _preprocess(self, image_bytes: bytes) -> bytes:
+        """Shrink the image for upload, falling back to the original bytes."""
+        if self.preprocessor is None:
+            return image_bytes
+        try:
+            return self.preprocessor.process(image_bytes).data
+        except Exception as e:
+            logger.warning(f"Image preprocessing failed, sending the original: {str(e)}")
+            return image_bytes
+
+    def extract_text(self, image_data: IO, image_info=None,
+                     tiled: Optional[bool] = None) -> Optional[str]:
         """
         Extract text from an image using Azure's OCR service.
         
         Args:
             image_data: File-like object containing the image data
+            image_info: Optional backend.utils.ImageInfo of the same image,
+                whose hash is reused in the cache key
+            tiled: Read the image as overlapping tiles; by default only
+                images larger than tile_threshold are tiled
             
         Returns:
             str: Extracted text or None if extraction failed
         """
+        result = self.analyze_text(image_data, image_info, tiled)
+        return result.text if result is not None else None
+
+    def analyze_text(self, image_data: IO, image_info=None,
+                     tiled: Optional[bool] = None) -> Optional[OcrResult]:
+        """
+        Read the pages, lines and words of an image with their bounding boxes.
+
+        Untiled results are in the coordinates of the image as sent to the
+        service, i.e. after the preprocessor's downscale. Tiled results are in
+        the coordinates of the upright original, since tiling exists to keep
+        the full resolution. Each page's width and height give its space.
+
+        Args:
+            image_data: File-like object containing the image data
+            image_info: Optional backend.utils.ImageInfo of the same image,
+                whose hash is reused in the cache key
+            tiled: Read the image as overlapping tiles; by default only
+                images larger than tile_threshold are tiled
+
+        Returns:
+            OcrResult: Structured result or None if extraction failed
+        """
         try:
-            # Start the async OCR operation
-            read_response = self.client.read_in_stream(image_data, raw=True)
-            operation_location = read_response.headers["Operation-Location"]
-            operation_id = operation_location.split("/")[-1]
-
-            # Wait for the operation to complete
-            max_retries = 10
-            retry_delay = 1
-            current_try = 0
-            
-            while current_try < max_retries:
-                result = self.client.get_read_result(operation_id)
-                if result.status not in [OperationStatusCodes.running, OperationStatusCodes.not_started]:
-                    break
-                time.sleep(retry_delay)
-                current_try += 1
-
-            # Extract and return the text
-            if result.status == OperationStatusCodes.succeeded:
-                text = ""
-                for text_result in result.analyze_result.read_results:
-                    for line in text_result.lines:
-                        text += line.text + "\n"
-                logger.info("Text extracted successfully")
-                return text.strip()
+            image_bytes = image_data.read()
+            if tiled is None:
+                tiled = self._longest_side(image_bytes, image_info) > self.tile_threshold
+
+            # Identical images read the same way skip the Azure round trip entirely
+            cache_key = None
+            if self.cache is not None:
+                cache_key = ocr_cache_key(image_bytes, image_info, self._read_settings(tiled))
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    count("cache_hits_total", cache="ocr")
+                    logger.info("Text extracted from OCR cache")
+                    return OcrResult.from_json(cached)
+                count("cache_misses_total", cache="ocr")
+
+            if tiled:
+                result = self._read_tiled(image_bytes)
             else:
-                logger.warning(f"Text extraction failed with status: {result.status}")
+                pages = self._read(self._preprocess(image_bytes))
+                result = OcrResult.from_read_results(pages) if pages is not None else None
+            if result is None:
                 return None
 
+            if cache_key is not None:
+                self.cache.set(cache_key, result.to_json())
+            logger.info("Text extracted successfully")
+            return result
+
         except Exception as e:
             logger.error(f"Error in text extraction: {str(e)}")
             return None
 
+    def _read_settings(self, tiled: bool) -> str:
+        """How an image is prepared for reading, which decides the coordinates of its boxes."""
+        if tiled:
+            grayscale = self.preprocessor is not None and self.preprocessor.grayscale
+            return f"tiles={self.tile_size}/{self.tile_overlap},grayscale={grayscale}"
+        return self.preprocessor.settings if self.preprocessor is not None else ""
+
+    def _longest_side(self, image_bytes: bytes, image_info=None) -> int:
+        """Longest image side in pixels, 0 if the image cannot be identified."""
+        if image_info is not None:
+            return max(image_info.width, image_info.height)
+        try:
+            from PIL import Image
+            # Only the header is read until pixel data is accessed
+            return max(Image.open(io.BytesIO(image_bytes)).size)
+        except Exception:
+            # Let the service report what is wrong with the image
+            return 0
+
+    def _read(self, upload_bytes: bytes) -> Optional[List]:
+        """
+        Run one Read operation.
+
+        Args:
+            upload_bytes: Image bytes to upload
+
+        Returns:
+            List: Read result per page, or None if the operation failed
+        """
+        from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
+
+        # Start the async OCR operation
+        with limited(self.rate_limiter), span("vision_read_submit"):
+            read_response = self.client.read_in_stream(io.BytesIO(upload_bytes), raw=True)
+        count("bytes_sent_total", len(upload_bytes), service="vision")
+        operation_location = read_response.headers["Operation-Location"]
+        operation_id = operation_location.split("/")[-1]
+
+        # Wait for the operation to complete
+        def fetch_result():
+            with limited(self.rate_limiter), span("vision_read_poll"):
+                raw_result = self.client.get_read_result(operation_id, raw=True)
+            headers = raw_result.response.headers
+            if metrics_enabled():
+                count("bytes_received_total", int(headers.get("Content-Length") or 0),
+                      service="vision")
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            return raw_result.output, retry_after
+
+        result, poll_stats = self.polling.poll(
+            fetch_result,
+            lambda pending: pending.status in [OperationStatusCodes.running,
+                                               OperationStatusCodes.not_started],
+            size_bytes=len(upload_bytes)
+        )
+        logger.info(f"Read operation polled {poll_stats.polls} times "
+                    f"in {poll_stats.wall_time:.2f}s")
+        if poll_stats.timed_out:
+            logger.warning(f"Read operation did not finish within {self.polling.deadline}s")
+            return None
+
+        if result.status != OperationStatusCodes.succeeded:
+            logger.warning(f"Text extraction failed with status: {result.status}")
+            return None
+        return result.analyze_result.read_results
+
+    def _read_tiled(self, image_bytes: bytes) -> Optional[OcrResult]:
+        """
+        Read a large image as overlapping tiles submitted concurrently.
+
+        The preprocessor's downscale is skipped, it would undo what tiling
+        is for, so boxes are in the coordinates of the upright original.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            OcrResult: Single page holding the lines of every tile in reading
+            order with the overlaps de-duplicated, or None if any tile failed
+        """
+        from PIL import Image, ImageOps
+
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+        if self.preprocessor is not None and self.preprocessor.grayscale:
+            image = image.convert('L')
+        elif image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+
+        boxes = tile_boxes(image.width, image.height, self.tile_size, self.tile_overlap)
+        logger.info(f"Reading {image.width}x{image.height} image as {len(boxes)} tiles")
+
+        def read_tile(box):
+            output = io.BytesIO()
+            image.crop(box).save(output, 'JPEG', quality=90)
+            pages = self._read(output.getvalue())
+            # Shift the tile's boxes into whole-image coordinates
+            return OcrResult.from_read_results(pages, box[0], box[1]) if pages is not None else None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_tile_workers, len(boxes))) as executor:
+            tile_results = list(executor.map(read_tile, boxes))
+        if any(result is None for result in tile_results):
+            logger.error("Text extraction failed for at least one tile")
+            return None
+
+        lines = merge_tile_lines([list(result.lines) for result in tile_results])
+        angle = tile_results[0].pages[0].angle if tile_results[0].pages else 0
+        return OcrResult([OcrPage(1, image.width, image.height, 'pixel', angle, lines)])
+
     def is_valid_image(self, image_data: IO) -> bool:
         """
         Validate if the provided image data is suitable for OCR.
@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.vision_service import VisionService
 from backend.translator_service import TranslatorService
 from backend.speech_service import SpeechService
+from backend.language_catalog import SUPPORTED_LANGUAGES
 
 # Configure logging
 logging.basicConfig(
@@ -22,26 +23,7 @@ logger = logging.getLogger(__name__)
 
 # Language configurations with their voice names
 LANGUAGE_CONFIG = {
-    'English': {
-        'code': 'en',
-        'voice': 'en-US-JennyMultilingualNeural',
-        'speech_code': 'en-US'
-    },
-    'Spanish': {
-        'code': 'es',
-        'voice': 'es-ES-ElviraNeural',
-        'speech_code': 'es-ES'
-    },
-    'French': {
-        'code': 'fr',
-        'voice': 'fr-FR-DeniseNeural',
-        'speech_code': 'fr-FR'
-    },
-    'Arabic': {
-        'code': 'ar',
-        'voice': 'ar-SA-ZariyahNeural',
-        'speech_code': 'ar-SA'
-    }
+    name: SUPPORTED_LANGUAGES[name] for name in ('English', 'Spanish', 'French', 'Arabic')
 }
 
 def save_audio(audio_data: bytes, filename: str):
@@ -107,18 +89,21 @@ def test_all_services():
             original_audio_path = save_audio(original_audio, 'original_speech.wav')
             print(f"Original speech saved to: {original_audio_path}")
         
-        # Step 2 & 3: Translate text and generate speech for each language
-        for language_name, config in LANGUAGE_CONFIG.items():
-            if language_name == 'English':  # Skip English as it's our source
-                continue
-                
+        # Step 2: Translate text to every target language in one request
+        target_languages = {
+            language_name: config for language_name, config in LANGUAGE_CONFIG.items()
+            if language_name != 'English'  # Skip English as it's our source
+        }
+        translations = translator_service.translate_multi(
+            extracted_text,
+            [config['code'] for config in target_languages.values()]
+        ) or {}
+
+        # Step 3: Generate speech for each language
+        for language_name, config in target_languages.items():
             print(f"\nProcessing {language_name}...")
             
-            # Translate
-            translated_text = translator_service.translate_text(
-                extracted_text,
-                config['code']
-            )
+            translated_text = translations.get(config['code'])
             
             if translated_text:
                 print(f"\n{language_name} Translation:")
@@ -0,0 +1,131 @@
+import os
+import sys
+import io
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api import SpeechRequest, create_app
+from backend.fake_azure import FakeAzureServer, FakeEndpoint, Latency
+from backend.pipeline import Pipeline
+from backend.polling import PollingStrategy
+from backend.speech_service import SpeechService
+from backend.translator_service import TranslatorService
+from backend.vision_service import VisionService
+
+
+def png_bytes(width=320, height=240):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(output, "PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def server():
+    with FakeAzureServer(read_latency=Latency(0.02), key="fake-key", seed=1) as fake:
+        yield fake
+
+
+def make_client(server):
+    pipeline = Pipeline(
+        VisionService(polling=PollingStrategy(min_delay=0.01), endpoint=server.url, key="fake-key"),
+        TranslatorService(endpoint=server.url, key="fake-key", region="local"),
+        SpeechService(endpoint=server.url + "/cognitiveservices/v1", key="fake-key", region="local")
+    )
+    return TestClient(create_app(pipeline)), pipeline
+
+
+def test_ocr_translate_and_streamed_speech(server):
+    client, pipeline = make_client(server)
+    with client:
+        ocr = client.post("/ocr", files={"file": ("page.png", png_bytes(), "image/png")})
+        translation = client.post("/translate", json={"text": "Hello", "target_language": "es"})
+        with client.stream("POST", "/tts", json={"text": "Hola", "language": "es-ES"}) as response:
+            chunks = list(response.iter_bytes())
+            content_type = response.headers["content-type"]
+    pipeline.shutdown()
+
+    assert ocr.status_code == 200
+    assert ocr.json()["text"].startswith("Fake Azure OCR")
+    assert ocr.json()["pages"][0]["lines"][0]["box"] == [20, 20, 160, 50]
+    assert translation.json()["translated_text"] == "[es] Hello"
+    assert content_type == "audio/wav"
+    assert b"".join(chunks).startswith(b"RIFF")
+
+
+def test_pipeline_endpoint_returns_texts_and_audio(server):
+    client, pipeline = make_client(server)
+    with client:
+        response = client.post("/pipeline", files={"file": ("page.png", png_bytes(), "image/png")},
+                               data={"target_language": "fr", "target_speech_language": "fr-FR"})
+    pipeline.shutdown()
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["translated_text"].startswith("[fr] Fake Azure OCR")
+    assert base64.b64decode(body["translated_audio"]).startswith(b"RIFF")
+    assert body["original_audio"] is None
+    assert body["stages"]["translated_audio"]["status"] == "succeeded"
+
+
+def test_bad_uploads_and_service_failures_are_reported():
+    with FakeAzureServer(translator=FakeEndpoint(Latency(0.0), error_rate=1.0),
+                         key="fake-key") as server:
+        client, pipeline = make_client(server)
+        pipeline.translator_service.max_retries = 0
+        with client:
+            invalid = client.post("/ocr", files={"file": ("notes.txt", b"not an image", "text/plain")})
+            failed = client.post("/translate", json={"text": "Hello", "target_language": "es"})
+            health = client.get("/health")
+        pipeline.shutdown()
+
+    assert invalid.status_code == 400
+    assert failed.status_code == 502
+    assert health.json() == {"status": "ok"}
+
+
+def test_pipeline_fails_when_translation_fails():
+    with FakeAzureServer(translator=FakeEndpoint(Latency(0.0), error_rate=1.0),
+                         read_latency=Latency(0.01), key="fake-key") as server:
+        client, pipeline = make_client(server)
+        pipeline.translator_service.max_retries = 0
+        with client:
+            response = client.post("/pipeline", files={"file": ("page.png", png_bytes(), "image/png")},
+                                   data={"target_language": "fr"})
+        pipeline.shutdown()
+
+    assert response.status_code == 502
+    assert "translation" in response.json()["detail"]
+
+
+def test_abandoned_tts_stream_closes_the_synthesis():
+    closed = []
+
+    def stream_text_to_speech(text, language, voice_name=None):
+        try:
+            for index in range(100):
+                yield b"chunk-%d" % index
+        finally:
+            closed.append(True)
+
+    speech_service = SimpleNamespace(stream_text_to_speech=stream_text_to_speech)
+    app = create_app(SimpleNamespace(speech_service=speech_service))
+    endpoint = next(route.endpoint for route in app.routes if getattr(route, "path", "") == "/tts")
+    response = endpoint(SpeechRequest(text="Hello"))
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+        if len(sent) == 3:
+            raise OSError("client went away")
+
+    with pytest.raises(OSError):
+        asyncio.run(response.stream_response(send))
+    assert closed == [True]
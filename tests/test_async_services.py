@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import asyncio
+
+import httpx
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.async_services import (
+    AsyncSpeechService,
+    AsyncTranslatorService,
+    AsyncVisionService,
+)
+from backend.polling import PollingStrategy
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    """Answer like the Azure endpoints the async services talk to."""
+    path = request.url.path
+    if path.endswith("/read/analyze"):
+        return httpx.Response(202, headers={
+            "Operation-Location": "https://vision.test/vision/v3.2/read/analyzeResults/op-1"
+        })
+    if "/read/analyzeResults/" in path:
+        return httpx.Response(200, json={
+            "status": "succeeded",
+            "analyzeResult": {"readResults": [{
+                "page": 1, "angle": 0, "width": 100, "height": 50, "unit": "pixel",
+                "lines": [
+                    {"text": "Hello", "boundingBox": [0, 0, 40, 0, 40, 10, 0, 10],
+                     "words": [{"text": "Hello", "boundingBox": [0, 0, 40, 0, 40, 10, 0, 10],
+                                "confidence": 0.98}]},
+                    {"text": "World", "boundingBox": [0, 20, 40, 20, 40, 30, 0, 30], "words": []},
+                ]
+            }]}
+        })
+    if path.endswith("/translate"):
+        targets = request.url.params.get_list("to")
+        body = json.loads(request.content)
+        return httpx.Response(200, json=[
+            {"translations": [{"text": f"{target}:{item['text']}", "to": target} for target in targets]}
+            for item in body
+        ])
+    if path.endswith("/cognitiveservices/v1"):
+        return httpx.Response(200, content=b"RIFF fake audio")
+    return httpx.Response(404)
+
+
+def set_credentials(monkeypatch):
+    monkeypatch.setenv("AZURE_VISION_ENDPOINT", "https://vision.test/")
+    monkeypatch.setenv("AZURE_VISION_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    monkeypatch.setenv("AZURE_SPEECH_KEY", "test-key")
+    monkeypatch.setenv("AZURE_SPEECH_REGION", "westeurope")
+
+
+def test_async_services_share_one_client(monkeypatch):
+    set_credentials(monkeypatch)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            vision_service = AsyncVisionService(
+                client, polling=PollingStrategy(min_delay=0.001, deadline=5.0)
+            )
+            translator_service = AsyncTranslatorService(client)
+            speech_service = AsyncSpeechService(client)
+
+            texts = await asyncio.gather(*(vision_service.extract_text(b"image") for _ in range(5)))
+            translations = await translator_service.translate_batch(["a", "b", "c"], "es",
+                                                                    max_elements=2)
+            multi = await translator_service.translate_multi("hi", ["es", "fr"])
+            audio = await speech_service.text_to_speech("Hello", "en-US")
+            return texts, translations, multi, audio
+
+    texts, translations, multi, audio = asyncio.run(run())
+
+    assert texts == ["Hello\nWorld"] * 5
+    assert translations == ["es:a", "es:b", "es:c"]
+    assert multi == {"es": "es:hi", "fr": "fr:hi"}
+    assert audio == b"RIFF fake audio"
+
+
+def test_async_services_retry_transient_errors_without_a_limiter(monkeypatch):
+    set_credentials(monkeypatch)
+    statuses = [503, 429, 200]
+    calls = []
+
+    def flaky_handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        status = statuses.pop(0)
+        if status != 200:
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return handler(request)
+
+    async def run():
+        async with AsyncTranslatorService(
+            httpx.AsyncClient(transport=httpx.MockTransport(flaky_handler))
+        ) as translator_service:
+            return await translator_service.translate_text("hi", "es")
+
+    assert asyncio.run(run()) == "es:hi"
+    assert len(calls) == 3
+
+
+def test_async_retries_give_up_after_max_retries(monkeypatch):
+    set_credentials(monkeypatch)
+    calls = []
+
+    def failing_handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500)
+
+    async def run():
+        async with AsyncSpeechService(
+            httpx.AsyncClient(transport=httpx.MockTransport(failing_handler))
+        ) as speech_service:
+            speech_service.BACKOFF_FACTOR = 0
+            return await speech_service.text_to_speech("Hello", "en-US")
+
+    assert asyncio.run(run()) is None
+    assert len(calls) == AsyncSpeechService.MAX_RETRIES + 1
+
+
+def test_async_speech_falls_back_to_the_services_voice_for_a_locale(monkeypatch):
+    set_credentials(monkeypatch)
+    requests = []
+
+    def voices_handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/cognitiveservices/voices/list"):
+            return httpx.Response(200, json=[
+                {"ShortName": "nl-BE-ArnaudNeural", "Locale": "nl-BE"},
+                {"ShortName": "nl-BE-DenaNeural", "Locale": "nl-BE"},
+            ])
+        return handler(request)
+
+    async def run():
+        async with AsyncSpeechService(
+            httpx.AsyncClient(transport=httpx.MockTransport(voices_handler))
+        ) as speech_service:
+            flemish = await speech_service.text_to_speech("Hallo", "nl-BE")
+            unknown = await speech_service.text_to_speech("Hello", "xx-XX")
+            return flemish, unknown
+
+    flemish, unknown = asyncio.run(run())
+
+    assert flemish == b"RIFF fake audio"
+    assert unknown is None
+    # The voice list is fetched once, then every synthesis names its voice
+    assert [request.url.path for request in requests].count("/cognitiveservices/voices/list") == 1
+    assert b"name=\"nl-BE-ArnaudNeural\"" in requests[1].content
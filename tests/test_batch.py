@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.batch import BatchProcessor, build_limiters, discover_items, load_checkpoint
+from backend.pipeline import Pipeline
+
+
+class FakeVision:
+    def extract_text(self, image_stream, image_info=None):
+        data = image_stream.read()
+        return None if data == b"blank" else data.decode("utf-8")
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_text(self, text, target_language, source_language=None):
+        self.calls.append(text)
+        return f"{text}-{target_language}"
+
+
+class FakeSpeech:
+    def text_to_speech(self, text, language):
+        return f"{language}:{text}".encode("utf-8")
+
+
+def write_images(directory, contents):
+    for name, data in contents.items():
+        with open(os.path.join(directory, name), "wb") as image_file:
+            image_file.write(data)
+
+
+def test_discover_directory_glob_and_manifest(tmp_path):
+    write_images(tmp_path, {"b.jpg": b"b", "a.png": b"a", "notes.txt": b"x"})
+    os.makedirs(tmp_path / "nested")
+    write_images(tmp_path / "nested", {"c.JPEG": b"c"})
+
+    assert [item.id for item in discover_items(str(tmp_path))] == [
+        "a.png", "b.jpg", os.path.join("nested", "c.JPEG")]
+    assert [os.path.basename(item.path) for item in discover_items(str(tmp_path / "*.jpg"))] == ["b.jpg"]
+
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text('{"path": "a.png", "target_language": "fr"}\n\n'
+                        '{"id": "second", "path": "b.jpg"}\n')
+    items = discover_items(str(manifest))
+    assert [(item.id, item.target_language) for item in items] == [("a.png", "fr"), ("second", None)]
+    assert items[0].path == os.path.join(str(tmp_path), "a.png")
+
+
+def test_process_writes_jsonl_and_audio(tmp_path):
+    write_images(tmp_path, {"one.png": b"one", "two.png": b"two"})
+    pipeline = Pipeline(FakeVision(), FakeTranslator(), FakeSpeech())
+    processor = BatchProcessor(pipeline, "es", workers=2, audio_dir=str(tmp_path / "audio"))
+    output = tmp_path / "out" / "results.jsonl"
+
+    records = list(processor.process(discover_items(str(tmp_path)), str(output)))
+    pipeline.shutdown()
+
+    assert sorted(record["id"] for record in records) == ["one.png", "two.png"]
+    written = {record["id"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert written["one.png"]["status"] == "ok"
+    assert written["one.png"]["translated_text"] == "one-es"
+    with open(written["one.png"]["translated_audio"], "rb") as audio_file:
+        assert audio_file.read() == b"es-ES:one-es"
+    assert written["two.png"]["timings"]["ocr"]["status"] == "succeeded"
+
+
+def test_resume_skips_finished_items(tmp_path):
+    write_images(tmp_path, {"one.png": b"one", "two.png": b"two", "blank.png": b"blank"})
+    output = tmp_path / "results.jsonl"
+    output.write_text(json.dumps({"id": "one.png", "status": "ok"}) + "\n"
+                      + json.dumps({"id": "blank.png", "status": "failed"}) + "\n"
+                      + '{"id": "two.png", "sta')
+
+    assert load_checkpoint(str(output)) == {"one.png"}
+
+    translator = FakeTranslator()
+    pipeline = Pipeline(FakeVision(), translator, None)
+    processor = BatchProcessor(pipeline, "es", workers=2)
+    records = {record["id"]: record for record in processor.process(
+        discover_items(str(tmp_path)), str(output))}
+    pipeline.shutdown()
+
+    assert set(records) == {"two.png", "blank.png"}
+    assert records["blank.png"]["status"] == "failed"
+    assert translator.calls == ["two"]
+    assert load_checkpoint(str(output)) == {"one.png", "two.png"}
+
+
+
+def test_build_limiters_prefers_flags_over_environment(monkeypatch):
+    monkeypatch.setenv("TRANSLATOR_CHARACTERS_PER_MINUTE", "1000")
+    monkeypatch.setenv("SPEECH_MAX_CONCURRENT", "2")
+    limiters = build_limiters(translator_rate=5, speech_streams=None)
+
+    assert limiters["vision"] is None
+    assert limiters["translator"].requests.rate == 5
+    assert limiters["translator"].characters is None
+    assert limiters["speech"].concurrency.max_concurrent == 2
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.benchmark import compare, main, percentile, summarize
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([0.2], 95) == 0.2
+    assert summarize([]) == {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+
+def test_benchmark_writes_results_and_flags_regressions(tmp_path):
+    output = tmp_path / "results.json"
+    assert main(["-n", "4", "-c", "2", "--read-latency", "0.01", "--vision-latency", "0",
+                 "--translator-latency", "0", "--speech-latency", "0", "-o", str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    assert set(report["scenarios"]) == {"vision", "translator", "speech", "pipeline"}
+    pipeline = report["scenarios"]["pipeline"]
+    assert pipeline["failed"] == 0
+    assert {"total", "ocr", "translation", "original_audio", "translated_audio"} <= set(pipeline["latency"])
+    assert pipeline["traffic"]["tts"]["requests"] == 8
+    assert pipeline["traffic"]["read"]["bytes_in"] > 0
+
+    # Twice as slow and half the throughput of the recorded run
+    slower = json.loads(output.read_text())
+    for scenario in slower["scenarios"].values():
+        scenario["throughput"] /= 2
+        for summary in scenario["latency"].values():
+            summary["p95"] *= 2
+    changes = dict(compare(slower, report))
+    assert abs(changes["translator.total.p95"] - 1.0) < 1e-9
+    assert abs(changes["speech.throughput"] - 0.5) < 1e-9
@@ -0,0 +1,180 @@
+import os
+import sys
+import io
+import threading
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.audio_cache import AudioCache
+from backend.cache import DirectoryCache, MemoryCache, SQLiteCache, TieredCache, content_key
+from backend.image_preprocessing import ImagePreprocessor
+from backend.ocr_result import OCR_CACHE_NAMESPACE, OcrResult
+from backend.vision_service import VisionService
+from azure.cognitiveservices.vision.computervision.models import Line, OperationStatusCodes, ReadResult
+
+
+class FakeVisionClient:
+    """Minimal stand-in for ComputerVisionClient counting read calls."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.read_calls = 0
+
+    def read_in_stream(self, image_data, raw=True):
+        self.read_calls += 1
+        return SimpleNamespace(headers={"Operation-Location": "https://example/operations/op-1"})
+
+    def get_read_result(self, operation_id, raw=False):
+        page = ReadResult(page=1, angle=0, width=100, height=100, unit="pixel", lines=[
+            Line(text=line, bounding_box=[0, 10 * i, 50, 10 * i, 50, 10 * i + 8, 0, 10 * i + 8], words=[])
+            for i, line in enumerate(self.lines)
+        ])
+        result = SimpleNamespace(
+            status=OperationStatusCodes.succeeded,
+            analyze_result=SimpleNamespace(read_results=[page])
+        )
+        return SimpleNamespace(output=result, response=SimpleNamespace(headers={}))
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+
+def test_memory_cache_respects_byte_budget():
+    cache = MemoryCache(max_entries=10, max_bytes=5)
+    cache.set("a", b"123")
+    cache.set("b", b"456")
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 3
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "ocr.sqlite3")
+    cache = SQLiteCache(path)
+    cache.set("key", b"value")
+    cache.close()
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("key") == b"value"
+    assert len(reopened) == 1
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "ocr.sqlite3"))
+    disk.set("key", b"value")
+    cache = TieredCache(MemoryCache(), disk)
+
+    assert cache.get("key") == b"value"
+    assert cache.memory.get("key") == b"value"
+    assert cache.get("missing") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_extract_text_skips_azure_on_cache_hit(monkeypatch):
+    monkeypatch.setenv("AZURE_VISION_ENDPOINT", "https://example.cognitiveservices.azure.com/")
+    monkeypatch.setenv("AZURE_VISION_KEY", "test-key")
+    cache = TieredCache()
+    vision_service = VisionService(cache=cache)
+    vision_service.client = FakeVisionClient(["Hello", "World"])
+
+    image_data = b"fake image bytes"
+    assert vision_service.extract_text(io.BytesIO(image_data)) == "Hello\nWorld"
+    assert vision_service.extract_text(io.BytesIO(image_data)) == "Hello\nWorld"
+
+    assert vision_service.client.read_calls == 1
+    cached = OcrResult.from_json(cache.get(content_key(image_data, namespace=OCR_CACHE_NAMESPACE)))
+    assert [line.box for line in cached.lines] == [(0, 0, 50, 8), (0, 10, 50, 18)]
+
+
+def test_ocr_cache_key_depends_on_how_the_image_is_read(monkeypatch):
+    monkeypatch.setenv("AZURE_VISION_ENDPOINT", "https://example.cognitiveservices.azure.com/")
+    monkeypatch.setenv("AZURE_VISION_KEY", "test-key")
+    cache = TieredCache()
+    client = FakeVisionClient(["Hello"])
+    image_data = b"fake image bytes"
+
+    for preprocessor in (ImagePreprocessor(max_dimension=1024), ImagePreprocessor(max_dimension=2048),
+                         ImagePreprocessor(max_dimension=1024)):
+        vision_service = VisionService(cache=cache, preprocessor=preprocessor)
+        vision_service.client = client
+        assert vision_service.extract_text(io.BytesIO(image_data), tiled=False) == "Hello"
+
+    # Boxes from a downscaled image are never served for another scale
+    assert client.read_calls == 2
+
+
+def test_directory_cache_enforces_byte_budget_and_maps_entries(tmp_path):
+    cache = DirectoryCache(str(tmp_path / "tts"), max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"67890")
+    assert cache.get("a") == b"12345"
+    cache.set("c", b"abc")
+
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+    assert bytes(cache.get_view("c")) == b"abc"
+
+    reopened = DirectoryCache(str(tmp_path / "tts"), max_bytes=10)
+    assert len(reopened) == 2
+    assert reopened.size_bytes == 8
+
+
+def test_directory_cache_keeps_entries_rewritten_elsewhere(tmp_path):
+    directory = str(tmp_path / "tts")
+    cache = DirectoryCache(directory, max_bytes=10)
+    cache.set("a", b"12345")
+    # Another process sharing the directory rewrites the same entry
+    other = DirectoryCache(directory, max_bytes=100)
+    other.set("a", b"54321")
+
+    cache.set("b", b"67890")
+    cache.set("c", b"abc")
+
+    assert cache.stats.evictions == 1
+    assert other.get("a") == b"54321"
+    assert not [name for shard in os.listdir(directory)
+                for name in os.listdir(os.path.join(directory, shard)) if name.endswith(".tmp")]
+
+
+def test_directory_cache_concurrent_writes_stay_consistent(tmp_path):
+    cache = DirectoryCache(str(tmp_path / "tts"), max_bytes=64)
+
+    def write(worker):
+        for index in range(50):
+            cache.set(f"key-{index % 8}", f"{worker}-{index:02d}".encode())
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every indexed entry is still on disk
+    assert len(cache) > 0
+    for index in range(8):
+        if cache._name(f"key-{index}") in cache._index:
+            assert cache.get(f"key-{index}") is not None
+
+
+def test_audio_cache_normalizes_text_and_keeps_large_clips_on_disk(tmp_path):
+    cache = AudioCache(str(tmp_path / "tts"), memory_max_entry_bytes=4)
+    cache.set("Hello   world", "en-US", "Riff24Khz16BitMonoPcm", b"large clip")
+
+    assert cache.get("Hello world", "en-US", "Riff24Khz16BitMonoPcm") == b"large clip"
+    assert cache.get("Hello world", "fr-FR", "Riff24Khz16BitMonoPcm") is None
+    assert len(cache.memory) == 0
+    assert bytes(cache.get_view("Hello world", "en-US", "Riff24Khz16BitMonoPcm")) == b"large clip"
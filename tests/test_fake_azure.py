@@ -0,0 +1,132 @@
+import os
+import sys
+import io
+import asyncio
+import random
+
+import pytest
+from PIL import Image
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.async_services import AsyncSpeechService, AsyncVisionService
+from backend.audio import SAMPLE_RATE, parse_wav
+from backend.fake_azure import FakeAzureServer, FakeEndpoint, Latency
+from backend.polling import PollingStrategy
+from backend.speech_service import SpeechService
+from backend.translator_service import TranslatorService
+from backend.vision_service import VisionService
+
+
+def png_bytes(width=320, height=240):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(output, "PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def server():
+    with FakeAzureServer(read_latency=Latency(0.05), key="fake-key", seed=1) as fake:
+        yield fake
+
+
+def test_sync_services_run_against_fake_endpoints(server):
+    vision_service = VisionService(polling=PollingStrategy(min_delay=0.01), endpoint=server.url,
+                                   key="fake-key")
+    translator_service = TranslatorService(endpoint=server.url, key="fake-key", region="local")
+
+    result = vision_service.analyze_text(io.BytesIO(png_bytes()))
+    page = result.pages[0]
+    assert result.text == "Fake Azure OCR\nThe quick brown fox jumps over the lazy dog."
+    assert (page.width, page.height) == (320, 240)
+    assert page.lines[0].box == (20, 20, 160, 50)
+    assert page.lines[0].confidence == 0.99
+
+    assert translator_service.translate_text("Hello", "es") == "[es] Hello"
+    assert translator_service.translate_multi("Hi", ["es", "fr"]) == {"es": "[es] Hi", "fr": "[fr] Hi"}
+    assert "es" in translator_service.language_catalog.get_languages()
+    # The second fetch is revalidated with the ETag
+    assert translator_service.language_catalog.refresh()
+
+    stats = server.stats()
+    assert stats["read"].requests == 1
+    assert stats["read-result"].requests >= 2
+    assert stats["translate"].characters == len("Hello") + 2 * len("Hi")
+    assert stats["languages"].requests == 2
+    assert server.throughput()["translate"] > 0
+
+
+def test_read_operations_do_not_accumulate():
+    with FakeAzureServer(read_latency=Latency(0.0), key="fake-key", operation_ttl=0.0) as server:
+        vision_service = VisionService(polling=PollingStrategy(min_delay=0.01), endpoint=server.url,
+                                       key="fake-key")
+        for _ in range(3):
+            assert vision_service.extract_text(io.BytesIO(png_bytes())) is not None
+        # Fetched results are dropped
+        assert server._operations == {}
+
+        # Abandoned operations expire when the next one is submitted
+        vision_service.client.read_in_stream(io.BytesIO(png_bytes()), raw=True)
+        vision_service.client.read_in_stream(io.BytesIO(png_bytes()), raw=True)
+        assert len(server._operations) == 1
+
+
+def test_injected_throttling_and_wrong_key():
+    throttled = FakeEndpoint(throttle_rate=1.0, retry_after=0)
+    with FakeAzureServer(translator=throttled, key="fake-key") as server:
+        translator_service = TranslatorService(max_retries=1, backoff_factor=0,
+                                               endpoint=server.url, key="fake-key", region="local")
+        assert translator_service.translate_text("Hello", "es") is None
+        stats = server.stats()["translate"]
+        assert (stats.requests, stats.throttled) == (2, 2)
+
+        wrong_key = TranslatorService(max_retries=0, endpoint=server.url, key="other", region="local")
+        assert wrong_key.translate_text("Hello", "es") is None
+        assert server.stats()["translate"].requests == 2
+
+
+def test_async_services_run_against_fake_endpoints(server):
+    async def run():
+        vision_service = AsyncVisionService(polling=PollingStrategy(min_delay=0.01),
+                                            endpoint=server.url, key="fake-key")
+        speech_service = AsyncSpeechService(endpoint=server.url + "/cognitiveservices/v1",
+                                            key="fake-key", region="local")
+        async with vision_service, speech_service:
+            return await asyncio.gather(vision_service.extract_text(png_bytes()),
+                                        speech_service.text_to_speech("Hello there", "en-US"))
+
+    text, audio = asyncio.run(run())
+
+    assert text.startswith("Fake Azure OCR")
+    (channels, sample_rate, bits_per_sample), pcm = parse_wav(audio)
+    assert (channels, sample_rate, bits_per_sample) == (1, SAMPLE_RATE, 16)
+    assert len(pcm) == int(len("Hello there") * 0.06 * SAMPLE_RATE) * 2
+    assert server.stats()["tts"].characters == len("Hello there")
+
+
+def test_speech_service_synthesizes_over_rest(server):
+    speech_service = SpeechService(max_chunk_chars=25, endpoint=server.url + "/cognitiveservices/v1",
+                                   key="fake-key", region="local")
+    text = "First sentence here. Second sentence here."
+
+    _, pcm = parse_wav(speech_service.text_to_speech(text, "en-US"))
+    streamed = b"".join(speech_service.stream_text_to_speech("Hola", voice_name="es-ES-ElviraNeural"))
+
+    # Two chunks joined into one WAV
+    assert server.stats()["tts"].requests == 3
+    assert len(pcm) > int(len(text) * 0.9 * 0.06 * SAMPLE_RATE) * 2
+    assert streamed.startswith(b"RIFF")
+    assert len(streamed) == 44 + int(4 * 0.06 * SAMPLE_RATE) * 2
+    assert speech_service.text_to_speech("Hello", "xx-XX") is None
+
+
+def test_latency_distributions():
+    rng = random.Random(0)
+    assert Latency.parse("0.25").sample(rng) == 0.25
+    uniform = Latency.parse("uniform:0.2:0.05")
+    assert all(0.15 <= uniform.sample(rng) <= 0.25 for _ in range(100))
+    samples = sorted(Latency.parse("lognormal:0.2:0.5").sample(rng) for _ in range(2001))
+    assert 0.15 < samples[1000] < 0.25
+    with pytest.raises(ValueError):
+        Latency.parse("pareto:0.2")
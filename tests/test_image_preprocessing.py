@@ -0,0 +1,108 @@
+import os
+import sys
+import io
+import random
+from types import SimpleNamespace
+
+from azure.cognitiveservices.vision.computervision.models import Line, OperationStatusCodes, ReadResult
+from PIL import Image
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.image_preprocessing import ImagePreprocessor
+from backend.vision_service import VisionService
+
+
+def photo_bytes(width, height, orientation=None, image_format="JPEG"):
+    """Noisy color image standing in for a phone photo."""
+    rng = random.Random(0)
+    image = Image.new("RGB", (width, height))
+    image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                   for _ in range(width * height)])
+    output = io.BytesIO()
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        image.save(output, image_format, quality=95, exif=exif)
+    else:
+        image.save(output, image_format)
+    return output.getvalue()
+
+
+def test_downscales_rotates_and_converts_to_grayscale():
+    # Orientation 6: stored landscape, displayed rotated 90 degrees clockwise
+    original = photo_bytes(600, 300, orientation=6)
+    preprocessor = ImagePreprocessor(max_dimension=200)
+
+    result = preprocessor.process(original)
+    image = Image.open(io.BytesIO(result.data))
+
+    assert result.changed
+    assert image.size == (100, 200)
+    assert image.mode == "L"
+    assert image.format == "JPEG"
+    assert result.original_size == (600, 300)
+    assert result.bytes_saved > 0
+    assert preprocessor.stats.bytes_saved == result.bytes_saved
+
+
+def test_elongated_image_keeps_its_short_side_readable():
+    original = photo_bytes(4000, 100, image_format="PNG")
+
+    result = ImagePreprocessor(max_dimension=1000).process(original)
+    image = Image.open(io.BytesIO(result.data))
+
+    # 1000x25 would be rejected by the Read API, the downscale stops at 50px
+    assert result.changed
+    assert image.size == (2000, 50)
+    assert result.size == (2000, 50)
+
+
+def test_keeps_original_when_not_smaller():
+    original = photo_bytes(60, 60, image_format="PNG")
+    tiny = Image.new("L", (20, 20), 255)
+    tiny_output = io.BytesIO()
+    tiny.save(tiny_output, "PNG")
+
+    preprocessor = ImagePreprocessor(output_format="PNG")
+    small = preprocessor.process(tiny_output.getvalue())
+    assert not small.changed
+    assert small.data == tiny_output.getvalue()
+
+    result = ImagePreprocessor(output_format="PNG", grayscale=False).process(original)
+    assert len(result.data) <= len(original)
+    assert preprocessor.stats.unchanged == 1
+
+
+class FakeVisionClient:
+    def __init__(self):
+        self.uploads = []
+
+    def read_in_stream(self, image_data, raw=True):
+        self.uploads.append(image_data.read())
+        return SimpleNamespace(headers={"Operation-Location": "https://example/operations/op-1"})
+
+    def get_read_result(self, operation_id, raw=False):
+        page = ReadResult(page=1, angle=0, width=100, height=50, unit="pixel",
+                          lines=[Line(text="hello", bounding_box=[0, 0, 40, 0, 40, 10, 0, 10], words=[])])
+        result = SimpleNamespace(status=OperationStatusCodes.succeeded,
+                                 analyze_result=SimpleNamespace(read_results=[page]))
+        return SimpleNamespace(output=result, response=SimpleNamespace(headers={}))
+
+
+def test_vision_service_uploads_preprocessed_image(monkeypatch):
+    monkeypatch.setenv("AZURE_VISION_ENDPOINT", "https://example")
+    monkeypatch.setenv("AZURE_VISION_KEY", "test-key")
+    vision_service = VisionService(preprocessor=ImagePreprocessor(max_dimension=100))
+    vision_service.client = FakeVisionClient()
+    original = photo_bytes(400, 200)
+
+    assert vision_service.extract_text(io.BytesIO(original)) == "hello"
+    upload = vision_service.client.uploads[0]
+    assert len(upload) < len(original)
+    assert Image.open(io.BytesIO(upload)).size == (100, 50)
+
+    # Bytes Pillow cannot read are sent unchanged
+    assert vision_service.extract_text(io.BytesIO(b"not an image")) == "hello"
+    assert vision_service.client.uploads[1] == b"not an image"
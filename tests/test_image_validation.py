@@ -0,0 +1,64 @@
+import os
+import sys
+import io
+import hashlib
+import struct
+
+import pytest
+from PIL import Image
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils import inspect_image, validate_image
+
+
+def encode(image_format, size=(120, 45), **options):
+    output = io.BytesIO()
+    Image.new("RGB", size, (255, 255, 255)).save(output, image_format, **options)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("image_format,options", [
+    ("PNG", {}),
+    ("JPEG", {}),
+    ("JPEG", {"progressive": True, "exif": Image.Exif()}),
+    ("BMP", {}),
+])
+def test_reads_dimensions_from_header(image_format, options):
+    data = encode(image_format, **options)
+    image_info, error = inspect_image(memoryview(data))
+
+    assert error is None
+    assert image_info.format == image_format
+    assert (image_info.width, image_info.height) == (120, 45)
+    assert image_info.size == len(data)
+    assert image_info.sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_top_down_bmp_height_is_positive():
+    data = bytearray(encode("BMP"))
+    struct.pack_into("<i", data, 22, -45)
+    image_info, _ = inspect_image(data)
+    assert image_info.height == 45
+
+
+def test_rejects_oversized_payload_before_parsing():
+    image_info, error = inspect_image(b"\0" * 101, max_bytes=100)
+    assert image_info is None
+    assert error.startswith("Image size too large")
+
+
+def test_rejects_large_dimensions_unless_disabled():
+    data = encode("PNG", size=(300, 20))
+    assert inspect_image(data, max_dimension=256)[1] == \
+        "Image dimensions too large. Maximum dimension is 256px."
+    assert inspect_image(data, max_dimension=None)[0].width == 300
+
+
+def test_rejects_unsupported_and_truncated_images():
+    assert validate_image(encode("GIF")) == (
+        False, "Unsupported image format. Please use JPEG, PNG, or BMP.")
+    assert validate_image(encode("PNG")[:20]) == (False, "Invalid image file.")
+    assert validate_image(encode("JPEG")[:30]) == (False, "Invalid image file.")
+    assert validate_image(encode("JPEG")) == (True, None)
@@ -0,0 +1,75 @@
+import os
+import sys
+import io
+import urllib.request
+
+import pytest
+from PIL import Image
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import instrumentation
+from backend.fake_azure import FakeAzureServer, Latency
+from backend.instrumentation import MetricsRegistry, count, serve_metrics, span
+from backend.polling import PollingStrategy
+from backend.translator_service import TranslatorService
+from backend.vision_service import VisionService
+
+
+@pytest.fixture
+def registry():
+    yield instrumentation.enable(MetricsRegistry())
+    instrumentation.disable()
+
+
+def test_disabled_helpers_are_no_ops():
+    instrumentation.disable()
+    assert span("anything", service="x") is span("other")
+    count("cache_hits_total", cache="ocr")
+    assert instrumentation.get_registry() is None
+
+
+def test_renders_prometheus_text(registry):
+    with span("stage", service='say "hi"'):
+        pass
+    with pytest.raises(ValueError):
+        with span("stage", service='say "hi"'):
+            raise ValueError("boom")
+    count("cache_hits_total", 2, cache="ocr")
+
+    text = registry.render()
+    assert '# TYPE image_translator_cache_hits_total counter' in text
+    assert 'image_translator_cache_hits_total{cache="ocr"} 2' in text
+    assert '# TYPE image_translator_stage_seconds histogram' in text
+    assert 'image_translator_stage_seconds_bucket{service="say \\"hi\\"",le="+Inf"} 2' in text
+    assert 'image_translator_stage_seconds_count{service="say \\"hi\\""} 2' in text
+    assert registry.counter("stage_failures_total", service='say "hi"') == 1
+
+
+def test_services_record_spans_and_traffic(registry):
+    output = io.BytesIO()
+    Image.new("RGB", (200, 100), "white").save(output, "PNG")
+
+    with FakeAzureServer(read_latency=Latency(0.05)) as server:
+        vision_service = VisionService(polling=PollingStrategy(min_delay=0.01),
+                                       endpoint=server.url, key="fake-key")
+        translator_service = TranslatorService(endpoint=server.url, key="fake-key", region="local")
+        assert vision_service.extract_text(io.BytesIO(output.getvalue())) is not None
+        assert translator_service.translate_text("Hello", "es") == "[es] Hello"
+        polls = server.stats()["read-result"].requests
+
+        metrics_server = serve_metrics(0, host="127.0.0.1")
+        try:
+            url = f"http://127.0.0.1:{metrics_server.server_address[1]}/metrics"
+            exported = urllib.request.urlopen(url).read().decode("utf-8")
+        finally:
+            metrics_server.shutdown()
+
+    assert registry.histogram("vision_read_submit_seconds")[0] == 1
+    assert registry.histogram("vision_read_poll_seconds")[0] == polls
+    assert registry.histogram("translator_translate_text_seconds")[0] == 1
+    assert registry.histogram("translator_request_seconds")[0] == 1
+    assert registry.counter("bytes_sent_total", service="vision") == len(output.getvalue())
+    assert registry.counter("bytes_received_total", service="translator") > 0
+    assert "image_translator_vision_read_poll_seconds_count" in exported
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.language_catalog import LanguageCatalog
+from backend.utils import get_language_name
+
+LANGUAGES = {
+    "translation": {
+        "es": {"name": "Spanish", "nativeName": "Español", "dir": "ltr"},
+        "ar": {"name": "Arabic", "nativeName": "العربية", "dir": "rtl"},
+    }
+}
+
+
+class FakeSession:
+    """Answers /languages like the Translator service, honouring If-None-Match."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return SimpleNamespace(status_code=304, headers={}, raise_for_status=lambda: None)
+        return SimpleNamespace(status_code=200, headers={"ETag": '"v1"'},
+                               json=lambda: LANGUAGES, raise_for_status=lambda: None)
+
+
+def test_catalog_fetches_once_and_builds_indexes():
+    session = FakeSession()
+    catalog = LanguageCatalog(session=session)
+
+    assert catalog.get_languages() == LANGUAGES["translation"]
+    assert catalog.get_languages() == LANGUAGES["translation"]
+    assert len(session.requests) == 1
+    assert catalog.name("ar") == "Arabic"
+    assert catalog.code("español") == "es"
+    assert catalog.default_voice("es") == "es-ES-ElviraNeural"
+    assert get_language_name("es", catalog) == "Spanish"
+    assert get_language_name("xx", catalog) == "Unknown"
+
+
+def test_persisted_catalog_is_revalidated_with_etag(tmp_path):
+    cache_path = str(tmp_path / "languages.json")
+    LanguageCatalog(session=FakeSession(), cache_path=cache_path).refresh()
+
+    session = FakeSession()
+    catalog = LanguageCatalog(session=session, cache_path=cache_path, max_age_seconds=0)
+
+    assert catalog.get_languages() == LANGUAGES["translation"]
+    for _ in range(100):
+        if session.requests:
+            break
+        time.sleep(0.01)
+    assert session.requests == [{"If-None-Match": '"v1"'}]
+
+
+def test_refresh_swaps_catalog_and_indexes_together():
+    catalog = LanguageCatalog(session=FakeSession())
+    catalog.refresh()
+    seen_during_fetch = []
+
+    class NewVersionSession:
+        def get(self, url, params=None, headers=None, timeout=None):
+            # The old version stays whole until the new one is swapped in
+            seen_during_fetch.append((catalog._etag, catalog.name("fr"), catalog.code("spanish")))
+            languages = {"translation": {"fr": {"name": "French", "nativeName": "Français"}}}
+            return SimpleNamespace(status_code=200, headers={"ETag": '"v2"'},
+                                   json=lambda: languages, raise_for_status=lambda: None)
+
+    catalog.session = NewVersionSession()
+    assert catalog.refresh()
+
+    assert seen_during_fetch == [('"v1"', "French", "es")]
+    assert catalog._etag == '"v2"'
+    assert list(catalog.get_languages()) == ["fr"]
+    assert catalog.code("français") == "fr"
+    assert catalog.code("español") is None
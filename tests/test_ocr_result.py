@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ocr_result import OcrResult, polygon_box
+
+
+ANALYZE_RESULT = {"readResults": [{
+    "page": 1, "angle": 0.5, "width": 640, "height": 480, "unit": "pixel",
+    "lines": [
+        {"text": "Grüße aus Köln", "boundingBox": [10, 20, 210, 22, 209, 52, 9, 50],
+         "words": [{"text": "Grüße", "boundingBox": [10, 20, 80, 20, 80, 50, 10, 50], "confidence": 0.99},
+                   {"text": "aus", "boundingBox": [90, 20, 120, 20, 120, 50, 90, 50], "confidence": 0.72},
+                   {"text": "Köln", "boundingBox": [130, 20, 210, 20, 210, 50, 130, 50], "confidence": 0.95}]},
+        {"text": "2024", "boundingBox": [10, 70, 60, 70, 60, 90, 10, 90], "words": []},
+    ]
+}]}
+
+
+def test_builds_boxes_confidences_and_text():
+    result = OcrResult.from_rest(ANALYZE_RESULT)
+    first, second = result.pages[0].lines
+
+    assert result.text == "Grüße aus Köln\n2024"
+    assert first.box == (9, 20, 210, 52)
+    assert first.confidence == 0.72
+    assert second.confidence is None
+    assert polygon_box([0, 0, 4, 0, 4, 2, 0, 2], dx=10, dy=5) == (10, 5, 14, 7)
+
+
+def test_json_round_trip():
+    result = OcrResult.from_rest(ANALYZE_RESULT)
+    data = result.to_json()
+
+    assert OcrResult.from_json(data) == result
+    assert "Grüße".encode("utf-8") in data
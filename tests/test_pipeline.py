@@ -0,0 +1,174 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.pipeline import CANCELLED, FAILED, SKIPPED, SUCCEEDED, Pipeline, PipelineRun, Stage
+
+
+class FakeVision:
+    def __init__(self, text="hello"):
+        self.text = text
+
+    def extract_text(self, image_stream, image_info=None):
+        assert image_stream.read() == b"image"
+        return self.text
+
+
+class FakeTranslator:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.started = threading.Event()
+
+    def translate_text(self, text, target_language, source_language=None):
+        self.started.set()
+        time.sleep(self.delay)
+        if self.fail:
+            return None
+        return f"{text}-{target_language}"
+
+
+class FakeSpeech:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.warmed = None
+
+    def warm_up(self, languages):
+        self.warmed = languages
+
+    def text_to_speech(self, text, language):
+        self.calls.append((text, language))
+        time.sleep(self.delay)
+        return f"{language}:{text}".encode("utf-8")
+
+
+def test_run_produces_all_outputs():
+    pipeline = Pipeline(FakeVision(), FakeTranslator(), FakeSpeech())
+    result = pipeline.run(b"image", "es", "es-ES", "en-US")
+    pipeline.shutdown()
+
+    assert result.extracted_text == "hello"
+    assert result.translated_text == "hello-es"
+    assert result.original_audio == b"en-US:hello"
+    assert result.translated_audio == b"es-ES:hello-es"
+    assert all(timing.status == SUCCEEDED for timing in result.timings.values())
+    assert all(timing.duration is not None for timing in result.timings.values())
+
+
+def test_translation_and_original_audio_overlap():
+    translator = FakeTranslator(delay=0.3)
+    speech = FakeSpeech(delay=0.3)
+    pipeline = Pipeline(FakeVision(), translator, speech)
+    result = pipeline.run(b"image", "es", target_speech_language=None)
+    pipeline.shutdown()
+
+    translation = result.timings[Pipeline.TRANSLATION]
+    original_audio = result.timings[Pipeline.ORIGINAL_AUDIO]
+    assert translation.started < original_audio.finished
+    assert original_audio.started < translation.finished
+    assert Pipeline.TRANSLATED_AUDIO not in result.timings
+
+
+def test_failed_stage_skips_dependents():
+    speech = FakeSpeech()
+    pipeline = Pipeline(FakeVision(), FakeTranslator(fail=True), speech)
+    result = pipeline.run(b"image", "es", "es-ES", "en-US")
+    pipeline.shutdown()
+
+    assert result.translated_text is None
+    assert result.original_audio == b"en-US:hello"
+    assert result.timings[Pipeline.TRANSLATION].status == FAILED
+    assert result.timings[Pipeline.TRANSLATED_AUDIO].status == SKIPPED
+    assert speech.calls == [("hello", "en-US")]
+
+
+def test_as_completed_yields_in_finish_order():
+    pipeline = Pipeline(FakeVision(), FakeTranslator(delay=0.2), FakeSpeech())
+    run = pipeline.start(b"image", "es", "es-ES", "en-US")
+    names = [name for name, _ in run.as_completed()]
+    pipeline.shutdown()
+
+    assert names == [Pipeline.OCR, Pipeline.ORIGINAL_AUDIO,
+                     Pipeline.TRANSLATION, Pipeline.TRANSLATED_AUDIO]
+
+
+def test_cancel_running_stage_skips_dependents():
+    translator = FakeTranslator(delay=0.5)
+    pipeline = Pipeline(FakeVision(), translator, FakeSpeech())
+    run = pipeline.start(b"image", "es", "es-ES", "en-US")
+
+    threading.Thread(target=lambda: translator.started.wait() and run.cancel(Pipeline.TRANSLATION)).start()
+    started = time.monotonic()
+    results = run.wait()
+    elapsed = time.monotonic() - started
+    pipeline.shutdown()
+
+    assert elapsed < 0.5
+    assert Pipeline.TRANSLATION not in results
+    assert results[Pipeline.ORIGINAL_AUDIO] == b"en-US:hello"
+    assert run.timings[Pipeline.TRANSLATION].status == CANCELLED
+    assert run.timings[Pipeline.TRANSLATED_AUDIO].status == SKIPPED
+
+
+def test_cancel_whole_run_before_start():
+    pipeline = Pipeline(FakeVision(), FakeTranslator(), FakeSpeech())
+    run = pipeline.start(b"image", "es", "es-ES", "en-US")
+    run.cancel()
+    assert run.wait() == {}
+    assert all(timing.status == CANCELLED for timing in run.timings.values())
+    pipeline.shutdown()
+
+
+def test_stage_exception_counts_as_failure():
+    def boom(results):
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        run = PipelineRun([
+            Stage("a", boom),
+            Stage("b", lambda results: "b", depends_on=("a",)),
+            Stage("c", lambda results: "c"),
+        ], executor)
+        assert run.wait() == {"c": "c"}
+    assert run.timings["a"].status == FAILED
+    assert run.timings["b"].status == SKIPPED
+
+
+def test_warm_up_runs_in_background_and_tolerates_failures():
+    vision = FakeVision()
+    speech = FakeSpeech()
+
+    def failing_warm_up():
+        raise RuntimeError("no network")
+
+    vision.warm_up = failing_warm_up
+    pipeline = Pipeline(vision, FakeTranslator(), speech)
+    futures = pipeline.warm_up(speech_languages=("es-ES",))
+    for future in futures:
+        future.result(timeout=5)
+    pipeline.shutdown()
+
+    # The translator fake has no warm_up and is left alone
+    assert len(futures) == 2
+    assert speech.warmed == ("es-ES",)
+
+
+def test_image_without_text_skips_translation_and_speech():
+    translator = FakeTranslator()
+    speech = FakeSpeech()
+    pipeline = Pipeline(FakeVision(text=" \n"), translator, speech)
+    result = pipeline.run(b"image", "es", "es-ES", "en-US")
+    pipeline.shutdown()
+
+    assert result.extracted_text is None
+    assert result.timings[Pipeline.OCR].status == FAILED
+    assert result.timings[Pipeline.TRANSLATION].status == SKIPPED
+    assert result.timings[Pipeline.ORIGINAL_AUDIO].status == SKIPPED
+    assert not translator.started.is_set()
+    assert speech.calls == []
@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.polling import PollingStrategy, parse_retry_after
+
+
+def test_poll_stops_when_operation_completes():
+    polling = PollingStrategy(min_delay=0.001, max_delay=0.01, deadline=5.0)
+    states = iter(["running", "running", "succeeded"])
+
+    result, stats = polling.poll(lambda: (next(states), None), lambda state: state == "running")
+
+    assert result == "succeeded"
+    assert stats.polls == 3
+    assert not stats.timed_out
+    assert polling.estimate_completion(0) is not None
+
+
+def test_poll_gives_up_at_deadline():
+    polling = PollingStrategy(min_delay=0.01, max_delay=0.02, deadline=0.05)
+
+    result, stats = polling.poll(lambda: ("running", None), lambda state: state == "running")
+
+    assert result == "running"
+    assert stats.timed_out
+    assert stats.wall_time < 0.5
+    assert polling.timeouts == 1
+
+
+def test_retry_after_overrides_backoff():
+    polling = PollingStrategy(min_delay=0.001, max_delay=0.002, jitter=0.0, deadline=5.0)
+    states = iter([("running", 0.05), ("succeeded", None)])
+
+    _, stats = polling.poll(lambda: next(states), lambda state: state == "running")
+
+    assert stats.wall_time >= 0.05
+
+
+def test_initial_delay_learns_from_observations():
+    polling = PollingStrategy(min_delay=0.01, max_delay=5.0, first_poll_fraction=0.5)
+    assert polling.initial_delay(1024 * 1024) == 0.01
+
+    polling.observe(1024 * 1024, 2.0)
+
+    assert abs(polling.initial_delay(1024 * 1024) - 1.0) < 1e-9
+    assert polling.initial_delay(3 * 1024 * 1024) > polling.initial_delay(1024 * 1024)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
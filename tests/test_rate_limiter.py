@@ -0,0 +1,213 @@
+import os
+import sys
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.async_services import AsyncTranslatorService
+from backend.rate_limiter import (ConcurrencyLimiter, ServiceLimiter, TokenBucket,
+                                  limiter_from_env)
+from backend.translator_service import TranslatorService
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # Two tokens come from the burst, two more take 1/20s each
+    assert 0.09 <= time.monotonic() - started < 0.5
+
+
+def test_token_bucket_serves_callers_in_arrival_order():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    order = []
+
+    def worker(index):
+        bucket.acquire()
+        order.append(index)
+
+    threads = []
+    for index in range(5):
+        thread = threading.Thread(target=worker, args=(index,))
+        thread.start()
+        threads.append(thread)
+        # Let each thread join the queue before the next one arrives
+        while bucket.queue_depth < index + 1:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_token_bucket_large_request_waits_for_full_bucket():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.acquire(10)
+    waited = bucket.acquire(25)
+    assert waited >= 0.09
+    # The oversized request left the bucket in debt
+    with pytest.raises(TimeoutError):
+        bucket.acquire(1, timeout=0.05)
+
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=1000)
+    bucket.pause(0.1)
+    assert bucket.acquire() >= 0.09
+
+
+def test_concurrency_limiter_bounds_holders():
+    limiter = ConcurrencyLimiter(2)
+    limiter.acquire()
+    limiter.acquire()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.02)
+    assert limiter.queue_depth == 0
+
+    threading.Timer(0.05, limiter.release).start()
+    assert limiter.acquire(timeout=1.0) >= 0.04
+    assert limiter.in_use == 2
+
+
+def test_service_limiter_stats_and_queue_depth():
+    limiter = ServiceLimiter("speech", max_concurrent=1)
+    entered = threading.Event()
+    leave = threading.Event()
+
+    def hold():
+        with limiter.limit():
+            entered.set()
+            leave.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait()
+    waiter = threading.Thread(target=lambda: limiter.limit().__enter__())
+    waiter.start()
+    while limiter.queue_depth == 0:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    leave.set()
+    holder.join()
+    waiter.join()
+
+    assert limiter.queue_depth == 0
+    assert limiter.stats.acquired == 2
+    assert limiter.stats.waited == 1
+    assert limiter.stats.max_wait >= 0.04
+
+
+def test_limiter_from_env(monkeypatch):
+    assert limiter_from_env("vision") is None
+    monkeypatch.setenv("TRANSLATOR_CHARACTERS_PER_MINUTE", "6000")
+    limiter = limiter_from_env("translator")
+    assert limiter.characters.rate == 100
+    assert limiter.requests is None and limiter.concurrency is None
+
+
+def test_translator_requeues_throttled_requests(monkeypatch):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    limiter = ServiceLimiter("translator", requests_per_second=100)
+    translator_service = TranslatorService(max_retries=2, rate_limiter=limiter)
+    responses = [
+        SimpleNamespace(status_code=429, headers={"Retry-After": "0.05"}),
+        SimpleNamespace(status_code=200, headers={}, raise_for_status=lambda: None,
+                        json=lambda: [{"translations": [{"text": "hola", "to": "es"}]}]),
+    ]
+    translator_service.session.post = lambda *args, **kwargs: responses.pop(0)
+
+    started = time.monotonic()
+    assert translator_service.translate_text("hello", "es") == "hola"
+    assert time.monotonic() - started >= 0.04
+    assert limiter.stats.throttled == 1
+    assert limiter.stats.acquired == 2
+
+
+def test_translator_retries_throttled_requests_in_one_layer(monkeypatch):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+
+    def session_retry(rate_limiter):
+        session = TranslatorService(rate_limiter=rate_limiter).session
+        return session.get_adapter("https://").max_retries
+
+    # The limiter requeues 429s, so the session only retries server errors
+    assert 429 not in session_retry(ServiceLimiter("translator", requests_per_second=100)).status_forcelist
+    assert 429 in session_retry(None).status_forcelist
+    assert 503 in session_retry(ServiceLimiter("translator", requests_per_second=100)).status_forcelist
+
+
+def test_async_translator_counts_characters_per_target(monkeypatch):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=[{"translations": [
+            {"text": "hola", "to": "es"}, {"text": "salut", "to": "fr"}]}])
+
+    limiter = ServiceLimiter("translator", characters_per_minute=600)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            translator_service = AsyncTranslatorService(client, rate_limiter=limiter)
+            return await translator_service.translate_multi("hello", ["es", "fr"])
+
+    assert asyncio.run(run()) == {"es": "hola", "fr": "salut"}
+    assert len(calls) == 2
+    assert limiter.stats.throttled == 1
+    # Both attempts spent 5 characters for each of the 2 targets
+    assert limiter.characters._tokens <= 600 - 20 + 5
+
+
+def test_cancelled_async_waiter_does_not_leak_the_slot():
+    limiter = ServiceLimiter("speech", max_concurrent=1)
+
+    async def run():
+        await limiter.acquire_async()
+        waiter = asyncio.create_task(limiter.acquire_async())
+        await asyncio.sleep(0.05)
+        assert limiter.queue_depth == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        async with limiter.limit_async():
+            # Released from another thread while a coroutine waits
+            threading.Timer(0.05, limiter.release).start()
+            await asyncio.wait_for(limiter.acquire_async(), timeout=2)
+
+    asyncio.run(run())
+    assert limiter.concurrency.in_use == 0
+    assert limiter.queue_depth == 0
+
+
+def test_async_waiters_share_the_token_bucket_in_order():
+    limiter = ServiceLimiter("vision", requests_per_second=20)
+    limiter.requests._tokens = 0
+    order = []
+
+    async def call(index):
+        async with limiter.limit_async():
+            order.append(index)
+
+    async def run():
+        await asyncio.gather(*(call(index) for index in range(5)))
+
+    started = time.monotonic()
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3, 4]
+    assert time.monotonic() - started >= 0.2
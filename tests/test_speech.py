@@ -0,0 +1,209 @@
+import os
+import sys
+import ctypes
+from types import SimpleNamespace
+
+import azure.cognitiveservices.speech as speechsdk
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.audio import parse_wav, wav_header
+from backend.audio_cache import AudioCache
+from backend.speech_service import SpeechService
+
+
+def fake_wav(text):
+    pcm = text.encode("utf-8")
+    return wav_header(len(pcm)) + pcm
+
+
+class FakeSynthesizer:
+    """Stand-in for SpeechSynthesizer returning audio derived from the request."""
+
+    created = []
+
+    def __init__(self, speech_config=None, audio_config=None):
+        self.speech_config = speech_config
+        self.audio_config = audio_config
+        FakeSynthesizer.created.append(self)
+
+    def speak_text_async(self, text):
+        result = SimpleNamespace(
+            reason=speechsdk.ResultReason.SynthesizingAudioCompleted,
+            audio_data=fake_wav(text)
+        )
+        return SimpleNamespace(get=lambda: result)
+
+    def start_speaking_text_async(self, text):
+        result = SimpleNamespace(
+            reason=speechsdk.ResultReason.SynthesizingAudioStarted,
+            pcm=b"\x01\x00" * len(text)
+        )
+        return SimpleNamespace(get=lambda: result)
+
+    def stop_speaking(self):
+        self.stopped = True
+
+
+class FakeAudioDataStream:
+    """Stand-in for AudioDataStream serving the result's raw PCM."""
+
+    def __init__(self, result):
+        self.remaining = result.pcm
+        self.status = speechsdk.StreamStatus.AllData
+
+    def read_data(self, audio_buffer):
+        size = min(len(audio_buffer), len(self.remaining))
+        data, self.remaining = self.remaining[:size], self.remaining[size:]
+        # Fill the caller's buffer in place the way the native SDK does
+        ctypes.memmove(audio_buffer, data, size)
+        return size
+
+
+class FakeConnection:
+    """Stand-in for speechsdk.Connection recording pre-connects."""
+
+    opened = 0
+
+    @classmethod
+    def from_speech_synthesizer(cls, synthesizer):
+        return cls()
+
+    def open(self, for_continuous_recognition):
+        FakeConnection.opened += 1
+
+    def close(self):
+        pass
+
+
+def make_service(monkeypatch, **kwargs):
+    monkeypatch.setenv("AZURE_SPEECH_KEY", "test-key")
+    monkeypatch.setenv("AZURE_SPEECH_REGION", "westeurope")
+    FakeSynthesizer.created = []
+    FakeConnection.opened = 0
+    monkeypatch.setattr(speechsdk, "SpeechSynthesizer", FakeSynthesizer)
+    monkeypatch.setattr(speechsdk, "Connection", FakeConnection)
+    monkeypatch.setattr(speechsdk, "AudioDataStream", FakeAudioDataStream)
+    return SpeechService(**kwargs)
+
+
+def test_text_to_speech_stays_in_memory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    speech_service = make_service(monkeypatch)
+
+    audio = speech_service.text_to_speech("Hello", "en-US")
+
+    assert audio == fake_wav("Hello")
+    assert FakeSynthesizer.created[0].audio_config is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_text_to_speech_with_voice(monkeypatch):
+    speech_service = make_service(monkeypatch)
+
+    assert speech_service.text_to_speech_with_voice("Hola", "es-ES-ElviraNeural") == fake_wav("Hola")
+    assert speech_service.verify_service()
+
+
+def test_synthesizers_are_reused_per_voice(monkeypatch):
+    speech_service = make_service(monkeypatch)
+
+    speech_service.text_to_speech("one", "en-US")
+    speech_service.text_to_speech("two", "en-US")
+    speech_service.text_to_speech_with_voice("tres", "es-ES-ElviraNeural")
+
+    assert len(FakeSynthesizer.created) == 2
+    assert FakeConnection.opened == 2
+    assert speech_service.synthesizer_pool.reused == 1
+    languages = {synthesizer.speech_config.speech_synthesis_language
+                 for synthesizer in FakeSynthesizer.created}
+    assert "en-US" in languages
+
+
+def test_pool_is_bounded_and_evicts_idle(monkeypatch):
+    speech_service = make_service(monkeypatch, pool_size=1, max_idle_seconds=0.0)
+    pool = speech_service.synthesizer_pool
+
+    speech_service.text_to_speech("one", "en-US")
+    speech_service.text_to_speech("dos", "es-ES")
+
+    assert pool.size == 1
+    assert pool.evicted == 1
+    assert pool.evict_idle() == 1
+    assert pool.size == 0
+
+
+def test_stream_text_to_speech_yields_playable_chunks(monkeypatch):
+    speech_service = make_service(monkeypatch)
+
+    chunks = list(speech_service.stream_text_to_speech("Hello there", "en-US", chunk_size=8))
+
+    assert chunks[0].startswith(b"RIFF")
+    assert len(chunks[0]) == 44
+    assert all(len(chunk) <= 8 for chunk in chunks[1:])
+    assert b"".join(chunks[1:]) == b"\x01\x00" * len("Hello there")
+
+
+def test_stream_stops_synthesis_when_abandoned(monkeypatch):
+    speech_service = make_service(monkeypatch)
+
+    stream = speech_service.stream_text_to_speech("Hello there", "en-US", chunk_size=4)
+    next(stream)
+    next(stream)
+    stream.close()
+
+    assert FakeSynthesizer.created[0].stopped
+    assert speech_service.synthesizer_pool.size == 0
+
+
+def test_long_text_is_synthesized_in_chunks_and_stitched(monkeypatch):
+    speech_service = make_service(monkeypatch, max_chunk_chars=20, max_concurrency=3)
+    text = "First sentence here. Second one follows! Is this the third? Yes."
+
+    audio = speech_service.text_to_speech(text, "en-US")
+
+    audio_format, pcm = parse_wav(audio)
+    assert audio_format == (1, 24000, 16)
+    assert bytes(pcm) == b"".join(
+        chunk.encode("utf-8")
+        for chunk in ["First sentence here.", "Second one follows!", "Is this the third?", "Yes."]
+    )
+    assert len(FakeSynthesizer.created) <= 3
+
+
+def test_cached_audio_skips_synthesis(monkeypatch):
+    speech_service = make_service(monkeypatch, cache=AudioCache())
+
+    first = speech_service.text_to_speech("Testing speech service.", "en-US")
+    second = speech_service.text_to_speech("Testing  speech service.", "en-US")
+
+    assert first == second
+    assert speech_service.synthesizer_pool.created == 1
+    assert speech_service.synthesizer_pool.reused == 0
+    assert speech_service.cache.stats.hits == 1
+
+
+def test_warm_up_preconnects_the_first_synthesizer(monkeypatch):
+    speech_service = make_service(monkeypatch)
+    assert speech_service._synthesizer_pool is None
+
+    speech_service.warm_up(["en-US"])
+    assert FakeConnection.opened == 1
+    speech_service.text_to_speech("Hello", "en-US")
+
+    assert speech_service.synthesizer_pool.created == 1
+    assert speech_service.synthesizer_pool.reused == 1
+
+
+def test_stream_serves_cached_audio_from_disk(monkeypatch, tmp_path):
+    cache = AudioCache(str(tmp_path / "tts"), memory_max_entry_bytes=4)
+    speech_service = make_service(monkeypatch, cache=cache)
+    audio = speech_service.text_to_speech("Hello there", "en-US")
+
+    chunks = list(speech_service.stream_text_to_speech("Hello there", "en-US", chunk_size=16))
+
+    assert b"".join(chunks) == audio
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert len(FakeSynthesizer.created) == 1
+    assert speech_service.synthesizer_pool.size == 1
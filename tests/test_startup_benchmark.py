@@ -0,0 +1,39 @@
+import os
+import sys
+import json
+import subprocess
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.startup_benchmark import HEAVY_MODULES, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_services_defers_sdks():
+    code = ("import sys, json, backend.vision_service, backend.translator_service, "
+            "backend.speech_service, backend.pipeline, backend.image_preprocessing, backend.utils; "
+            f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    assert json.loads(completed.stdout) == []
+
+
+def test_importing_async_services_defers_httpx():
+    code = "import sys, backend.async_services; print('httpx' in sys.modules)"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "False"
+
+
+def test_startup_benchmark_writes_results(tmp_path):
+    output = tmp_path / "startup.json"
+    assert main(["translator", "-r", "1", "-o", str(output)]) == 0
+
+    services = json.loads(output.read_text())["services"]
+    assert set(services) == {"translator/cold", "translator/warm"}
+    assert services["translator/cold"]["failed"] == 0
+    assert services["translator/cold"]["eager_imports"] == []
+    assert "warm_up" in services["translator/warm"]["median"]
+    assert "warm_up" not in services["translator/cold"]["median"]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.audio import concat_wav, parse_wav, wav_header
+from backend.text_segmentation import chunk_text, segment_text, split_sentences
+
+
+def test_split_sentences_handles_abbreviations():
+    sentences = split_sentences("Hello Mr. Smith. How are you?\nFine", "en-US")
+
+    assert sentences == ["Hello Mr. Smith.", "How are you?", "Fine"]
+
+
+def test_split_sentences_handles_arabic_punctuation():
+    sentences = split_sentences("مرحبا بكم؟ هذا نص. شكرا", "ar-SA")
+
+    assert sentences == ["مرحبا بكم؟", "هذا نص.", "شكرا"]
+
+
+def test_segment_text_keeps_wrapped_sentences_and_separators():
+    text = "Title\n\nDr. Lee wrote this\nlong line. Thanks!  "
+    segments = segment_text(text, "en")
+
+    assert segments == [("Title", "\n\n"), ("Dr. Lee wrote this\nlong line.", " "), ("Thanks!", "  ")]
+    assert "".join(segment + separator for segment, separator in segments) == text
+
+
+def test_chunk_text_respects_limit():
+    text = "Short one. " + "word " * 30 + "end. Last, clause, here."
+
+    chunks = chunk_text(text, 25, "en-US")
+
+    assert all(len(chunk) <= 25 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_concat_wav_rewrites_header():
+    first = wav_header(4) + b"\x01\x02\x03\x04"
+    second = wav_header(2) + b"\x05\x06"
+
+    joined = concat_wav([first, second])
+
+    audio_format, pcm = parse_wav(joined)
+    assert audio_format == (1, 24000, 16)
+    assert bytes(pcm) == b"\x01\x02\x03\x04\x05\x06"
+    assert joined[4:8] == (36 + 6).to_bytes(4, "little")
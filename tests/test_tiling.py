@@ -0,0 +1,99 @@
+import os
+import sys
+import io
+import threading
+from types import SimpleNamespace
+
+from azure.cognitiveservices.vision.computervision.models import Line, OperationStatusCodes, ReadResult
+from PIL import Image, ImageStat
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ocr_result import OcrLine
+from backend.tiling import merge_tile_lines, reading_order, tile_boxes
+from backend.vision_service import VisionService
+
+
+def test_tiles_cover_image_with_overlap():
+    boxes = tile_boxes(5000, 3000, tile_size=2048, overlap=256)
+
+    assert len(boxes) == 6
+    assert all(right - left <= 2048 and bottom - top <= 2048 for left, top, right, bottom in boxes)
+    assert max(right for _, _, right, _ in boxes) == 5000
+    assert max(bottom for _, _, _, bottom in boxes) == 3000
+    lefts = sorted({left for left, _, _, _ in boxes})
+    assert all(next_left - left <= 2048 - 256 for left, next_left in zip(lefts, lefts[1:]))
+    assert tile_boxes(100, 50) == [(0, 0, 100, 50)]
+
+
+def test_merge_keeps_longest_reading_of_duplicated_lines():
+    left_tile = [OcrLine("Title", (10, 10, 200, 40)), OcrLine("the quick br", (1700, 100, 2048, 130))]
+    right_tile = [OcrLine("the quick brown fox", (1700, 101, 2300, 131)),
+                  OcrLine("Footer", (1800, 900, 1900, 930))]
+
+    merged = merge_tile_lines([left_tile, right_tile])
+
+    assert [line.text for line in merged] == ["Title", "the quick brown fox", "Footer"]
+
+
+def test_reading_order_groups_rows():
+    lines = [OcrLine("right", (500, 102, 600, 122)), OcrLine("below", (0, 200, 100, 220)),
+             OcrLine("left", (0, 100, 100, 120))]
+    assert [line.text for line in reading_order(lines)] == ["left", "right", "below"]
+
+
+class FakeTilingClient:
+    """Answers each tile depending on which half of the test image it shows."""
+
+    def __init__(self):
+        self.uploads = []
+        self.operations = {}
+        self.lock = threading.Lock()
+
+    def read_in_stream(self, image_data, raw=True):
+        tile = Image.open(image_data)
+        # The left tile is mostly black, the right one mostly white
+        is_left = ImageStat.Stat(tile).mean[0] < 128
+        if is_left:
+            lines = [("Hello", [100, 100, 300, 100, 300, 140, 100, 140]),
+                     ("cut wor", [1800, 100, 2048, 100, 2048, 140, 1800, 140])]
+        else:
+            lines = [("cut world", [848, 100, 1248, 100, 1248, 140, 848, 140]),
+                     ("Bye", [500, 600, 600, 600, 600, 640, 500, 640])]
+        with self.lock:
+            operation_id = f"op-{len(self.operations)}"
+            self.operations[operation_id] = lines
+            self.uploads.append(tile.size)
+        return SimpleNamespace(headers={"Operation-Location": f"https://example/operations/{operation_id}"})
+
+    def get_read_result(self, operation_id, raw=False):
+        page = ReadResult(page=1, angle=0, width=2048, height=1000, unit="pixel",
+                          lines=[Line(text=text, bounding_box=box, words=[])
+                                 for text, box in self.operations[operation_id]])
+        result = SimpleNamespace(status=OperationStatusCodes.succeeded,
+                                 analyze_result=SimpleNamespace(read_results=[page]))
+        return SimpleNamespace(output=result, response=SimpleNamespace(headers={}))
+
+
+def test_vision_service_reads_large_images_as_tiles(monkeypatch):
+    monkeypatch.setenv("AZURE_VISION_ENDPOINT", "https://example")
+    monkeypatch.setenv("AZURE_VISION_KEY", "test-key")
+    vision_service = VisionService(tile_threshold=2500)
+    vision_service.client = FakeTilingClient()
+
+    image = Image.new("L", (3000, 1000), 255)
+    image.paste(0, (0, 0, 1500, 1000))
+    output = io.BytesIO()
+    image.save(output, "PNG")
+
+    text = vision_service.extract_text(io.BytesIO(output.getvalue()))
+
+    assert text == "Hello\ncut world\nBye"
+    assert vision_service.client.uploads == [(2048, 1000), (2048, 1000)]
+
+    result = vision_service.analyze_text(io.BytesIO(output.getvalue()), tiled=True)
+    page = result.pages[0]
+    assert (page.width, page.height) == (3000, 1000)
+    assert [line.box for line in page.lines] == [(100, 100, 300, 140), (1800, 100, 2200, 140),
+                                                 (1452, 600, 1552, 640)]
@@ -67,13 +67,15 @@ def test_vision_and_translation():
             'Arabic': 'ar'
         }
         
-        # Translate to each target language
+        # Translate to every target language in a single request
+        print(f"\nTranslating to {', '.join(target_languages)}...")
+        translations = translator_service.translate_multi(
+            extracted_text,
+            list(target_languages.values())
+        ) or {}
+
         for language_name, language_code in target_languages.items():
-            print(f"\nTranslating to {language_name}...")
-            translated_text = translator_service.translate_text(
-                extracted_text,
-                language_code
-            )
+            translated_text = translations.get(language_code)
             
             if translated_text:
                 print(f"\n{language_name} Translation:")
@@ -0,0 +1,58 @@
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.translation_memory import TranslationMemory
+from backend.translator_service import TranslatorService
+
+
+def make_service(monkeypatch, translation_memory):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    translator_service = TranslatorService(translation_memory=translation_memory)
+    translator_service.sent_requests = []
+
+    def fake_send(texts, targets, source_language=None):
+        translator_service.sent_requests.append(texts)
+        return [{"translations": [{"text": text.upper(), "to": target} for target in targets]}
+                for text in texts]
+
+    translator_service._send_translate_request = fake_send
+    return translator_service
+
+
+def test_exact_and_normalized_matches():
+    memory = TranslationMemory()
+    memory.store({"Opening  hours": "Horario"}, "en", "es")
+
+    assert memory.lookup(["Opening  hours"], "en", "es") == {"Opening  hours": "Horario"}
+    assert memory.lookup(["Opening hours"], "en", "es") == {"Opening hours": "Horario"}
+    assert memory.lookup(["Opening hours"], "en", "fr") == {}
+    assert memory.stats.exact_hits == 1
+    assert memory.stats.normalized_hits == 1
+    assert memory.stats.misses == 1
+
+
+def test_expired_and_outdated_entries_are_ignored(tmp_path):
+    path = str(tmp_path / "tm.sqlite3")
+    TranslationMemory(path, version="1").store({"Menu": "Menú"}, "en", "es")
+
+    assert TranslationMemory(path, version="2").lookup(["Menu"], "en", "es") == {}
+    assert TranslationMemory(path, ttl_seconds=-1).lookup(["Menu"], "en", "es") == {}
+    assert TranslationMemory(path, version="2").purge() == 1
+
+
+def test_translate_text_only_sends_new_sentences(monkeypatch):
+    translator_service = make_service(monkeypatch, TranslationMemory())
+
+    first = translator_service.translate_text("Menu\n\n  Fresh fish from\nthe harbour. Open daily.", "es")
+    second = translator_service.translate_text("Open daily. Closed\non Mondays.", "es")
+
+    assert first == "MENU\n\n  FRESH FISH FROM\nTHE HARBOUR. OPEN DAILY."
+    assert second == "OPEN DAILY. CLOSED\nON MONDAYS."
+    # Sentences wrapped across lines are sent whole, not line by line
+    assert translator_service.sent_requests == [
+        ["Menu", "Fresh fish from\nthe harbour.", "Open daily."], ["Closed\non Mondays."]]
+    assert translator_service.translation_memory.stats.hit_rate == 1 / 5
@@ -0,0 +1,106 @@
+import os
+import sys
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.translator_service import TranslatorService, split_text
+
+
+def make_service(monkeypatch):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    translator_service = TranslatorService()
+    translator_service.sent_requests = []
+
+    def fake_send(texts, targets, source_language=None):
+        translator_service.sent_requests.append(texts)
+        return [{"translations": [{"text": text.upper() if target == "es" else f"[{target}] {text}",
+                                   "to": target} for target in targets]}
+                for text in texts]
+
+    translator_service._send_translate_request = fake_send
+    return translator_service
+
+
+def test_split_text_rebuilds_original():
+    text = "First line.\nSecond sentence here. Third one!\nlast"
+    pieces = split_text(text, 20)
+
+    assert all(len(piece) <= 20 for piece, _ in pieces)
+    assert "".join(piece + separator for piece, separator in pieces) == text
+
+
+def test_split_text_handles_long_texts_with_a_small_limit():
+    text = "word " * 20000 + "x" * 5000
+    pieces = split_text(text, 3)
+
+    assert len(pieces) > 20000
+    assert all(len(piece) <= 3 for piece, _ in pieces)
+    assert "".join(piece + separator for piece, separator in pieces) == text
+
+
+def test_translate_batch_packs_requests(monkeypatch):
+    translator_service = make_service(monkeypatch)
+    texts = [f"line {i}" for i in range(25)]
+
+    translations = translator_service.translate_batch(texts, "es", max_elements=10)
+
+    assert translations == [text.upper() for text in texts]
+    assert [len(batch) for batch in translator_service.sent_requests] == [10, 10, 5]
+
+
+def test_translate_batch_splits_oversized_text(monkeypatch):
+    translator_service = make_service(monkeypatch)
+    long_text = "alpha beta. gamma delta. epsilon"
+
+    translations = translator_service.translate_batch(["short", long_text], "es",
+                                                      max_characters=12)
+
+    assert translations == ["SHORT", long_text.upper()]
+    assert all(sum(len(text) for text in batch) <= 12
+               for batch in translator_service.sent_requests)
+
+
+def test_translate_batch_marks_failed_requests(monkeypatch):
+    translator_service = make_service(monkeypatch)
+
+    def failing_send(texts, targets, source_language=None):
+        raise RuntimeError("service unavailable")
+
+    translator_service._send_translate_request = failing_send
+
+    assert translator_service.translate_batch(["a", "b"], "es") == [None, None]
+
+
+def test_translate_multi_uses_one_request(monkeypatch):
+    translator_service = make_service(monkeypatch)
+
+    translations = translator_service.translate_multi("hello", ["es", "fr", "de"])
+
+    assert translations == {"es": "HELLO", "fr": "[fr] hello", "de": "[de] hello"}
+    assert len(translator_service.sent_requests) == 1
+
+
+def test_translate_multi_shares_character_budget_across_targets(monkeypatch):
+    translator_service = make_service(monkeypatch)
+    text = "one two three four"
+
+    translations = translator_service._translate_packed([text], ["es", "fr"], max_characters=20)
+
+    assert translations[0]["es"] == text.upper()
+    assert all(sum(len(piece) for piece in batch) <= 10
+               for batch in translator_service.sent_requests)
+
+
+def test_session_pools_connections_and_retries_throttling(monkeypatch):
+    monkeypatch.setenv("AZURE_TRANSLATOR_KEY", "test-key")
+    monkeypatch.setenv("AZURE_TRANSLATOR_REGION", "westeurope")
+    translator_service = TranslatorService(pool_size=4, max_retries=5)
+
+    adapter = translator_service.session.get_adapter("https://api.cognitive.microsofttranslator.com")
+
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 5
+    assert 429 in adapter.max_retries.status_forcelist
+    assert translator_service.session.headers["Ocp-Apim-Subscription-Key"] == "test-key"
@@ -7,14 +7,20 @@ import io
 # Add the parent directory to the Python path so we can import our backend modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.fake_azure import FakeAzureServer
 from backend.vision_service import VisionService
 
 def test_image_extraction():
     # Load environment variables
     load_dotenv()
     
-    # Initialize the Vision Service
-    vision_service = VisionService()
+    # Initialize the Vision Service, against the local fake when no credentials are set
+    fake_server = None
+    if os.getenv('AZURE_VISION_KEY'):
+        vision_service = VisionService()
+    else:
+        fake_server = FakeAzureServer().start()
+        vision_service = VisionService(endpoint=fake_server.url, key="fake-key")
     
     # Path to your image
     image_path = "images/poet.jpg"
@@ -43,6 +49,9 @@ def test_image_extraction():
         print(f"Error: Image file not found at {image_path}")
     except Exception as e:
         print(f"Error occurred: {str(e)}")
+    finally:
+        if fake_server is not None:
+            fake_server.stop()
 
 if __name__ == "__main__":
     test_image_extraction()